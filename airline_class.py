@@ -1,4 +1,8 @@
-import json
+import threading
+import weakref
+from collections.abc import Mapping
+from json_loader import read_json_file
+from json_stream import index_json_object, read_json_member
 
 class Airport:
     def __init__(self, data):
@@ -55,34 +59,128 @@ class AirportDatabase:
     def get_airport(self, iata_code):
         return self.airports.get(iata_code)
 
+    def graph_rows(self):
+        """
+        Returns the data the route graph is built from.
+
+        Returns:
+            tuple: ([(iata, latitude, longitude, country), ...] in database order,
+                    iterable of (origin, destination, km, min, airline IATA codes tuple) grouped by origin).
+        """
+        airports = list(self.airports.items())
+        airport_rows = [(iata, airport.latitude, airport.longitude, airport.country) for iata, airport in airports]
+        route_rows = (
+            (iata, route.iata, route.km, route.min, tuple(carrier.iata for carrier in route.carriers))
+            for iata, airport in airports
+            for route in airport.routes
+        )
+        return airport_rows, route_rows
+
+    def airline_names(self):
+        """Returns {airline IATA code: name} for every carrier in the schedule."""
+        return {carrier.iata: carrier.name
+                for airport in self.airports.values()
+                for route in airport.routes
+                for carrier in route.carriers}
+
+    def airport_names(self):
+        """Returns {IATA code: airport name} in database order (for lists that need no routes)."""
+        return {iata: airport.name for iata, airport in self.airports.items()}
+
+    def close(self):
+        """
+        Releases files or connections held by the snapshot before it is garbage-collected
+        (nothing for in-memory airports). Only call it once no reader can still use it.
+        """
+
     def __repr__(self):
         return f"AirportDatabase({len(self.airports)} airports)"
 
 
-def read_json_file(file_path):
+class LazyAirports(Mapping):
+    """
+    Read-only `iata -> Airport` mapping that builds each Airport the first time it is accessed.
+
+    Membership, length and key iteration only use the offset index; an airport's JSON is
+    read from the file and turned into Airport, Route and Carrier objects on first lookup
+    and kept for later lookups.
+
+    The routes file stays open so the mapping keeps reading the version it was indexed
+    from even if the file is replaced. It is closed when the mapping is garbage-collected
+    (once no reader holds the snapshot any more), or explicitly by `close()`, after which
+    airports not built yet can no longer be looked up.
     """
-    Reads a JSON file and returns the data as a Python dictionary or list.
 
-    Args:
-        file_path (str): The path to the JSON file.
+    def __init__(self, file_path, index, names=None):
+        self.index = index
+        self.names = names or {}  # IATA code -> name, read from the index
+        self._file = open(file_path, 'rb')
+        self._close_file = weakref.finalize(self, self._file.close)
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def close(self):
+        """Closes the routes file."""
+        with self._lock:
+            self._close_file()
+
+    def raw(self, iata_code):
+        """Returns the undecoded JSON bytes of an airport."""
+        start, length = self.index[iata_code]
+        with self._lock:
+            self._file.seek(start)
+            return self._file.read(length)
+
+    def __getitem__(self, iata_code):
+        airport = self._cache.get(iata_code)
+        if airport is None:
+            if iata_code not in self.index:
+                raise KeyError(iata_code)
+            with self._lock:
+                airport = self._cache.get(iata_code)
+                if airport is None:
+                    airport = self._cache[iata_code] = Airport(read_json_member(self._file, *self.index[iata_code]))
+        return airport
+
+    def __contains__(self, iata_code):
+        return iata_code in self.index
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def materialized(self):
+        """Number of airports built so far."""
+        return len(self._cache)
+
+
+class LazyAirportDatabase(AirportDatabase):
+    """
+    AirportDatabase that reads airports from the routes file on demand.
 
-    Returns:
-        dict or list: The JSON data as a Python dictionary or list,
-                      or None if an error occurred.
+    Startup only loads the byte-offset index of the file (cached next to it by
+    `json_stream.index_json_object`), so tools and workers that look at a few
+    airports never build the rest.
     """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data
-    except FileNotFoundError:
-        print(f"Error: File not found at {file_path}")
-        return None
-    except json.JSONDecodeError:
-        print(f"Error: Invalid JSON format in {file_path}")
-        return None
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
-        return None
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        index, values = index_json_object(file_path, fields=("name",))
+        self.airports = LazyAirports(file_path, index, {iata: name for iata, (name,) in values.items()})
+
+    def airport_names(self):
+        """Returns the names kept in the offset index, without building any airport."""
+        return {iata: self.airports.names.get(iata) for iata in self.airports}
+
+    def close(self):
+        self.airports.close()
+
+    def __repr__(self):
+        return f"LazyAirportDatabase({len(self.airports)} airports, {self.airports.materialized} loaded)"
+
 
 if __name__ == "__main__":
     file_path = 'airline_routes.json'  # Replace with the actual path to your JSON file
@@ -0,0 +1,48 @@
+import threading
+from data_loader import airport_db  # Import the global AirportDatabase object
+
+# Sort keys for the option lists, applied to (iata, name) pairs ('database' keeps the routes file order)
+ORDERS = {
+    "database": None,
+    "iata": lambda item: item[0],
+    "name": lambda item: item[1] or "",
+}
+
+_options = {}
+_options_lock = threading.Lock()
+
+
+def get_airport_options(order="database"):
+    """
+    Returns the airport dropdown options shared by all pages, built once per order.
+
+    Only codes and names are read (`AirportDatabase.airport_names`), so lazy and SQLite
+    snapshots do not build every airport with its routes just to fill a dropdown.
+
+    Args:
+        order (str): One of ORDERS.
+
+    Returns:
+        list: [{'label': 'Name (IATA)', 'value': 'IATA'}, ...]
+    """
+    options = _options.get(order)
+    if options is None:
+        with _options_lock:
+            options = _options.get(order)
+            if options is None:
+                airports = list(airport_db.snapshot.airport_names().items())
+                if ORDERS[order] is not None:
+                    airports.sort(key=ORDERS[order])
+                options = _options[order] = [
+                    {'label': f"{name} ({iata})", 'value': iata}
+                    for iata, name in airports
+                ]
+    return options
+
+
+@airport_db.on_reload
+def _invalidate_airport_options(diff):
+    """Drops the option lists when airports were added, removed or renamed, so dropdowns show the reloaded data."""
+    if diff.added_airports or diff.removed_airports or diff.changed_airports:
+        with _options_lock:
+            _options.clear()
@@ -1,9 +1,16 @@
 from collections import deque, defaultdict
 from data_loader import airport_db  # Import the global AirportDatabase object
+from dynamic_paths import get_dynamic_graph
+from hub_trees import hub_trees
+from all_pairs import get_all_pairs
+from connectivity import get_connectivity
+from route_graph import get_route_graph
+from search_stats import current_stats, instrumented
 import heapq
 from math import radians, cos, sin, sqrt, atan2
 
 ### BFS ALGO ###
+@instrumented("bfs_min_connections")
 def bfs_min_connections(start_iata, goal_iata):
     """
     Finds the shortest flight route (minimum layovers) between two airports using BFS,
@@ -26,30 +33,50 @@ def bfs_min_connections(start_iata, goal_iata):
         print("Invalid airport IATA code(s).")
         return None
 
+    if not get_connectivity().is_reachable(start_iata, goal_iata):
+        return None  # No sequence of routes connects the two airports
+
+    # Precomputed hop counts give the answer (or its absence) without exploring the network
+    all_pairs = get_all_pairs()
+    if all_pairs is not None:
+        path = all_pairs.min_hop_path(start_iata, goal_iata, get_route_graph())
+        if path is not None:
+            return path
+
     # BFS queue (each entry is (current_airport, path_taken))
     queue = deque([(start_airport, [start_airport.iata])])
     visited = set()
+    settled = relaxed = pushes = 0
 
-    while queue:
-        current_airport, path = queue.popleft()
+    try:
+        while queue:
+            current_airport, path = queue.popleft()
+            settled += 1
 
-        if current_airport.iata == goal_iata:
-            return path  # Found the shortest path
+            if current_airport.iata == goal_iata:
+                return path  # Found the shortest path
 
-        visited.add(current_airport.iata)
+            visited.add(current_airport.iata)
 
-        # Explore all direct flight routes from the current airport
-        for route in current_airport.routes:
-            next_airport = airport_db.get_airport(route.iata)
+            # Explore all direct flight routes from the current airport
+            for route in current_airport.routes:
+                relaxed += 1
+                next_airport = airport_db.get_airport(route.iata)
 
-            # Ensure the route has at least one carrier with flights available
-            if next_airport and next_airport.iata not in visited and any(route.carriers):
-                visited.add(next_airport.iata)
-                queue.append((next_airport, path + [next_airport.iata]))
+                # Ensure the route has at least one carrier with flights available
+                if next_airport and next_airport.iata not in visited and any(route.carriers):
+                    visited.add(next_airport.iata)
+                    queue.append((next_airport, path + [next_airport.iata]))
+                    pushes += 1
 
-    return None  # No route found
+        return None  # No route found
+    finally:
+        stats = current_stats()
+        if stats is not None:
+            stats.add(nodes_settled=settled, edges_relaxed=relaxed, heap_pushes=pushes + 1, heap_pops=settled)
 
 ### DIJKSTRA ALGO ###
+@instrumented("yen_k_shortest_paths")
 def yen_k_shortest_paths(src, dest, k=1):
     """
     Finds K-shortest paths between source and destination using Yen's Algorithm.
@@ -64,40 +91,54 @@ def yen_k_shortest_paths(src, dest, k=1):
         list: A list of routes, each being a sequence of airport IATA codes, or None if no route exists.
     """
 
-    def build_graph(airport_db):
-        """Converts airport data into a graph structure."""
-        graph = defaultdict(list)
-
-        for airport in airport_db.airports.values():
-            for route in airport.routes:
-                if route.carriers:  # Ensure the route has available carriers
-                    neighbor = route.iata
-                    distance = route.km
-                    graph[airport.iata].append((neighbor, distance))
-
-        return graph
-    
     def dijkstra(source, target):
         """Finds the shortest path from source to target using Dijkstra's Algorithm."""
         heap = [(0, source, [])]
         best_dist = {source: 0}
-
-        while heap:
-            cost, node, path = heapq.heappop(heap)
-            path = path + [node]
-
-            if node == target:
-                return path  # Return only the sequence of IATA codes
-
-            for neighbor, weight in graph.get(node, []):
-                new_cost = cost + weight
-                if neighbor not in best_dist or new_cost < best_dist[neighbor]:
-                    best_dist[neighbor] = new_cost
-                    heapq.heappush(heap, (new_cost, neighbor, path))
-
-        return None  # No route found
-
-    graph = build_graph(airport_db)
+        pops = relaxed = pushes = 0
+
+        try:
+            while heap:
+                cost, node, path = heapq.heappop(heap)
+                pops += 1
+                path = path + [node]
+
+                if node == target:
+                    return path  # Return only the sequence of IATA codes
+
+                for neighbor, weight in graph.get(node, []):
+                    relaxed += 1
+                    new_cost = cost + weight
+                    if neighbor not in best_dist or new_cost < best_dist[neighbor]:
+                        best_dist[neighbor] = new_cost
+                        heapq.heappush(heap, (new_cost, neighbor, path))
+                        pushes += 1
+
+            return None  # No route found
+        finally:
+            if stats is not None:
+                stats.add(nodes_settled=pops, edges_relaxed=relaxed, heap_pushes=pushes + 1, heap_pops=pops)
+
+    if not get_connectivity().is_reachable(src, dest):
+        return None  # No route exists at all
+
+    stats = current_stats()
+
+    dynamic_graph = get_dynamic_graph()
+
+    # A maintained shortest-path tree answers the single best route without searching
+    if k == 1:
+        tracked_path = dynamic_graph.shortest_path(src, dest)
+        if tracked_path:
+            return [tracked_path]
+
+        # Cached hub trees are built from the schedule, so their path is only used if every leg is still bookable
+        hub_path = hub_trees.shortest_path(src, dest)
+        if hub_path and all(b in dynamic_graph.out_edges(a) for a, b in zip(hub_path, hub_path[1:])):
+            return [hub_path]
+
+    # Private copy of the live route graph (routes with carriers), since Yen's algorithm removes edges
+    graph = defaultdict(list, dynamic_graph.adjacency())
     # Step 1: Get the first shortest path using Dijkstra
     A = []
     B = []
@@ -166,14 +207,21 @@ def heuristic(a, b):
                               float(airport_b.latitude), float(airport_b.longitude))
 
 # A* search algorithm with relaxed filtering for layovers but enforcing at least one preferred airline
+@instrumented("astar_preferred_airline")
 def astar_preferred_airline(start, goal, preferred_airline_iatas, k=1):
     open_set = [(0, 0, start, [], False)]  # (priority, cost_so_far, current_node, path, has_preferred)
     visited = set()
     best_routes = []
     preferred_airline_iatas = {iata.upper() for iata in preferred_airline_iatas}  # Ensure uppercase for comparison
 
+    all_pairs = get_all_pairs()
+    if all_pairs is not None and not all_pairs.is_reachable(start, goal):
+        return []  # No route exists at all
+
+    pops = stale = settled = relaxed = pushes = 0
     while open_set:
         priority, cost, current, path, has_preferred = heapq.heappop(open_set)
+        pops += 1
         
         if current == goal:
             if has_preferred:  # Ensure at least one preferred airline is in the journey
@@ -182,15 +230,18 @@ def astar_preferred_airline(start, goal, preferred_airline_iatas, k=1):
             continue
 
         if current in visited:
+            stale += 1
             continue
 
         visited.add(current)
+        settled += 1
 
         current_airport = airport_db.get_airport(current)
         if not current_airport:
             continue
 
         for route in current_airport.routes:
+            relaxed += 1
             neighbor = route.iata
             airline_iatas = {carrier.iata.upper() for carrier in route.carriers}
             airline_names = [carrier.name for carrier in route.carriers]
@@ -202,7 +253,11 @@ def astar_preferred_airline(start, goal, preferred_airline_iatas, k=1):
                 new_cost = cost + base_cost
                 priority = new_cost + heuristic(neighbor, goal)
                 heapq.heappush(open_set, (priority, new_cost, neighbor, path + [current], has_preferred or is_preferred))
-    
+                pushes += 1
+
+    stats = current_stats()
+    if stats is not None:
+        stats.add(nodes_settled=settled, edges_relaxed=relaxed, heap_pushes=pushes + 1, heap_pops=pops, stale_pops=stale)
     return sorted(best_routes)[:k]
 
 
@@ -1,48 +1,112 @@
-import json
-from collections import deque
+import heapq
+from json_loader import read_json_file
+from collections import deque, defaultdict
 
-# Load the dataset
-with open('airline_routes.json', 'r') as file:
-    airports = json.load(file)
 
-# BFS to find flight paths leading to a specified airport (limited to 10 paths)
-def bfs_paths_to_airport(airports, goal, max_paths=10):
-    all_paths = []
-    for start_airport in airports.keys():
-        if start_airport == goal:
-            continue
-        queue = deque([(start_airport, [start_airport])])
-        visited = set()
+def build_reverse_index(airports):
+    """
+    Builds the reverse adjacency of the route network.
+
+    Args:
+        airports: A dictionary of airport data keyed by IATA code, each with a 'routes' list.
+
+    Returns:
+        dict: {destination IATA: [(origin IATA, km), ...]} for every route between known airports.
+    """
+    reverse_index = defaultdict(list)
+    for origin, airport in airports.items():
+        for route in airport.get('routes', []):
+            destination = route['iata']
+            if destination in airports:
+                reverse_index[destination].append((origin, route.get('km') or 0))
+    return reverse_index
+
+
+def iter_paths_to_airport(airports, goal, reverse_index=None, limit=None, by_distance=False):
+    """
+    Yields the best path into `goal` from every airport that can reach it, nearest origins first.
 
-        while queue and len(all_paths) < max_paths:
-            current, path = queue.popleft()
+    A single search runs backwards from the goal over the reverse index, so each origin's
+    path is known as soon as the origin is reached: it is the origin followed by the
+    next-hop pointers down to the goal.
 
-            if current == goal:
-                all_paths.append(path)
-                break
+    Args:
+        airports: A dictionary of airport data keyed by IATA code.
+        goal: The IATA code of the destination airport.
+        reverse_index: Output of `build_reverse_index` (built here if not given).
+        limit: Stop after this many paths (default: all origins).
+        by_distance: Rank paths by total km (backward Dijkstra) instead of by number of flights (backward BFS).
 
-            visited.add(current)
+    Yields:
+        list: Airport IATA codes from an origin to the goal.
+    """
+    if goal not in airports or limit == 0:
+        return
+    if reverse_index is None:
+        reverse_index = build_reverse_index(airports)
 
-            for route in airports[current].get('routes', []):
-                neighbor = route['iata']
-                if neighbor in airports and neighbor not in visited and neighbor not in path:
-                    queue.append((neighbor, path + [neighbor]))
+    next_hop = {goal: None}  # Airport -> following airport on its path to the goal
+
+    def path_from(origin):
+        path = [origin]
+        while next_hop[path[-1]] is not None:
+            path.append(next_hop[path[-1]])
+        return path
+
+    produced = 0
+    if by_distance:
+        distance = {goal: 0}
+        heap = [(0, goal)]
+        settled = set()
+        while heap:
+            dist, current = heapq.heappop(heap)
+            if current in settled:
+                continue
+            settled.add(current)
+            if current != goal:
+                yield path_from(current)
+                produced += 1
+                if produced == limit:
+                    return
+            for origin, km in reverse_index.get(current, []):
+                if origin not in settled and dist + km < distance.get(origin, float('inf')):
+                    distance[origin] = dist + km
+                    next_hop[origin] = current
+                    heapq.heappush(heap, (dist + km, origin))
+    else:
+        queue = deque([goal])
+        while queue:
+            current = queue.popleft()
+            for origin, _ in reverse_index.get(current, []):
+                if origin in next_hop:
+                    continue
+                next_hop[origin] = current
+                queue.append(origin)
+                yield path_from(origin)
+                produced += 1
+                if produced == limit:
+                    return
+
+
+# BFS to find flight paths leading to a specified airport (limited to 10 paths)
+def bfs_paths_to_airport(airports, goal, max_paths=10):
+    return list(iter_paths_to_airport(airports, goal, limit=max_paths))
 
-        if len(all_paths) >= max_paths:
-            break
 
-    return all_paths
+if __name__ == "__main__":
+    # Load the dataset
+    airports = read_json_file('airline_routes.json')
 
-# User input
-goal_airport = input("Enter destination airport IATA code: ").strip().upper()
+    # User input
+    goal_airport = input("Enter destination airport IATA code: ").strip().upper()
 
-# Find paths
-paths = bfs_paths_to_airport(airports, goal_airport, max_paths=10)
+    # Find paths
+    paths = bfs_paths_to_airport(airports, goal_airport, max_paths=10)
 
-# Display results
-if paths:
-    print(f"Up to 10 shortest paths found leading to {goal_airport}:")
-    for idx, path in enumerate(paths, 1):
-        print(f"{idx}: {' -> '.join(path)}")
-else:
-    print(f"No paths found leading to {goal_airport}.")
+    # Display results
+    if paths:
+        print(f"Up to 10 shortest paths found leading to {goal_airport}:")
+        for idx, path in enumerate(paths, 1):
+            print(f"{idx}: {' -> '.join(path)}")
+    else:
+        print(f"No paths found leading to {goal_airport}.")
@@ -0,0 +1,315 @@
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import threading
+from multiprocessing import Pool
+import numpy as np
+from data_loader import airport_db  # Import the global AirportDatabase object
+from route_graph import RouteGraph, get_route_graph
+
+# Output files of the offline precompute (memory-mapped when loaded)
+HOPS_FILE = "all_pairs_hops.npy"
+DISTANCE_FILE = "all_pairs_km.npy"
+AIRPORTS_FILE = "all_pairs_airports.json"
+
+# Hop count stored for pairs without any route
+UNREACHABLE = 255
+
+# Sources handled by one worker task
+BATCH_SIZE = 64
+
+# CSR arrays of the bookable route graph, set in each worker by `_init_worker`
+_offsets = _targets = _km = None
+
+
+def bookable_csr(route_graph, mask=None):
+    """
+    Returns the CSR arrays (offsets, targets, km) of the routes that have at least one carrier.
+
+    RouteGraph edges are grouped by departure airport, so masking keeps the grouping and
+    only the offsets have to be recounted. `mask` (one bool per RouteGraph edge) drops
+    further edges, e.g. routes without a price.
+    """
+    bookable = route_graph.carrier_count > 0
+    if mask is not None:
+        bookable &= mask
+    sources = route_graph.sources[bookable]
+    offsets = np.zeros(route_graph.airport_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=route_graph.airport_count), out=offsets[1:])
+    return offsets, route_graph.targets[bookable], route_graph.km[bookable]
+
+
+def graph_signature(codes, offsets, targets, weights):
+    """Fingerprint of a weighted graph, used to reject precomputed data built from other routes."""
+    digest = hashlib.sha1("\n".join(codes).encode("utf-8"))
+    for array in (offsets, targets, weights):
+        digest.update(np.ascontiguousarray(array, dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+
+def csr_signature(route_graph):
+    """Signature of the bookable route graph the all-pairs matrices are computed from."""
+    offsets, targets, km = bookable_csr(route_graph)
+    return graph_signature(route_graph.codes, offsets, targets, np.rint(km))
+
+
+def _init_worker(offsets, targets, km):
+    global _offsets, _targets, _km
+    _offsets, _targets, _km = offsets, targets, km
+
+
+def batched_bfs(sources, offsets, targets):
+    """
+    Minimum hop counts from several sources at once.
+
+    All BFS frontiers of the batch advance together one level per iteration; a frontier
+    is a pair of arrays (batch row, airport) and its neighbours are gathered from the
+    CSR arrays without a Python loop over airports.
+
+    Args:
+        sources (numpy.ndarray): Airport indices to start from.
+        offsets, targets (numpy.ndarray): CSR route graph.
+
+    Returns:
+        numpy.ndarray: uint8 matrix of shape (len(sources), airport_count), UNREACHABLE where no route exists.
+    """
+    n = len(offsets) - 1
+    hops = np.full((len(sources), n), UNREACHABLE, dtype=np.uint8)
+    rows = np.arange(len(sources))
+    nodes = np.asarray(sources)
+    hops[rows, nodes] = 0
+
+    level = 0
+    while len(nodes) and level < UNREACHABLE - 1:
+        level += 1
+        starts = offsets[nodes]
+        counts = offsets[nodes + 1] - starts
+        total = int(counts.sum())
+        if not total:
+            break
+
+        # Position of every outgoing edge of the frontier in the CSR target array
+        first = np.repeat(np.cumsum(counts) - counts, counts)
+        positions = np.arange(total) - first + np.repeat(starts, counts)
+        rows = np.repeat(rows, counts)
+        nodes = targets[positions]
+
+        fresh = hops[rows, nodes] == UNREACHABLE
+        cells = np.unique(rows[fresh].astype(np.int64) * n + nodes[fresh])
+        rows, nodes = cells // n, cells % n
+        hops[rows, nodes] = level
+
+    return hops
+
+
+def dijkstra_row(source, offsets, targets, km):
+    """Shortest distances (km) from one airport index to all others; inf where unreachable."""
+    dist = [float('inf')] * (len(offsets) - 1)
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        distance, node = heapq.heappop(heap)
+        if distance > dist[node]:
+            continue  # Stale heap entry
+        for edge in range(offsets[node], offsets[node + 1]):
+            neighbor = targets[edge]
+            new_distance = distance + km[edge]
+            if new_distance < dist[neighbor]:
+                dist[neighbor] = new_distance
+                heapq.heappush(heap, (new_distance, neighbor))
+    return dist
+
+
+def _compute_batch(task):
+    """Worker task: hop rows (and optionally distance rows) for sources start..stop."""
+    start, stop, with_distances = task
+    hops = batched_bfs(np.arange(start, stop), _offsets, _targets)
+    distances = None
+    if with_distances:
+        offsets, targets, km = _offsets.tolist(), _targets.tolist(), _km.tolist()
+        distances = np.array([dijkstra_row(source, offsets, targets, km) for source in range(start, stop)],
+                             dtype=np.float32)
+    return start, hops, distances
+
+
+def build_all_pairs(airport_db, output_dir=".", with_distances=False, workers=None, batch_size=BATCH_SIZE):
+    """
+    Precomputes the all-pairs matrices of the route network and writes them as `.npy` files.
+
+    Batches of source airports are solved in a process pool and written straight into
+    memory-mapped output files, so the full matrix never has to fit in memory twice.
+
+    Args:
+        airport_db (AirportDatabase): Source of the route network.
+        output_dir (str): Directory for the output files.
+        with_distances (bool): Also compute the float32 shortest-distance matrix (much slower than hops).
+        workers (int): Number of worker processes (default: CPU count).
+        batch_size (int): Number of source airports per task.
+    """
+    route_graph = RouteGraph(airport_db)
+    offsets, targets, km = bookable_csr(route_graph)
+    n = route_graph.airport_count
+
+    hops = np.lib.format.open_memmap(os.path.join(output_dir, HOPS_FILE), mode='w+', dtype=np.uint8, shape=(n, n))
+    distances = None
+    distance_file = os.path.join(output_dir, DISTANCE_FILE)
+    if with_distances:
+        distances = np.lib.format.open_memmap(distance_file, mode='w+', dtype=np.float32, shape=(n, n))
+    elif os.path.exists(distance_file):
+        os.remove(distance_file)  # Left over from an earlier build, no longer matches
+
+    tasks = [(start, min(start + batch_size, n), with_distances) for start in range(0, n, batch_size)]
+    with Pool(workers, initializer=_init_worker, initargs=(offsets, targets, km)) as pool:
+        for start, hop_rows, distance_rows in pool.imap_unordered(_compute_batch, tasks):
+            hops[start:start + len(hop_rows)] = hop_rows
+            if distances is not None:
+                distances[start:start + len(distance_rows)] = distance_rows
+
+    hops.flush()
+    if distances is not None:
+        distances.flush()
+
+    # The airport order and graph signature identify the matrices; different route data must not reuse them
+    with open(os.path.join(output_dir, AIRPORTS_FILE), 'w', encoding='utf-8') as f:
+        json.dump({"codes": route_graph.codes, "routes": int(len(targets)),
+                   "signature": csr_signature(route_graph)}, f)
+
+
+class AllPairsMatrix:
+    """
+    Read-only view of the precomputed all-pairs matrices (memory-mapped, loaded lazily by the OS).
+
+    `hops[i, j]` is the minimum number of flights from airport i to airport j (UNREACHABLE if
+    there is no route) and `distances[i, j]` the shortest distance in km if it was computed.
+    Both are exact for the graph they were built from and therefore valid lower bounds.
+    """
+
+    def __init__(self, codes, hops, distances=None, signature=None):
+        self.codes = codes
+        self.signature = signature
+        self.index = {code: i for i, code in enumerate(codes)}
+        self.hops = hops
+        self.distances = distances
+
+    @classmethod
+    def load(cls, output_dir="."):
+        """Maps the matrix files into memory. Returns None if they have not been built."""
+        try:
+            with open(os.path.join(output_dir, AIRPORTS_FILE), 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+            codes = metadata["codes"]
+            hops = np.load(os.path.join(output_dir, HOPS_FILE), mmap_mode='r')
+        except (OSError, ValueError, KeyError):
+            return None
+
+        distance_file = os.path.join(output_dir, DISTANCE_FILE)
+        distances = np.load(distance_file, mmap_mode='r') if os.path.exists(distance_file) else None
+        return cls(codes, hops, distances, metadata.get("signature"))
+
+    def hop_count(self, origin_iata, destination_iata):
+        """Returns the minimum number of flights between two airports, or None if there is no route."""
+        i, j = self.index.get(origin_iata), self.index.get(destination_iata)
+        if i is None or j is None:
+            return None
+        hops = int(self.hops[i, j])
+        return None if hops == UNREACHABLE else hops
+
+    def layovers(self, origin_iata, destination_iata):
+        """Returns the minimum number of layovers between two airports, or None if there is no route."""
+        hops = self.hop_count(origin_iata, destination_iata)
+        return None if hops is None else max(hops - 1, 0)
+
+    def is_reachable(self, origin_iata, destination_iata):
+        return self.hop_count(origin_iata, destination_iata) is not None
+
+    def distance_km(self, origin_iata, destination_iata):
+        """Returns the shortest route distance, or None if unreachable or distances were not computed."""
+        i, j = self.index.get(origin_iata), self.index.get(destination_iata)
+        if self.distances is None or i is None or j is None:
+            return None
+        distance = float(self.distances[i, j])
+        return None if distance == float('inf') else distance
+
+    def min_hop_path(self, origin_iata, destination_iata, route_graph):
+        """
+        Returns a route with the fewest flights by walking down the hop counts towards the destination.
+
+        Args:
+            origin_iata (str): IATA code of the departure airport.
+            destination_iata (str): IATA code of the arrival airport.
+            route_graph (RouteGraph): Graph the matrix was built from.
+
+        Returns:
+            list: Sequence of airport IATA codes, or None if the matrix has no route or does not
+                  match `route_graph` (the caller should then search the graph itself).
+        """
+        hops = self.hop_count(origin_iata, destination_iata)
+        if hops is None or origin_iata not in route_graph.index:
+            return None
+
+        column = np.asarray(self.hops[:, self.index[destination_iata]])
+        node = route_graph.index[origin_iata]
+        path = [origin_iata]
+        for remaining in range(hops - 1, -1, -1):
+            edges = range(route_graph.offsets[node], route_graph.offsets[node + 1])
+            node = next((int(route_graph.targets[e]) for e in edges
+                         if route_graph.carrier_count[e] and column[route_graph.targets[e]] == remaining), None)
+            if node is None:
+                return None  # The routes changed since the matrix was built
+            path.append(route_graph.codes[node])
+        return path
+
+
+_all_pairs = None
+_all_pairs_lock = threading.Lock()
+_all_pairs_loaded = False
+
+
+def get_all_pairs():
+    """
+    Returns the shared AllPairsMatrix, or None if it was not built or does not match the loaded dataset.
+    """
+    global _all_pairs, _all_pairs_loaded
+    if not _all_pairs_loaded:
+        with _all_pairs_lock:
+            if not _all_pairs_loaded:
+                matrix = AllPairsMatrix.load()
+                if matrix is not None and matrix.signature != csr_signature(get_route_graph()):
+                    print(f"Ignoring {HOPS_FILE}: it was built from different route data")
+                    matrix = None
+                _all_pairs = matrix
+                _all_pairs_loaded = True
+    return _all_pairs
+
+
+@airport_db.on_reload
+def _invalidate_all_pairs(diff):
+    """
+    Re-checks the matrices against the reloaded routes on next use.
+
+    The signature only covers bookable routes and their km, so changes to carrier dates
+    or names keep the matrices, while a route losing its last carrier disables them
+    until they are rebuilt offline.
+    """
+    global _all_pairs, _all_pairs_loaded
+    if diff.topology_changed or diff.changed_routes:
+        with _all_pairs_lock:
+            _all_pairs = None
+            _all_pairs_loaded = False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute all-pairs hop counts (and distances) of the route network.")
+    parser.add_argument("--distances", action="store_true", help="also compute the shortest-distance matrix")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--output-dir", default=".", help="directory for the .npy files")
+    args = parser.parse_args()
+
+    build_all_pairs(airport_db.snapshot, args.output_dir, args.distances, args.workers)
+    print(f"All-pairs matrices written to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
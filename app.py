@@ -1,8 +1,15 @@
 #!.\.venv\Scripts\python.exe
 
+import threading
 import dash
 from dash import html, dcc, page_container, Input, Output
 import dash_bootstrap_components as dbc
+from flask import Response, jsonify, request
+from data_loader import airport_db
+from connectivity import get_connectivity
+from hub_labels import get_hub_labels
+from search_stats import registry as search_stats
+import profiler
 
 # Tailwind CSS for styling
 external_stylesheets = ["https://cdn.jsdelivr.net/npm/tailwindcss@2.2.19/dist/tailwind.min.css", dbc.themes.BOOTSTRAP]
@@ -52,6 +59,54 @@ def update_active_link(pathname):
 # Add location component for tracking current page
 app.layout.children.insert(0, dcc.Location(id="url", refresh=False))
 
+# Connected-component diagnostics, e.g. /api/connectivity?origin=SIN&destination=LHR
+@app.server.route("/api/connectivity")
+def connectivity_api():
+    connectivity = get_connectivity()
+    origin = request.args.get("origin", "").strip().upper()
+    destination = request.args.get("destination", "").strip().upper()
+
+    response = {"summary": connectivity.summary()}
+    if origin:
+        response["origin"] = connectivity.describe_airport(origin)
+    if destination:
+        response["destination"] = connectivity.describe_airport(destination)
+    if origin and destination:
+        response["reachable"] = connectivity.is_reachable(origin, destination)
+    return jsonify(response)
+
+# Shortest distance and cheapest base fare from the precomputed hub labels, e.g. /api/quote?origin=SIN&destination=LHR
+@app.server.route("/api/quote")
+def quote_api():
+    origin = request.args.get("origin", "").strip().upper()
+    destination = request.args.get("destination", "").strip().upper()
+    distance_labels, price_labels = get_hub_labels("km"), get_hub_labels("price")
+    if distance_labels is None or price_labels is None:
+        return jsonify({"error": "Hub labels have not been built (run hub_labels.py)"}), 503
+
+    return jsonify({
+        "origin": origin,
+        "destination": destination,
+        "distance_km": distance_labels.distance(origin, destination),
+        "base_fare": price_labels.price(origin, destination),
+    })
+
+# Search work per algorithm for Prometheus (/metrics) or as JSON (/metrics?format=json)
+@app.server.route("/metrics")
+def metrics():
+    if request.args.get("format") == "json":
+        return Response(search_stats.to_json(), mimetype="application/json")
+    return Response(search_stats.to_prometheus(), mimetype="text/plain; version=0.0.4")
+
+# Per-callback timing and the token-protected /admin profiling routes
+profiler.install(app)
+
+# Pick up changes to airline_routes.json without restarting the server
+airport_db.start_watching()
+
+# Build the connectivity index at startup so unreachable queries are rejected from the first request
+threading.Thread(target=get_connectivity, name="connectivity-warmup", daemon=True).start()
+
 if __name__ == '__main__':
     print(f"🚀 Server is now running at http://127.0.0.1:8050/route-view")
     app.run_server(debug=False)
\ No newline at end of file
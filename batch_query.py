@@ -0,0 +1,142 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from multiprocessing import Pool
+from route_graph import get_route_graph
+from pricing import get_edge_prices
+from hub_trees import HubTree
+
+# Origin groups handed to a worker at a time
+CHUNK_SIZE = 8
+
+
+def read_pairs(file_path):
+    """
+    Streams origin-destination pairs from a CSV or JSONL file.
+
+    CSV files need 'origin' and 'destination' columns (any other columns are ignored);
+    JSONL files need one object per line with the same keys. An optional 'id' column/key
+    is passed through to the results, otherwise the 1-based row number is used.
+
+    Args:
+        file_path (str): Path to a .csv or .jsonl file.
+
+    Yields:
+        tuple: (id, origin_iata, destination_iata)
+    """
+    with open(file_path, 'r', encoding='utf-8', newline='') as f:
+        if file_path.lower().endswith(('.jsonl', '.ndjson')):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+
+        for number, row in enumerate(rows, start=1):
+            yield (row.get('id') or number,
+                   (row.get('origin') or '').strip().upper(),
+                   (row.get('destination') or '').strip().upper())
+
+
+def group_by_origin(pairs):
+    """Returns {origin: [(id, destination), ...]} so every origin is searched once."""
+    groups = defaultdict(list)
+    for pair_id, origin, destination in pairs:
+        groups[origin].append((pair_id, destination))
+    return groups
+
+
+def answer_group(task):
+    """
+    Worker task: one shortest-path tree from the origin answers all of its destinations.
+
+    Args:
+        task (tuple): (origin_iata, [(id, destination_iata), ...])
+
+    Returns:
+        list: One result dict per pair.
+    """
+    origin, destinations = task
+    route_graph, edge_prices = get_route_graph(), get_edge_prices()
+    tree = HubTree(route_graph, origin) if origin in route_graph.index else None
+
+    results = []
+    for pair_id, destination in destinations:
+        result = {"id": pair_id, "origin": origin, "destination": destination}
+        if tree is None or destination not in route_graph.index:
+            result["error"] = "Unknown airport"
+        else:
+            path = tree.path_to(destination)
+            if path is None:
+                result["error"] = "No route found"
+            else:
+                base_fare = edge_prices.price_itinerary(path)  # None if an airport on the path has no coordinates
+                result.update({
+                    "path": path,
+                    "distance_km": float(tree.dist[route_graph.index[destination]]),
+                    "flights": len(path) - 1,
+                    "base_fare": None if base_fare is None else round(base_fare, 2),
+                })
+        results.append(result)
+    return results
+
+
+def run_batch(pairs, output, workers=None):
+    """
+    Answers many origin-destination pairs, writing one JSON line per pair as groups finish.
+
+    Args:
+        pairs (iterable): (id, origin_iata, destination_iata) tuples, e.g. from `read_pairs`.
+        output (file): Text stream to write JSONL results to (results are not in input order).
+        workers (int): Number of worker processes (default: CPU count, 1 runs in-process).
+
+    Returns:
+        int: Number of results written.
+    """
+    groups = group_by_origin(pairs)
+
+    # Build the shared graph and prices before forking so workers inherit them
+    get_route_graph()
+    get_edge_prices()
+
+    written = 0
+    if workers == 1:
+        results = map(answer_group, groups.items())
+        pool = None
+    else:
+        pool = Pool(workers)
+        results = pool.imap_unordered(answer_group, groups.items(), chunksize=CHUNK_SIZE)
+
+    try:
+        for group in results:
+            for result in group:
+                output.write(json.dumps(result) + "\n")
+            written += len(group)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shortest route and base fare for many origin-destination pairs.")
+    parser.add_argument("input", help="CSV or JSONL file with origin and destination")
+    parser.add_argument("--output", help="JSONL file to write (default: stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.output:
+        with open(args.output + ".tmp", 'w', encoding='utf-8') as output:
+            count = run_batch(read_pairs(args.input), output, args.workers)
+        os.replace(args.output + ".tmp", args.output)
+    else:
+        count = run_batch(read_pairs(args.input), sys.stdout, args.workers)
+    print(f"Answered {count} pairs in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
-import json
 import math
+from fare_rules import FareEngine, load_fare_rules, FARE_RULES_FILE
+from fare_search import FareSearch
+from route_graph import get_route_graph
+from data_loader import airport_db  # Import the global AirportDatabase object
 
 def calculate_distance(lat1_rad, lon1_rad, lat2_rad, lon2_rad):
     """
@@ -25,30 +28,12 @@ def calculate_price(distance, price_per_km):
     """Calculates price."""
     return distance * price_per_km
 
-def load_airport_data(filepath):
-    """Loads airport data, converts lat/lon to radians."""
+def airport_coordinates_rad(airport):
+    """Returns (latitude, longitude) of an Airport in radians, or None if they are missing or invalid."""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            for airport_code, airport_info in data.items():
-                if ("latitude" in airport_info and airport_info["latitude"] is not None and airport_info["latitude"] != "" and
-                    "longitude" in airport_info and airport_info["longitude"] is not None and airport_info["longitude"] != ""):
-                    try:
-                        lat_deg = float(airport_info["latitude"])
-                        lon_deg = float(airport_info["longitude"])
-                        airport_info["latitude_rad"] = math.radians(lat_deg)
-                        airport_info["longitude_rad"] = math.radians(lon_deg)
-                    except ValueError:
-                        print(f"Warning: Invalid lat/lon for {airport_code}.")
-                        airport_info["latitude_rad"] = 0.0
-                        airport_info["longitude_rad"] = 0.0
-                else:
-                    print(f"Warning: Missing or empty lat/lon for {airport_code}.")
-                    airport_info["latitude_rad"] = 0.0
-                    airport_info["longitude_rad"] = 0.0
-            return data
-    except (FileNotFoundError, json.JSONDecodeError, Exception) as e:
-        print(f"Error loading data: {e}")
+        return math.radians(float(airport.latitude)), math.radians(float(airport.longitude))
+    except (TypeError, ValueError):
+        print(f"Warning: Missing or invalid lat/lon for {airport.iata}.")
         return None
 
 def get_airport_code(prompt):
@@ -60,14 +45,14 @@ def get_airport_code(prompt):
         else:
             print("Invalid IATA code. Please enter a 3-letter code.")
 
-def get_price_for_route(origin_iata, destination_iata, airport_data, price_per_km):
+def get_price_for_route(origin_iata, destination_iata, airport_db, price_per_km):
     """
     Calculates the price and distance for a given route (without discounts).
 
     Args:
         origin_iata: The IATA code of the origin airport.
         destination_iata: The IATA code of the destination airport.
-        airport_data: The dictionary containing airport data.
+        airport_db: The AirportDatabase to look the airports up in.
         price_per_km: The price per kilometer.
 
     Returns:
@@ -75,145 +60,25 @@ def get_price_for_route(origin_iata, destination_iata, airport_data, price_per_k
             - The calculated price (float) or None if the route is invalid.
             - The calculated distance (float) or None if the route is invalid.
     """
-
-    if origin_iata not in airport_data or destination_iata not in airport_data:
-        return None, None
-    try:
-        # Use pre-calculated radian values
-        origin_lat_rad = airport_data[origin_iata]["latitude_rad"]
-        origin_lon_rad = airport_data[origin_iata]["longitude_rad"]
-        dest_lat_rad = airport_data[destination_iata]["latitude_rad"]
-        dest_lon_rad = airport_data[destination_iata]["longitude_rad"]
-        distance = calculate_distance(origin_lat_rad, origin_lon_rad, dest_lat_rad, dest_lon_rad)
-        price = calculate_price(distance, price_per_km)
-        return price, distance
-    except (KeyError, ValueError, Exception) as e:
-        print(f"Error processing route: {e}")
+    origin, destination = airport_db.get_airport(origin_iata), airport_db.get_airport(destination_iata)
+    if not origin or not destination:
         return None, None
 
-def get_price_for_route_bellman_ford(origin_iata, destination_iata, airport_data, price_per_km, discount_routes):
-    """
-    Calculates the price and distance for a given route, applying discounts
-    using logic similar to Bellman-Ford (for handling one-way/two-way discounts).
-
-    Args:
-        origin_iata: IATA code of the origin airport.
-        destination_iata: IATA code of the destination airport.
-        airport_data: Dictionary containing airport data.
-        price_per_km: Price per kilometer.
-        discount_routes: Dictionary of discount rules.  Keys are tuples:
-                        (origin_iata, destination_iata). Values are tuples:
-                        (discount_percentage, is_two_way_discount).
-
-    Returns:
-        A tuple: (final_price, distance).  Returns (None, None) on error.
-    """
-
-    if origin_iata not in airport_data or destination_iata not in airport_data:
+    origin_rad, destination_rad = airport_coordinates_rad(origin), airport_coordinates_rad(destination)
+    if origin_rad is None or destination_rad is None:
         return None, None
-    try:
-        origin_lat_rad = airport_data[origin_iata]["latitude_rad"]
-        origin_lon_rad = airport_data[origin_iata]["longitude_rad"]
-        dest_lat_rad = airport_data[destination_iata]["latitude_rad"]
-        dest_lon_rad = airport_data[destination_iata]["longitude_rad"]
 
-        distance = calculate_distance(origin_lat_rad, origin_lon_rad, dest_lat_rad, dest_lon_rad)
-        base_price = calculate_price(distance, price_per_km)
-
-        # Apply discounts if applicable
-        if (origin_iata, destination_iata) in discount_routes:
-            discount_percentage, is_two_way = discount_routes[(origin_iata, destination_iata)]
-            final_price = base_price * (1 - discount_percentage)
-        elif (destination_iata, origin_iata) in discount_routes:
-            discount_percentage, is_two_way = discount_routes[(destination_iata, origin_iata)]
-            if is_two_way:
-                final_price = base_price * (1 - discount_percentage)
-            else:
-                final_price = base_price
-        else:
-            final_price = base_price
-        return final_price, distance
-    
-    except (KeyError, ValueError, Exception) as e:
-        print(f"Error processing route: {e}")
-        return None, None
+    distance = calculate_distance(*origin_rad, *destination_rad)
+    return calculate_price(distance, price_per_km), distance
 
-def bellman_ford(graph, start, end, airport_data, discount_routes):
-    """
-    Finds the shortest path (lowest price) between two airports using the
-    Bellman-Ford algorithm, handling potential discounts.
-
-    Args:
-        graph:  An adjacency list representing the flight network, where keys are
-                airport IATA codes and values are dictionaries of neighboring
-                airports with associated costs.
-        start: The IATA code of the starting airport.
-        end: The IATA code of the destination airport.
-        airport_data: The dictionary containing airport data.
-        discount_routes: A dictionary mapping (origin, destination) IATA pairs
-                        to (discount_percentage, is_two_way) tuples.
-
-    Returns:
-        A tuple containing:
-        - The total cost of the shortest path (float), or None if no path
-            exists or a negative-weight cycle is detected.
-        - A list of airport IATA codes representing the shortest path,
-            or None if no path exists or a negative-weight cycle is detected.
-        - The total *distance* of the shortest path (float), or None if no
-            path exists or a negative-weight cycle is detected.  This is
-            the *actual* distance traveled, *not* a cost.
-    """
-
-    distances = {node: float('inf') for node in graph}
-    predecessors = {node: None for node in graph}
-    distances[start] = 0
-
-    for _ in range(len(graph) - 1):
-        changed = False
-        for u in graph:
-            for v, data in graph[u].items():
-                if "cost" in data:
-                    cost = data["cost"]
-                    if distances[u] + cost < distances[v]:
-                        distances[v] = distances[u] + cost
-                        predecessors[v] = u
-                        changed = True
-        if not changed:
-            break
-
-    for u in graph:
-        for v, data in graph[u].items():
-            if "cost" in data:
-                cost = data["cost"]
-                if distances[u] + cost < distances[v]:
-                    print("Negative-weight cycle detected!")
-                    return None, None, None
-
-    if end not in distances:
-        return None, None, None
-
-    path = []
-    total_distance = 0
-    current = end
-    while current is not None:
-        path.append(current)
-        previous = predecessors[current]
-        if previous is not None:
-            total_distance += calculate_distance(airport_data[previous]["latitude_rad"],airport_data[previous]["longitude_rad"],airport_data[current]["latitude_rad"],airport_data[current]["longitude_rad"])
-
-        current = previous
-
-    path.reverse()
-    return distances[end], path, total_distance
-
-def print_detailed_route(path, airport_data):
+def print_detailed_route(path, airport_db):
     """
     Prints a detailed breakdown of the route, including airports, distances,
     and airlines.
 
     Args:
         path:  A list of airport IATA codes representing the route.
-        airport_data:  The dictionary containing airport and route data.
+        airport_db:  The AirportDatabase holding the airports and routes.
     """
     
     if path is None or len(path) < 2:
@@ -226,24 +91,14 @@ def print_detailed_route(path, airport_data):
         origin = path[i]
         destination = path[i + 1]
 
-        # Use pre-calculated radian values for distance calculation
-        distance = calculate_distance(
-            airport_data[origin]["latitude_rad"],
-            airport_data[origin]["longitude_rad"],
-            airport_data[destination]["latitude_rad"],
-            airport_data[destination]["longitude_rad"]
-        )
+        _, distance = get_price_for_route(origin, destination, airport_db, 0)
+        distance = distance or 0.0
         total_distance += distance
 
-        # --- Robust Airline Information Retrieval ---
-        airlines = []
-        # Check if 'routes' and origin airport exist in airport_data
-        if "routes" in airport_data.get(origin, {}) :
-            for route in airport_data[origin]["routes"]:
-                if route.get("iata") == destination:  # Use .get() for safety
-                    if "carriers" in route:
-                        for carrier in route["carriers"]:
-                            airlines.append(carrier.get("name", "Unknown Airline"))  # Use .get()
+        origin_airport = airport_db.get_airport(origin)
+        airlines = [carrier.name or "Unknown Airline"
+                    for route in (origin_airport.routes if origin_airport else []) if route.iata == destination
+                    for carrier in route.carriers]
 
         airline_str = ", ".join(airlines) if airlines else "Unknown Airline"
         print(f"{origin} -> {destination} | {distance:.0f} km | Airlines: {airline_str}")
@@ -252,10 +107,9 @@ def print_detailed_route(path, airport_data):
 
 
 def main():
-    filepath = "airline_routes.json"
-    airport_data = load_airport_data(filepath)
-
-    if not airport_data:
+    # The same snapshot the fare graph below is built from (the routes file is read once)
+    database = airport_db.snapshot
+    if not database.airports:
         return
 
     price_per_km = 0.25
@@ -263,43 +117,16 @@ def main():
     origin_iata = get_airport_code("Enter departure airport IATA code: ")
     destination_iata = get_airport_code("Enter destination airport IATA code: ")
 
-    discount_routes = {
-        ("JFK", "LAX"): (0.10, True),
-        ("LHR", "JFK"): (0.08, False),
-        ("JFK", "SYD"): (0.12, False),
-        ("CDG", "SIN"): (0.15, True),
-        ("ATL", "MIA"): (0.05, True),
-        ("ORD", "DFW"): (0.10, True),
-        ("FRA", "IST"): (0.18, False),
-        ("DXB", "BOM"): (0.20, True),
-        ("NRT", "HNL"): (0.07, False),
-        ("BOS", "JFK"): (0.03, True),
-        ("SEA", "SFO"): (0.05, True),
-        ("LHR", "CDG"): (0.02, False),
-        ("AMS", "BRU"): (0.02, True),
-        ("HKG", "TPE"): (0.04, False),
-        ("YYZ", "YVR"): (0.09, False),
-        ("GRU", "EZE"): (0.11, False),
-        ("JNB", "CPT"): (0.06, False),
-        ("ZZZ", "LAX"): (0.50, True),
-        ("JFK", "XXX"): (0.20, False),
-    }
-
-    graph_bf = {}
-    for airport, details in airport_data.items():
-        graph_bf[airport] = {}
-        if "routes" in details:
-            for route in details["routes"]:
-                destination = route["iata"]
-                price, _ = get_price_for_route_bellman_ford(airport, destination, airport_data, price_per_km, discount_routes)
-                if price is not None:
-                    graph_bf[airport][destination] = {"cost": price}
+    # Discounts come from the fare rule file and are compiled into per-route price multipliers
+    fare_engine = FareEngine(get_route_graph(), load_fare_rules(FARE_RULES_FILE), price_per_km)
 
-    bf_price, bf_path, total_bf_distance = bellman_ford(graph_bf, origin_iata, destination_iata, airport_data, discount_routes)
-    standard_price, standard_distance = get_price_for_route(origin_iata, destination_iata, airport_data, price_per_km)
+    # Dijkstra when every priced route is non-negative, SPFA with negative-cycle detection otherwise
+    fare_search = FareSearch(fare_engine.graph, fare_engine.costs)
+    bf_price, bf_path = fare_search.cheapest(origin_iata, destination_iata)
+    standard_price, standard_distance = get_price_for_route(origin_iata, destination_iata, database, price_per_km)
 
     if bf_price is not None:
-        print_detailed_route(bf_path, airport_data)  # Use the corrected function
+        print_detailed_route(bf_path, database)  # Use the corrected function
 
         if standard_price is not None and standard_price != 0:
             discount_percentage = ((standard_price - bf_price) / standard_price) * 100
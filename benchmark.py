@@ -0,0 +1,234 @@
+import argparse
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+from airline_class import AirportDatabase
+from data_loader import airport_db  # Import the global AirportDatabase object
+from synthetic_network import SyntheticNetwork
+import algorithms
+from fare_rules import FareEngine
+from fare_search import FareSearch
+from route_graph import get_route_graph
+from search_stats import collect_stats
+
+PERCENTILES = (50, 95, 99)
+
+# Startup budget: importing the app (all pages included) must stay below this, so a new worker serves quickly
+IMPORT_BUDGET_MS = 1000
+
+
+class CountingAirportDatabase(AirportDatabase):
+    """AirportDatabase that counts `get_airport` calls, the node expansions of the dict-based searches."""
+
+    def __init__(self, airport_data):
+        super().__init__(airport_data)
+        self.lookups = 0
+
+    def get_airport(self, iata_code):
+        self.lookups += 1
+        return self.airports.get(iata_code)
+
+
+def fare_search(origin, destination):
+    """Cheapest base-fare route (no discount rules) with the Bellman-Ford replacement."""
+    return FareSearch(_fare_engine.graph, _fare_engine.costs).cheapest(origin, destination)
+
+
+_fare_engine = None
+
+# name -> (function, query sets it runs on); airline queries pass the airline list as a third argument
+ALGORITHMS = {
+    "bfs_min_connections": (algorithms.bfs_min_connections, ("near", "far", "unreachable")),
+    "yen_k1": (lambda o, d: algorithms.yen_k_shortest_paths(o, d, 1), ("near", "far", "unreachable")),
+    "yen_k3": (lambda o, d: algorithms.yen_k_shortest_paths(o, d, 3), ("near", "far", "unreachable")),
+    "astar_preferred_airline": (lambda o, d, airlines: algorithms.astar_preferred_airline(o, d, airlines, k=1),
+                                ("airline",)),
+    "fare_search": (fare_search, ("near", "far", "unreachable")),
+}
+
+
+def run_queries(function, queries):
+    """Runs each query once. Returns (latencies in ms, airport lookups, nodes settled by instrumented searches)."""
+    database = airport_db.snapshot
+    lookups_before = database.lookups
+    latencies = []
+    with collect_stats() as stats:
+        for query in queries:
+            start = time.perf_counter()
+            function(*query)
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, database.lookups - lookups_before, sum(search.nodes_settled for search in stats)
+
+
+def measure(function, queries, memory=True):
+    """
+    Benchmarks one algorithm on one query set.
+
+    The first query is run once untimed so one-off index builds are reported separately
+    (`warmup_ms`) instead of skewing the percentiles. Peak memory is measured in a
+    second pass under tracemalloc, which would otherwise inflate the latencies.
+
+    Returns:
+        dict: Latency percentiles (ms), airport lookups and nodes settled per query and peak traced memory (KiB).
+    """
+    if not queries:
+        return None
+    start = time.perf_counter()
+    function(*queries[0])
+    warmup_ms = (time.perf_counter() - start) * 1000
+
+    latencies, lookups, settled = run_queries(function, queries)
+    result = {
+        "queries": len(queries),
+        "warmup_ms": round(warmup_ms, 3),
+        **{f"p{p}_ms": round(float(np.percentile(latencies, p)), 3) for p in PERCENTILES},
+        "mean_ms": round(float(np.mean(latencies)), 3),
+        "lookups_per_query": round(lookups / len(queries), 1),
+        "settled_per_query": round(settled / len(queries), 1),
+    }
+
+    if memory:
+        tracemalloc.start()
+        run_queries(function, queries)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_kib"] = round(peak / 1024, 1)
+    return result
+
+
+def run_benchmark(airport_count=1000, queries=50, seed=0, selected=None, memory=True):
+    """
+    Generates a synthetic network, serves it through `airport_db` and benchmarks every algorithm.
+
+    Args:
+        airport_count (int): Size of the synthetic network.
+        queries (int): Queries per query set.
+        seed (int): Seed of the network and the query sets.
+        selected (list): Algorithm names to run (default: all).
+        memory (bool): Also measure peak memory.
+
+    Returns:
+        dict: {'network': {...}, 'results': {algorithm: {query set: metrics}}}
+    """
+    global _fare_engine
+    start = time.perf_counter()
+    network = SyntheticNetwork(airport_count, seed=seed)
+    query_sets = network.query_sets(queries, seed)
+    generate_s = time.perf_counter() - start
+
+    # Swapping the snapshot notifies the reload listeners, so every cache is rebuilt for the new network
+    airport_db.swap(CountingAirportDatabase(network.airports))
+    _fare_engine = FareEngine(get_route_graph())
+
+    results = {}
+    for name, (function, sets) in ALGORITHMS.items():
+        if selected and name not in selected:
+            continue
+        results[name] = {query_set: measure(function, query_sets[query_set], memory) for query_set in sets}
+
+    return {
+        "network": {"airports": len(network.airports), "routes": network.route_count, "hubs": len(network.hubs),
+                    "seed": seed, "generate_s": round(generate_s, 2)},
+        "results": results,
+    }
+
+
+def print_report(report):
+    network = report["network"]
+    print(f"Network: {network['airports']} airports, {network['routes']} routes, {network['hubs']} hubs "
+          f"(seed {network['seed']}, generated in {network['generate_s']}s)")
+    header = f"{'algorithm':<26}{'queries':<13}" + "".join(f"{f'p{p} ms':>10}" for p in PERCENTILES)
+    print(header + f"{'warmup ms':>11}{'lookups':>10}{'settled':>10}{'peak KiB':>11}")
+    for name, sets in report["results"].items():
+        for query_set, metrics in sets.items():
+            if metrics is None:
+                continue
+            print(f"{name:<26}{query_set:<13}" + "".join(f"{metrics[f'p{p}_ms']:>10.2f}" for p in PERCENTILES)
+                  + f"{metrics['warmup_ms']:>11.1f}{metrics['lookups_per_query']:>10.0f}"
+                  + f"{metrics['settled_per_query']:>10.0f}"
+                  + f"{metrics.get('peak_kib', float('nan')):>11.1f}")
+
+
+def measure_import_time(module="app", runs=3, top=10):
+    """
+    Measures the import time of `module` in fresh interpreters with `python -X importtime`.
+
+    Args:
+        module (str): Module to import, e.g. 'app'.
+        runs (int): Interpreters to start; the fastest run is reported to filter out noise.
+        top (int): Number of slowest imports to list.
+
+    Returns:
+        dict: {'module', 'total_ms', 'budget_ms', 'slowest': [(module, cumulative ms, self ms), ...]},
+              or None if the import failed.
+    """
+    best = None
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"Error: importing {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+            return None
+
+        # Lines look like "import time:  self [us] | cumulative | imported package"
+        imports = []
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            fields = line[len("import time:"):].split("|")
+            if len(fields) != 3 or not fields[0].strip().isdigit():
+                continue  # Header line
+            imports.append((fields[2].strip(), int(fields[1]) / 1000, int(fields[0]) / 1000))
+
+        total_ms = next((cumulative for name, cumulative, _ in imports if name == module), 0.0)
+        if best is None or total_ms < best["total_ms"]:
+            best = {
+                "module": module,
+                "total_ms": round(total_ms, 1),
+                "budget_ms": IMPORT_BUDGET_MS,
+                "slowest": sorted(imports, key=lambda item: item[1], reverse=True)[1:top + 1],
+            }
+    return best
+
+
+def print_import_report(report):
+    status = "OK" if report["total_ms"] <= report["budget_ms"] else "OVER BUDGET"
+    print(f"import {report['module']}: {report['total_ms']:.0f} ms (budget {report['budget_ms']} ms) {status}")
+    print(f"{'module':<40}{'cumulative ms':>15}{'self ms':>10}")
+    for name, cumulative, own in report["slowest"]:
+        print(f"{name:<40}{cumulative:>15.1f}{own:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the route search algorithms on a synthetic network.")
+    parser.add_argument("--airports", type=int, default=1000, help="synthetic network size (up to 100000)")
+    parser.add_argument("--queries", type=int, default=50, help="queries per query set")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--algorithm", action="append", choices=list(ALGORITHMS), help="run only these (repeatable)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--json", help="also write the report to this file")
+    parser.add_argument("--import-time", action="store_true",
+                        help=f"check the startup import time of app.py against {IMPORT_BUDGET_MS} ms instead "
+                             f"(exits with status 1 when over budget)")
+    args = parser.parse_args()
+
+    if args.import_time:
+        report = measure_import_time()
+        if report is None:
+            sys.exit(1)
+        print_import_report(report)
+    else:
+        report = run_benchmark(args.airports, args.queries, args.seed, args.algorithm, not args.no_memory)
+        print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4)
+    if args.import_time and report["total_ms"] > report["budget_ms"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
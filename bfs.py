@@ -1,9 +1,8 @@
-import json
+from json_loader import read_json_file
 from collections import deque
 
 # loading of dataset
-with open('airline_routes.json', 'r') as file:
-    airports = json.load(file)
+airports = read_json_file('airline_routes.json')
 
 # BFS Algorithm to find minimum layovers between airports
 def bfs_min_connections(airports, start, goal):
@@ -0,0 +1,183 @@
+import threading
+import numpy as np
+from data_loader import airport_db  # Import the global AirportDatabase object
+from route_graph import get_route_graph
+from all_pairs import bookable_csr
+
+
+def strongly_connected_components(offsets, targets):
+    """
+    Tarjan's algorithm without recursion (deep route chains would overflow the Python stack).
+
+    Args:
+        offsets, targets (numpy.ndarray): CSR graph.
+
+    Returns:
+        numpy.ndarray: int32 component id per node. Ids are assigned in reverse topological
+        order of the condensation: every edge between components goes from a higher id to a lower one.
+    """
+    offsets, targets = offsets.tolist(), targets.tolist()
+    n = len(offsets) - 1
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    component = [-1] * n
+    stack = []
+    counter = 0
+    component_count = 0
+
+    for root in range(n):
+        if index[root] >= 0:
+            continue
+        work = [(root, offsets[root])]  # (node, next edge to look at)
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+
+        while work:
+            node, edge = work[-1]
+            if edge < offsets[node + 1]:
+                work[-1] = (node, edge + 1)
+                neighbor = targets[edge]
+                if index[neighbor] < 0:
+                    index[neighbor] = low[neighbor] = counter
+                    counter += 1
+                    stack.append(neighbor)
+                    on_stack[neighbor] = True
+                    work.append((neighbor, offsets[neighbor]))
+                elif on_stack[neighbor]:
+                    low[node] = min(low[node], index[neighbor])
+                continue
+
+            # All edges of node done: close its component if it is a root, then return to the parent
+            work.pop()
+            if low[node] == index[node]:
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component[member] = component_count
+                    if member == node:
+                        break
+                component_count += 1
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+
+    return np.array(component, dtype=np.int32)
+
+
+class Connectivity:
+    """
+    Strongly connected components of the bookable route network and reachability between them.
+
+    Airports in the same component can all reach each other. The components form a DAG
+    (the condensation), stored as CSR arrays. Reachability between two components is
+    searched on demand instead of precomputing a components x components matrix (about
+    1.25 GB at 100k airports): because every DAG edge goes from a higher component id to
+    a lower one, a target with a higher id than the source is rejected at once, and the
+    search never enters components numbered below the target.
+    """
+
+    def __init__(self, route_graph):
+        self.graph = route_graph
+        offsets, targets, _ = bookable_csr(route_graph)
+        sources = np.repeat(np.arange(route_graph.airport_count), np.diff(offsets))
+
+        self.component = strongly_connected_components(offsets, targets)
+        self.component_count = int(self.component.max()) + 1 if len(self.component) else 0
+        self.component_sizes = np.bincount(self.component, minlength=self.component_count)
+
+        # Condensation DAG edges, without self loops and duplicates
+        pairs = np.unique(np.stack([self.component[sources], self.component[targets]], axis=1), axis=0)
+        pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+        self.dag_sources, self.dag_targets = pairs[:, 0], pairs[:, 1]
+
+        # np.unique sorted the pairs by source component, so the DAG edges are already grouped like CSR
+        self.dag_offsets = np.searchsorted(self.dag_sources, np.arange(self.component_count + 1)).tolist()
+        self._dag_targets = self.dag_targets.tolist()
+
+    def reachable_components(self, source, lowest=0):
+        """
+        Returns the components reachable from `source` (itself included).
+
+        Args:
+            source (int): Component id to start from.
+            lowest (int): Components with a lower id are not explored (nothing below them can lead back up).
+
+        Returns:
+            set: Reachable component ids that are >= lowest.
+        """
+        seen = {source}
+        stack = [source]
+        offsets, targets = self.dag_offsets, self._dag_targets
+        while stack:
+            c = stack.pop()
+            for edge in range(offsets[c], offsets[c + 1]):
+                successor = targets[edge]
+                if successor >= lowest and successor not in seen:
+                    seen.add(successor)
+                    stack.append(successor)
+        return seen
+
+    def component_of(self, iata):
+        """Returns the component id of an airport, or None if it is not in the dataset."""
+        i = self.graph.index.get(iata)
+        return None if i is None else int(self.component[i])
+
+    def is_reachable(self, origin_iata, destination_iata):
+        """Returns True if some sequence of bookable routes leads from origin to destination."""
+        source, target = self.component_of(origin_iata), self.component_of(destination_iata)
+        if source is None or target is None:
+            return False
+        if source == target:
+            return True
+        if target > source:
+            return False  # Components are numbered sinks first: routes only lead to lower ids
+        return target in self.reachable_components(source, lowest=target)
+
+    def summary(self):
+        """Returns component statistics for diagnostics."""
+        largest = int(self.component_sizes.argmax()) if self.component_count else None
+        return {
+            "airports": self.graph.airport_count,
+            "components": self.component_count,
+            "singleton_components": int((self.component_sizes == 1).sum()),
+            "largest_component_size": int(self.component_sizes[largest]) if largest is not None else 0,
+            "condensation_edges": int(len(self.dag_sources)),
+        }
+
+    def describe_airport(self, iata):
+        """Returns the component of an airport and how much of the network it can reach, or None if unknown."""
+        c = self.component_of(iata)
+        if c is None:
+            return None
+        reachable_components = list(self.reachable_components(c))
+        return {
+            "iata": iata,
+            "component": c,
+            "component_size": int(self.component_sizes[c]),
+            "reachable_airports": int(self.component_sizes[reachable_components].sum()),
+        }
+
+
+_connectivity = None
+_connectivity_lock = threading.Lock()
+
+
+def get_connectivity():
+    """Returns the shared Connectivity index, building it on first use."""
+    global _connectivity
+    if _connectivity is None:
+        with _connectivity_lock:
+            if _connectivity is None:
+                _connectivity = Connectivity(get_route_graph())
+    return _connectivity
+
+
+@airport_db.on_reload
+def _invalidate_connectivity(diff):
+    """Drops the index when airports or the set of routes changed; it is rebuilt on next use."""
+    global _connectivity
+    if diff.topology_changed or diff.changed_routes:
+        _connectivity = None
@@ -1,97 +1,135 @@
-import json
+import argparse
 import datetime
 import random
+from functools import partial
+from itertools import islice
+from multiprocessing import Pool
+from json_stream import iter_json_object, write_json_object
 
-# def randomize_dates(filename: str, output_filename: str):
-#     """
-#     Randomizes departure and arrival dates in the given JSON file,
-#     maintaining the logical relationship between departure time,
-#     flight duration, and arrival time.  Dates are randomized within
-#     the next 365 days from the current date.
+# Airports handed to the worker pool at a time in parallel mode (bounds memory use)
+BATCH_SIZE = 256
 
-#     Args:
-#         filename: Path to the input JSON file.
-#         output_filename: Path to save the modified JSON data.
-#     """
 
-#     with open(filename, 'r', encoding='utf-8') as f:
-#         data = json.load(f)
+def randomize_seats(airport_iata, airport_data, max_seats=15):
+    """
+    Sets a random 'seats_remaining' on every carrier of an airport's routes.
 
-#     now = datetime.datetime.now()
+    Args:
+        airport_iata: IATA code of the airport (unused, part of the transform signature).
+        airport_data: The airport dictionary from the routes file.
+        max_seats: Upper bound (inclusive) of the random seat count.
 
-#     for airport_iata, airport_data in data.items():
-#         if 'routes' in airport_data:
-#             for route in airport_data['routes']:
-#                 for carrier_data in route['carriers']:
-#                     # 1. Randomize the *departure date* (within the next 30 days)
-#                     random_days_offset = random.randint(0, 30)
-#                     base_departure_datetime = now + datetime.timedelta(days=random_days_offset)
+    Returns:
+        The modified airport dictionary.
+    """
+    for route in airport_data.get('routes', []):
+        for carrier_data in route.get('carriers', []):
+            carrier_data['seats_remaining'] = random.randint(0, max_seats)
+    return airport_data
 
-#                     # 2. Randomize the *departure time* (between 6 AM and 10 PM)
-#                     departure_hour = random.randint(6, 22)
-#                     departure_minute = random.choice([0, 15, 30, 45])
-#                     base_departure_datetime = base_departure_datetime.replace(hour=departure_hour, minute=departure_minute, second=0, microsecond=0)
 
-#                     # 3. Calculate the *arrival datetime* based on the flight duration
-#                     flight_duration = datetime.timedelta(minutes=int(route['min']))
-#                     arrival_datetime = base_departure_datetime + flight_duration
+def randomize_dates(airport_iata, airport_data, days_ahead=30):
+    """
+    Randomizes departure and arrival dates of every carrier of an airport's routes,
+    maintaining the logical relationship between departure time, flight duration
+    and arrival time. Departures fall within the next `days_ahead` days between
+    6 AM and 10 PM.
 
+    Args:
+        airport_iata: IATA code of the airport (unused, part of the transform signature).
+        airport_data: The airport dictionary from the routes file.
+        days_ahead: Number of days from today that departures are spread over.
 
-#                     # 4. Format the dates and times (ISO 8601 format)
-#                     departure_date = base_departure_datetime.strftime("%Y-%m-%d")
-#                     departure_time = base_departure_datetime.strftime("%H:%M")
-#                     arrival_date = arrival_datetime.strftime("%Y-%m-%d")
-#                     arrival_time = arrival_datetime.strftime("%H:%M")
+    Returns:
+        The modified airport dictionary.
+    """
+    now = datetime.datetime.now()
 
-#                     # 5. Update the carrier_data dictionary
-#                     carrier_data['departure_date'] = departure_date
-#                     carrier_data['departure_time'] = departure_time
-#                     carrier_data['arrival_date'] = arrival_date
-#                     carrier_data['arrival_time'] = arrival_time
-#                     # Timezones are kept as they were, since those are location-based
+    for route in airport_data.get('routes', []):
+        for carrier_data in route.get('carriers', []):
+            # 1. Randomize the departure date and time
+            departure = now + datetime.timedelta(days=random.randint(0, days_ahead))
+            departure = departure.replace(hour=random.randint(6, 22), minute=random.choice([0, 15, 30, 45]),
+                                          second=0, microsecond=0)
 
+            # 2. Calculate the arrival from the flight duration
+            arrival = departure + datetime.timedelta(minutes=int(route.get('min') or 0))
 
-#     # Save the modified data
-#     with open(output_filename, 'w', encoding='utf-8') as outfile:
-#         json.dump(data, outfile, indent=4)
+            # 3. Update the carrier (timezones are location-based and kept as they were)
+            carrier_data['departure_date'] = departure.strftime("%Y-%m-%d")
+            carrier_data['departure_time'] = departure.strftime("%H:%M")
+            carrier_data['arrival_date'] = arrival.strftime("%Y-%m-%d")
+            carrier_data['arrival_time'] = arrival.strftime("%H:%M")
+    return airport_data
 
 
+def apply_transforms(transforms, item):
+    """Applies every transform in order to one (airport_iata, airport_data) pair."""
+    airport_iata, airport_data = item
+    for transform in transforms:
+        airport_data = transform(airport_iata, airport_data)
+    return airport_iata, airport_data
 
-# def main():
-#     randomize_dates('airline_routes_with_datetime.json', 'airline_routes_with_datetime.json')
-#     print("Randomized dates and saved to airline_routes_with_datetime.json")
 
+def transform_file(filename, transforms, output_filename=None, workers=1, batch_size=BATCH_SIZE):
+    """
+    Streams the routes file through a list of per-airport transforms.
 
-# if __name__ == '__main__':
-#     main()
+    Airports are parsed one at a time, transformed, and written to a temporary file that
+    atomically replaces the output once complete, so memory stays bounded by a batch of
+    airports and an interrupted run leaves the original file untouched.
 
-def add_seats_remaining(filename: str):
+    Args:
+        filename: Path to the input JSON file.
+        transforms: Functions `transform(airport_iata, airport_data) -> airport_data`.
+        output_filename: Path to write to (defaults to modifying `filename` in place).
+        workers: Number of processes; airports are transformed in parallel when > 1.
+        batch_size: Airports sent to the pool at a time in parallel mode.
+
+    Returns:
+        The number of airports written.
+    """
+    items = iter_json_object(filename)
+    apply = partial(apply_transforms, list(transforms))
+
+    if workers <= 1:
+        return write_json_object(map(apply, items), output_filename or filename)
+
+    # Reseed each worker so forked processes do not share one random sequence
+    with Pool(processes=workers, initializer=random.seed) as pool:
+        def transformed():
+            while True:
+                batch = list(islice(items, batch_size))
+                if not batch:
+                    return
+                yield from pool.map(apply, batch)
+
+        return write_json_object(transformed(), output_filename or filename)
+
+
+def add_seats_remaining(filename: str, workers: int = 1):
     """
     Adds a 'seats_remaining' field to each carrier in the routes of the JSON data,
     modifying the file in-place.
 
     Args:
         filename: Path to the JSON file.
+        workers: Number of processes used to transform airports in parallel.
     """
-
-    with open(filename, 'r+', encoding='utf-8') as f:  # Open in 'r+' mode
-        data = json.load(f)
-
-        for airport_iata, airport_data in data.items():
-            if 'routes' in airport_data:
-                for route in airport_data['routes']:
-                    for carrier_data in route['carriers']:
-                        seats_remaining = random.randint(0, 15)
-                        carrier_data['seats_remaining'] = seats_remaining
-
-        f.seek(0)  # Rewind to the beginning of the file
-        json.dump(data, f, indent=4)  # Overwrite the file
-        f.truncate()  # Remove any remaining old content
+    transform_file(filename, [randomize_seats], workers=workers)
 
 
 def main():
-    add_seats_remaining('airline_routes.json')
-    print("Modified airline_routes.json in place.")
+    parser = argparse.ArgumentParser(description="Refresh seat inventory and schedules in the routes file.")
+    parser.add_argument("filename", nargs="?", default="airline_routes.json")
+    parser.add_argument("--output", help="Write to this file instead of modifying the input in place")
+    parser.add_argument("--dates", action="store_true", help="Also randomize departure and arrival dates")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes")
+    args = parser.parse_args()
+
+    transforms = [randomize_seats] + ([randomize_dates] if args.dates else [])
+    count = transform_file(args.filename, transforms, args.output, args.workers)
+    print(f"Modified {count} airports in {args.output or args.filename}.")
 
 if __name__ == '__main__':
     main()
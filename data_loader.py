@@ -1,34 +1,248 @@
-import json
-from airline_class import AirportDatabase  
+import os
+import sqlite3
+import threading
+from airline_class import AirportDatabase, LazyAirportDatabase, LazyAirports
+from json_loader import read_airport_records
+from sqlite_airport_db import SQLITE_SUFFIXES, SQLiteAirportDatabase
 
-def load_airport_data(file_path):
-    data = read_json_file(file_path)
-    return AirportDatabase(data)
+# Seconds between checks of the routes file for changes
+RELOAD_INTERVAL = 5
 
-def read_json_file(file_path):
+# Set SKYWINGS_LAZY_LOAD=1 to build airports on first access instead of all at startup
+LAZY_LOAD = os.environ.get("SKYWINGS_LAZY_LOAD") == "1"
+
+# Routes file served by `airport_db`; a .sqlite/.db file built by sqlite_airport_db.py is opened with SQLite
+ROUTES_FILE = os.environ.get("SKYWINGS_ROUTES_FILE", "airline_routes.json")
+
+def load_airport_data(file_path, lazy=False):
     """
-    Reads a JSON file and returns the data as a Python dictionary or list.
+    Loads the routes file into an AirportDatabase.
 
     Args:
-        file_path (str): The path to the JSON file.
+        file_path (str): The path to the routes file (JSON, or SQLite for SQLITE_SUFFIXES).
+        lazy (bool): Only index the file and build each airport on first access.
 
     Returns:
-        dict or list:   The JSON data as a Python dictionary or list,
-                        or None if an error occurred.
-    """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data
-    except FileNotFoundError:
-        print(f"Error: File not found at {file_path}")
-        return None
-    except json.JSONDecodeError:
-        print(f"Error: Invalid JSON format in {file_path}")
-        return None
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
+        AirportDatabase: The database, or None if the file could not be read.
+    """
+    if file_path.endswith(SQLITE_SUFFIXES):
+        try:
+            return SQLiteAirportDatabase(file_path)
+        except sqlite3.Error as e:
+            print(f"Error: Could not open {file_path}: {e}")
+            return None
+    if lazy:
+        try:
+            return LazyAirportDatabase(file_path)
+        except FileNotFoundError:
+            print(f"Error: File not found at {file_path}")
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not index {file_path}: {e}")
         return None
+    data = read_airport_records(file_path)
+    return None if data is None else AirportDatabase(data)
+
+def airport_signature(airport):
+    """Returns the comparable attributes of an airport itself (without its routes)."""
+    return (airport.name, airport.city_name, airport.country, airport.country_code, airport.continent,
+            airport.display_name, airport.elevation, airport.icao, airport.latitude, airport.longitude,
+            airport.timezone)
+
+
+def route_signature(route):
+    """
+    Returns the comparable attributes of a route and its carriers.
+
+    Seat counts are left out on purpose: live seats are owned by the seat inventory,
+    so a file update that only touches `seats_remaining` is not a schedule change.
+    """
+    return (route.km, route.min, tuple(
+        (carrier.iata, carrier.name, carrier.departure_date, carrier.departure_time,
+         carrier.arrival_date, carrier.arrival_time, carrier.departure_timezone, carrier.arrival_timezone)
+        for carrier in route.carriers
+    ))
+
+
+class DatabaseDiff:
+    """
+    Differences between two AirportDatabase snapshots.
+
+    Attributes:
+        added_airports, removed_airports (set): IATA codes present in only one snapshot.
+        changed_airports (set): Airports whose own attributes (name, coordinates, ...) changed.
+        added_routes, removed_routes (set): (origin, destination) pairs present in only one snapshot.
+        changed_routes (set): (origin, destination) pairs whose distance, duration or carriers changed.
+    """
+
+    def __init__(self, old_db, new_db):
+        old_airports, new_airports = old_db.airports, new_db.airports
+        self.added_airports = new_airports.keys() - old_airports.keys()
+        self.removed_airports = old_airports.keys() - new_airports.keys()
+        self.changed_airports = set()
+        self.added_routes = set()
+        self.removed_routes = set()
+        self.changed_routes = set()
+        compare_raw = isinstance(old_airports, LazyAirports) and isinstance(new_airports, LazyAirports)
+
+        for iata in old_airports.keys() & new_airports.keys():
+            if compare_raw and old_airports.raw(iata) == new_airports.raw(iata):
+                continue  # Byte-identical JSON: skip building either Airport
+            old_airport, new_airport = old_airports[iata], new_airports[iata]
+            if airport_signature(old_airport) != airport_signature(new_airport):
+                self.changed_airports.add(iata)
+
+            old_routes = {route.iata: route_signature(route) for route in old_airport.routes}
+            new_routes = {route.iata: route_signature(route) for route in new_airport.routes}
+            if old_routes == new_routes:
+                continue
+            self.added_routes.update((iata, dest) for dest in new_routes.keys() - old_routes.keys())
+            self.removed_routes.update((iata, dest) for dest in old_routes.keys() - new_routes.keys())
+            self.changed_routes.update(
+                (iata, dest) for dest in old_routes.keys() & new_routes.keys() if old_routes[dest] != new_routes[dest]
+            )
+
+        for iata in self.added_airports:
+            self.added_routes.update((iata, route.iata) for route in new_airports[iata].routes)
+        for iata in self.removed_airports:
+            self.removed_routes.update((iata, route.iata) for route in old_airports[iata].routes)
+
+    @property
+    def topology_changed(self):
+        """True if airports, their coordinates, or the set of routes changed (graph structures must be rebuilt)."""
+        return bool(self.added_airports or self.removed_airports or self.changed_airports
+                    or self.added_routes or self.removed_routes)
+
+    @property
+    def affected_airports(self):
+        """Every airport that was added, removed, changed, or has a changed outgoing route."""
+        origins = {origin for origin, _ in self.added_routes | self.removed_routes | self.changed_routes}
+        return self.added_airports | self.removed_airports | self.changed_airports | origins
+
+    @property
+    def is_empty(self):
+        return not (self.topology_changed or self.changed_routes)
+
+    def __repr__(self):
+        return (f"DatabaseDiff(+{len(self.added_airports)}/-{len(self.removed_airports)}/~{len(self.changed_airports)} airports, "
+                f"+{len(self.added_routes)}/-{len(self.removed_routes)}/~{len(self.changed_routes)} routes)")
+
+
+class LiveAirportDatabase:
+    """
+    Stable handle to the current AirportDatabase that can be reloaded without restarting.
+
+    Pages and algorithms keep importing `airport_db` and calling `get_airport` / `airports`
+    as before; those calls are forwarded to the current snapshot. A reload builds the new
+    database off to the side, diffs it against the current one, swaps it in under a new
+    version number and then notifies the `on_reload` listeners with the diff so each cache
+    can drop only what the change affects. Code that needs a consistent view across
+    several calls should take `snapshot` once and use that. A replaced snapshot stays
+    fully usable for as long as something holds it; files and connections it keeps
+    open are released when it is garbage-collected.
+
+    The routes file is only read on first access, so importing this module (and every
+    page that imports `airport_db`) stays cheap. With `lazy`, snapshots are
+    LazyAirportDatabase objects that also build airports on first access.
+    """
+
+    def __init__(self, file_path, lazy=LAZY_LOAD):
+        self.file_path = file_path
+        self.lazy = lazy
+        self.version = 1
+        self._snapshot = None
+        self._file_state = None
+        self._listeners = []
+        self._swap_lock = threading.Lock()
+        self._watcher = None
+
+    @property
+    def snapshot(self):
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._swap_lock:
+                if self._snapshot is None:
+                    self._file_state = self._stat()
+                    # An unreadable file is reported by load_airport_data; serve no airports until it is fixed
+                    self._snapshot = load_airport_data(self.file_path, self.lazy) or AirportDatabase({})
+                snapshot = self._snapshot
+        return snapshot
+
+    @property
+    def loaded(self):
+        """True once the routes file has been read."""
+        return self._snapshot is not None
+
+    @property
+    def airports(self):
+        return self.snapshot.airports
+
+    def get_airport(self, iata_code):
+        return self.snapshot.get_airport(iata_code)
+
+    def on_reload(self, listener):
+        """Registers `listener(diff)` to be called after every swap that changed something."""
+        self._listeners.append(listener)
+        return listener
+
+    def swap(self, new_db):
+        """
+        Replaces the current snapshot and notifies listeners.
+
+        Args:
+            new_db (AirportDatabase): The database to serve from now on.
+
+        Returns:
+            DatabaseDiff: What changed between the old and the new snapshot.
+        """
+        with self._swap_lock:
+            diff = DatabaseDiff(self._snapshot or AirportDatabase({}), new_db)
+            self._snapshot = new_db
+            self.version += 1
+
+        if not diff.is_empty:
+            for listener in self._listeners:
+                try:
+                    listener(diff)
+                except Exception as e:
+                    print(f"Error in reload listener {listener}: {e}")
+        return diff
+
+    def reload(self):
+        """Rebuilds the database from the routes file and swaps it in. Returns the diff, or None on error."""
+        self._file_state = self._stat()
+        new_db = load_airport_data(self.file_path, self.lazy)
+        if new_db is None:
+            return None  # Keep serving the current snapshot
+        diff = self.swap(new_db)
+        print(f"Reloaded {self.file_path} as version {self.version}: {diff}")
+        return diff
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.file_path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def start_watching(self, interval=RELOAD_INTERVAL):
+        """Starts a daemon thread that reloads the database whenever the routes file changes."""
+        if self._watcher is not None:
+            return
+
+        def watch():
+            stop = threading.Event()
+            while not stop.wait(interval):
+                # Before the first access there is nothing to reload: that access reads the current file
+                if self.loaded and self._stat() != self._file_state:
+                    self.reload()
+
+        self._watcher = threading.Thread(target=watch, name="airport-db-watcher", daemon=True)
+        self._watcher.start()
+
+    def __repr__(self):
+        snapshot = self._snapshot if self._snapshot is not None else "not loaded"
+        return f"LiveAirportDatabase(version={self.version}, {snapshot})"
+
 
 # Initialize globally so all pages can import it
-airport_db = load_airport_data('airline_routes.json')
+airport_db = LiveAirportDatabase(ROUTES_FILE)
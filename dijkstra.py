@@ -1,10 +1,9 @@
-import json
+from json_loader import read_json_file
 import heapq
 from math import radians, cos, sin, sqrt, atan2
 
 # Load the dataset
-with open('airline_routes.json', 'r') as file:
-    airports = json.load(file)
+airports = read_json_file('airline_routes.json')
 
 # Calculate heuristic using haversine distance
 def haversine(lat1, lon1, lat2, lon2):
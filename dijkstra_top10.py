@@ -1,10 +1,9 @@
-import json
+from json_loader import read_json_file
 import heapq
 from collections import defaultdict
 
 # Load the dataset
-with open('airline_routes.json', 'r') as file:
-   airports = json.load(file)
+airports = read_json_file('airline_routes.json')
 
 # Convert JSON to a graph structure
 def build_graph(airports):
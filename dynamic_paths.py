@@ -0,0 +1,283 @@
+import heapq
+import threading
+from data_loader import airport_db  # Import the global AirportDatabase object
+from seat_inventory import flight_key, get_seat_inventory, on_availability_change, route_of
+
+# Origins whose shortest-path trees are kept up to date across route updates
+TRACKED_ORIGINS = ("SIN", "LHR", "JFK", "DXB")
+
+
+class ShortestPathTree:
+    """
+    Shortest-distance tree (by route km) from one origin, repaired in place when edges change.
+
+    Decreases (new route or shorter distance) are propagated with a Dijkstra pass that
+    starts at the improved airport. Increases and deletions of a tree edge only reset the
+    subtree hanging below it; those airports are re-attached from their best unaffected
+    in-neighbour and settled with a Dijkstra pass restricted to the subtree.
+    """
+
+    def __init__(self, graph, origin):
+        self.graph = graph
+        self.origin = origin
+        self.dist = {}
+        self.parent = {}
+        self.children = {}
+        self.recompute()
+
+    def recompute(self):
+        """Builds the tree from scratch with Dijkstra."""
+        self.dist = {self.origin: 0}
+        self.parent = {self.origin: None}
+        self.children = {self.origin: set()}
+        self._settle([(0, self.origin)])
+
+    def _attach(self, node, parent, distance):
+        """Sets the tree parent and distance of a node."""
+        old_parent = self.parent.get(node)
+        if old_parent is not None:
+            self.children[old_parent].discard(node)
+        self.parent[node] = parent
+        self.dist[node] = distance
+        self.children.setdefault(node, set())
+        if parent is not None:
+            self.children[parent].add(node)
+
+    def _settle(self, heap, allowed=None):
+        """Dijkstra from the given (distance, node) entries, optionally only improving nodes in `allowed`."""
+        heapq.heapify(heap)
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if distance > self.dist.get(node, float('inf')):
+                continue  # Stale heap entry
+            for neighbor, weight in self.graph.out_edges(node).items():
+                if allowed is not None and neighbor not in allowed:
+                    continue
+                new_distance = distance + weight
+                if new_distance < self.dist.get(neighbor, float('inf')):
+                    self._attach(neighbor, node, new_distance)
+                    heapq.heappush(heap, (new_distance, neighbor))
+
+    def edge_decreased(self, u, v, weight):
+        """Repairs the tree after edge u -> v was added or got shorter."""
+        if u not in self.dist:
+            return  # u is unreachable, so the edge changes nothing
+        new_distance = self.dist[u] + weight
+        if new_distance < self.dist.get(v, float('inf')):
+            self._attach(v, u, new_distance)
+            self._settle([(new_distance, v)])
+
+    def edge_increased(self, u, v):
+        """Repairs the tree after edge u -> v was removed or got longer."""
+        if self.parent.get(v) != u:
+            return  # Not a tree edge, no distance depends on it
+
+        # Collect the subtree below v; only these distances can get worse
+        affected = set()
+        stack = [v]
+        while stack:
+            node = stack.pop()
+            affected.add(node)
+            stack.extend(self.children.get(node, ()))
+
+        for node in affected:
+            parent = self.parent.pop(node, None)
+            if parent is not None and parent not in affected:
+                self.children[parent].discard(node)
+            self.dist.pop(node, None)
+            self.children[node] = set()
+
+        # Re-attach every affected airport through its best unaffected in-neighbour
+        heap = []
+        for node in affected:
+            best, best_parent = float('inf'), None
+            for predecessor, weight in self.graph.in_edges(node).items():
+                if predecessor in affected or predecessor not in self.dist:
+                    continue
+                if self.dist[predecessor] + weight < best:
+                    best, best_parent = self.dist[predecessor] + weight, predecessor
+            if best_parent is not None:
+                self._attach(node, best_parent, best)
+                heap.append((best, node))
+
+        self._settle(heap, allowed=affected)
+
+        for node in affected:
+            if node not in self.dist:
+                self.children.pop(node, None)  # Now unreachable
+
+    def path_to(self, destination):
+        """Returns the shortest path from the origin as a list of IATA codes, or None if unreachable."""
+        if destination not in self.dist:
+            return None
+        path = []
+        node = destination
+        while node is not None:
+            path.append(node)
+            node = self.parent[node]
+        path.reverse()
+        return path
+
+
+def bookable_km(database, origin, destination, sold_out=frozenset()):
+    """
+    Returns the distance of the route origin -> destination if it can be booked, else None.
+
+    A route is bookable when both airports exist and at least one of its carrier flights
+    is not in `sold_out` (flight keys without seats, see SeatInventory.sold_out_keys).
+    """
+    airport = database.get_airport(origin)
+    if not airport or not database.get_airport(destination):
+        return None
+    distances = [route.km for route in airport.routes if route.iata == destination
+                 and any(flight_key(origin, destination, carrier) not in sold_out for carrier in route.carriers)]
+    return min(distances) if distances else None
+
+
+class DynamicRouteGraph:
+    """
+    Route graph (routes with at least one carrier flight that has seats, weighted by km)
+    that supports edge insertions, deletions and weight changes while keeping the
+    shortest-path trees of tracked origins correct through incremental repair instead
+    of full recomputation.
+    """
+
+    def __init__(self, airport_db, tracked_origins=(), sold_out=frozenset()):
+        self._out = {}
+        self._in = {}
+        self._lock = threading.RLock()
+        self.trees = {}
+
+        for airport in airport_db.airports.values():
+            self._out.setdefault(airport.iata, {})
+            self._in.setdefault(airport.iata, {})
+            for destination in {route.iata for route in airport.routes}:
+                km = bookable_km(airport_db, airport.iata, destination, sold_out)
+                if km is not None:
+                    self._set(airport.iata, destination, km)
+
+        for origin in tracked_origins:
+            if origin in self._out:
+                self.track(origin)
+
+    def _set(self, u, v, weight):
+        self._out.setdefault(u, {})[v] = weight
+        self._in.setdefault(v, {})[u] = weight
+        self._out.setdefault(v, {})
+        self._in.setdefault(u, {})
+
+    def out_edges(self, node):
+        return self._out.get(node, {})
+
+    def in_edges(self, node):
+        return self._in.get(node, {})
+
+    def adjacency(self):
+        """Returns a copy of the graph as {origin: [(destination, km), ...]} (the format used by Yen's algorithm)."""
+        with self._lock:
+            return {node: list(neighbors.items()) for node, neighbors in self._out.items()}
+
+    def track(self, origin):
+        """Starts maintaining the shortest-path tree of an origin and returns it."""
+        with self._lock:
+            if origin not in self.trees:
+                self.trees[origin] = ShortestPathTree(self, origin)
+            return self.trees[origin]
+
+    def set_edge(self, u, v, weight):
+        """Inserts route u -> v or changes its distance, repairing every tracked tree."""
+        with self._lock:
+            old_weight = self._out.get(u, {}).get(v)
+            if old_weight == weight:
+                return
+            self._set(u, v, weight)
+            for tree in self.trees.values():
+                if old_weight is None or weight < old_weight:
+                    tree.edge_decreased(u, v, weight)
+                else:
+                    tree.edge_increased(u, v)
+
+    def remove_edge(self, u, v):
+        """Deletes route u -> v (cancelled or sold out), repairing every tracked tree."""
+        with self._lock:
+            if v not in self._out.get(u, {}):
+                return
+            del self._out[u][v]
+            del self._in[v][u]
+            for tree in self.trees.values():
+                tree.edge_increased(u, v)
+
+    def shortest_path(self, origin, destination):
+        """Returns the shortest path from a tracked origin, or None if the origin is not tracked or no path exists."""
+        tree = self.trees.get(origin)
+        if tree is None:
+            return None
+        with self._lock:
+            return tree.path_to(destination)
+
+    def apply_diff(self, new_db, diff, sold_out=frozenset()):
+        """Applies the route changes of a database reload as individual edge updates."""
+        for origin, destination in diff.removed_routes:
+            self.remove_edge(origin, destination)
+
+        for origin, destination in diff.added_routes | diff.changed_routes:
+            km = bookable_km(new_db, origin, destination, sold_out)
+            if km is not None:
+                self.set_edge(origin, destination, km)
+            else:
+                self.remove_edge(origin, destination)
+
+
+_dynamic_graph = None
+_dynamic_graph_lock = threading.Lock()
+
+
+def get_dynamic_graph():
+    """Returns the shared DynamicRouteGraph, building it (and the tracked trees) on first use."""
+    global _dynamic_graph
+    if _dynamic_graph is None:
+        with _dynamic_graph_lock:
+            if _dynamic_graph is None:
+                # Flights that start out with no seats are left out, as if they had sold out at runtime
+                _dynamic_graph = DynamicRouteGraph(airport_db.snapshot, TRACKED_ORIGINS,
+                                                   get_seat_inventory().sold_out_keys())
+    return _dynamic_graph
+
+
+def set_route_available(origin, destination, available):
+    """
+    Removes a route from (or restores it to) the shared graph, e.g. when its last seat is sold.
+
+    Args:
+        origin (str): IATA code of the departure airport.
+        destination (str): IATA code of the arrival airport.
+        available (bool): Whether the route can currently be booked.
+    """
+    graph = get_dynamic_graph()
+    if not available:
+        graph.remove_edge(origin, destination)
+        return
+
+    km = bookable_km(airport_db, origin, destination, get_seat_inventory().sold_out_keys())
+    if km is not None:
+        graph.set_edge(origin, destination, km)
+
+
+@on_availability_change
+def _apply_seat_availability(sold_out_keys, restocked_keys):
+    """Drops routes whose last seat was taken and restores routes that got seats back."""
+    if _dynamic_graph is None:
+        return
+    inventory = get_seat_inventory()
+    for origin, destination in {route_of(key) for key in sold_out_keys}:
+        if not inventory.route_has_seats(airport_db, origin, destination):
+            set_route_available(origin, destination, False)
+    for origin, destination in {route_of(key) for key in restocked_keys}:
+        set_route_available(origin, destination, True)
+
+
+@airport_db.on_reload
+def _apply_reload(diff):
+    """Feeds reloaded routes into the shared graph as incremental edge updates."""
+    if _dynamic_graph is not None:
+        _dynamic_graph.apply_diff(airport_db.snapshot, diff, get_seat_inventory().sold_out_keys())
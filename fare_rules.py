@@ -0,0 +1,189 @@
+import json
+from collections import defaultdict
+from datetime import date
+import numpy as np
+from pricing import great_circle_km, PRICE_PER_KM
+
+# Default location of the discount / fare rule file
+FARE_RULES_FILE = "fare_rules.json"
+
+# Supported rule types and the fields that select the routes they apply to:
+#   route   - "origin", "destination" and optional "two_way" (also discounts destination -> origin)
+#   airline - "airline": every route operated by at least one carrier of that airline
+#   country - "country": every route departing from or arriving in that country
+# Any rule may carry "valid_from" / "valid_to" (YYYY-MM-DD, inclusive) to limit when it applies.
+RULE_TYPES = ("route", "airline", "country")
+
+
+def load_fare_rules(file_path=FARE_RULES_FILE):
+    """
+    Reads discount rules from a JSON file.
+
+    Args:
+        file_path (str): Path to a JSON file of the form {"rules": [ {...}, ... ]}.
+
+    Returns:
+        list: The valid rules as dictionaries (invalid entries are reported and skipped),
+              or an empty list if the file could not be read.
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        print(f"Error: File not found at {file_path}")
+        return []
+    except json.JSONDecodeError:
+        print(f"Error: Invalid JSON format in {file_path}")
+        return []
+
+    rules = []
+    for rule in data.get("rules", []):
+        normalized = normalize_rule(rule)
+        if normalized is None:
+            print(f"Warning: Skipping invalid fare rule {rule}")
+        else:
+            rules.append(normalized)
+    return rules
+
+
+def normalize_rule(rule):
+    """Validates a rule and upper-cases its IATA codes. Returns None if the rule is invalid."""
+    if not isinstance(rule, dict) or rule.get("type") not in RULE_TYPES:
+        return None
+    try:
+        discount = float(rule["discount"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not 0 <= discount <= 1:
+        return None  # A fraction of the base fare: outside [0, 1] would price a route negative or above base
+
+    normalized = dict(rule, discount=discount)
+    if rule["type"] == "route":
+        if not rule.get("origin") or not rule.get("destination"):
+            return None
+        normalized["origin"] = rule["origin"].upper()
+        normalized["destination"] = rule["destination"].upper()
+        normalized["two_way"] = bool(rule.get("two_way", False))
+    elif rule["type"] == "airline":
+        if not rule.get("airline"):
+            return None
+        normalized["airline"] = rule["airline"].upper()
+    elif not rule.get("country"):
+        return None
+    return normalized
+
+
+def rule_key(rule):
+    """Returns a hashable identity for a rule, used to diff two rule sets."""
+    return json.dumps(rule, sort_keys=True)
+
+
+class FareEngine:
+    """
+    Compiles fare rules into one price multiplier per route of a RouteGraph.
+
+    The priced graph is `costs[e] = base_cost[e] * multipliers[e]`. When several rules match
+    a route the largest discount wins. Each rule's route set is resolved once through
+    per-airline and per-country edge indexes, so replacing the rules with `set_rules`
+    only re-prices the routes touched by the rules that changed. Time-windowed rules
+    are evaluated for the engine's date (`as_of`, default today).
+    """
+
+    def __init__(self, route_graph, rules=(), price_per_km=PRICE_PER_KM, as_of=None):
+        self.graph = route_graph
+        self.as_of = (as_of or date.today()).isoformat()
+
+        self.base_cost = great_circle_km(
+            route_graph.latitude[route_graph.sources], route_graph.longitude[route_graph.sources],
+            route_graph.latitude[route_graph.targets], route_graph.longitude[route_graph.targets]
+        ) * price_per_km
+        self.multipliers = np.ones(route_graph.edge_count)
+        self.costs = self.base_cost.copy()
+
+        # Indexes used to resolve airline and country rules to edge ids
+        airline_edges = defaultdict(list)
+        for edge, airlines in enumerate(route_graph.edge_airlines):
+            for airline in set(airlines):
+                airline_edges[(airline or "").upper()].append(edge)
+        self._airline_edges = {airline: np.array(edges, dtype=np.int64) for airline, edges in airline_edges.items()}
+        self._country_of_source = route_graph.countries[route_graph.sources]
+        self._country_of_target = route_graph.countries[route_graph.targets]
+
+        self._rules = {}  # rule_key -> rule
+        self._rule_edges = {}  # rule_key -> edge ids the rule applies to
+        self.set_rules(rules)
+
+    def is_active(self, rule):
+        """Returns True if the rule's time window (if any) contains the engine's current date."""
+        return (rule.get("valid_from", "") <= self.as_of) and (self.as_of <= rule.get("valid_to", "9999-12-31"))
+
+    def edges_for_rule(self, rule):
+        """Returns the ids of the edges a rule applies to."""
+        if rule["type"] == "route":
+            pairs = [(rule["origin"], rule["destination"])]
+            if rule.get("two_way"):
+                pairs.append((rule["destination"], rule["origin"]))
+            edges = [self.graph.edge_id(origin, destination) for origin, destination in pairs]
+            return np.array([edge for edge in edges if edge is not None], dtype=np.int64)
+        if rule["type"] == "airline":
+            return self._airline_edges.get(rule["airline"], np.zeros(0, dtype=np.int64))
+        country = rule["country"]
+        return np.nonzero((self._country_of_source == country) | (self._country_of_target == country))[0]
+
+    def set_rules(self, rules):
+        """
+        Replaces the rule set, re-pricing only the edges covered by added or removed rules.
+
+        Args:
+            rules (iterable): Normalized rule dictionaries.
+
+        Returns:
+            int: Number of edges that were re-priced.
+        """
+        new_rules = {rule_key(rule): rule for rule in rules}
+        added = new_rules.keys() - self._rules.keys()
+        removed = self._rules.keys() - new_rules.keys()
+
+        affected = [self._rule_edges.pop(key) for key in removed]
+        for key in added:
+            self._rule_edges[key] = self.edges_for_rule(new_rules[key])
+            affected.append(self._rule_edges[key])
+        self._rules = new_rules
+
+        return self._reprice(affected)
+
+    def _reprice(self, edge_groups):
+        """Recomputes multipliers and costs for the union of the given edge id arrays."""
+        edge_groups = [edges for edges in edge_groups if len(edges)]
+        if not edge_groups:
+            return 0
+
+        mask = np.zeros(self.graph.edge_count, dtype=bool)
+        mask[np.concatenate(edge_groups)] = True
+        self.multipliers[mask] = 1.0
+
+        for key, rule in self._rules.items():
+            if not self.is_active(rule):
+                continue
+            edges = self._rule_edges[key]
+            edges = edges[mask[edges]]
+            if len(edges):
+                np.minimum.at(self.multipliers, edges, 1.0 - rule["discount"])
+
+        self.costs[mask] = self.base_cost[mask] * self.multipliers[mask]
+        return int(mask.sum())
+
+    def edge_cost(self, origin_iata, destination_iata):
+        """Returns the discounted price of a route, or None if the route does not exist."""
+        edge = self.graph.edge_id(origin_iata, destination_iata)
+        if edge is None:
+            return None
+        return float(self.costs[edge])
+
+    def as_adjacency(self):
+        """Returns the priced graph as {origin: {destination: {"cost": price}}} for every airport."""
+        codes = self.graph.codes
+        adjacency = {code: {} for code in codes}
+        for source, target, cost in zip(self.graph.sources.tolist(), self.graph.targets.tolist(), self.costs.tolist()):
+            adjacency[codes[source]].setdefault(codes[target], {"cost": cost})
+        return adjacency
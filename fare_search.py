@@ -0,0 +1,148 @@
+import heapq
+from collections import deque
+import numpy as np
+
+
+class FareSearch:
+    """
+    Cheapest-fare search over a priced RouteGraph.
+
+    The edge costs (e.g. `FareEngine.costs`) are checked once for negative values. With
+    no negative edge, queries use Dijkstra with early exit at the destination. Otherwise
+    they fall back to SPFA (queue-based Bellman-Ford) with the small-label-first heuristic
+    and Tarjan's subtree disassembly, which detects a negative cycle as soon as one is
+    closed instead of after |V| - 1 passes.
+    """
+
+    def __init__(self, route_graph, costs):
+        self.graph = route_graph
+        self.has_negative_edges = bool(np.any(np.asarray(costs) < 0))
+
+        # Plain lists are much faster than NumPy scalars inside the search loops
+        self._offsets = route_graph.offsets.tolist()
+        self._targets = route_graph.targets.tolist()
+        self._costs = np.asarray(costs, dtype=np.float64).tolist()
+
+    def cheapest(self, start, end):
+        """
+        Finds the lowest-price path between two airports.
+
+        Args:
+            start (str): IATA code of the departure airport.
+            end (str): IATA code of the destination airport.
+
+        Returns:
+            tuple: (total_cost, path) where path is a list of IATA codes, or (None, None)
+                   if no path exists or a negative-weight cycle is reachable from start.
+        """
+        source = self.graph.index.get(start)
+        target = self.graph.index.get(end)
+        if source is None or target is None:
+            return None, None
+
+        if self.has_negative_edges:
+            result = self._spfa(source)
+            if result is None:
+                print("Negative-weight cycle detected!")
+                return None, None
+            distances, predecessors = result
+        else:
+            distances, predecessors = self._dijkstra(source, target)
+
+        if distances[target] == float('inf'):
+            return None, None
+
+        path = []
+        current = target
+        while current != -1:
+            path.append(self.graph.codes[current])
+            current = predecessors[current]
+        path.reverse()
+        return distances[target], path
+
+    def _dijkstra(self, source, target):
+        """Dijkstra from source, stopping as soon as target is settled."""
+        offsets, targets, costs = self._offsets, self._targets, self._costs
+        distances = [float('inf')] * self.graph.airport_count
+        predecessors = [-1] * self.graph.airport_count
+        distances[source] = 0
+        heap = [(0, source)]
+
+        while heap:
+            cost, node = heapq.heappop(heap)
+            if cost > distances[node]:
+                continue  # Stale heap entry
+            if node == target:
+                break
+
+            for edge in range(offsets[node], offsets[node + 1]):
+                neighbor = targets[edge]
+                new_cost = cost + costs[edge]
+                if new_cost < distances[neighbor]:
+                    distances[neighbor] = new_cost
+                    predecessors[neighbor] = node
+                    heapq.heappush(heap, (new_cost, neighbor))
+
+        return distances, predecessors
+
+    def _spfa(self, source):
+        """
+        SPFA with small-label-first and subtree disassembly.
+
+        Returns:
+            tuple: (distances, predecessors), or None if a negative cycle is reachable from source.
+        """
+        offsets, targets, costs = self._offsets, self._targets, self._costs
+        n = self.graph.airport_count
+        distances = [float('inf')] * n
+        predecessors = [-1] * n
+        children = [[] for _ in range(n)]  # Shortest-path tree, used for subtree disassembly
+        queued = [False] * n
+
+        distances[source] = 0
+        queued[source] = True
+        queue = deque([source])
+
+        while queue:
+            node = queue.popleft()
+            if not queued[node]:
+                continue  # Removed from the tree by a disassembly
+            queued[node] = False
+
+            for edge in range(offsets[node], offsets[node + 1]):
+                neighbor = targets[edge]
+                new_cost = distances[node] + costs[edge]
+                if new_cost >= distances[neighbor]:
+                    continue
+
+                # Subtree disassembly: every descendant of neighbor now has an outdated label.
+                # Reaching `node` among them means the improvement closes a negative cycle.
+                stack = [neighbor]
+                while stack:
+                    current = stack.pop()
+                    for child in children[current]:
+                        if child == node:
+                            return None
+                        predecessors[child] = -1
+                        queued[child] = False
+                        stack.append(child)
+                    children[current] = []
+                if neighbor == node:
+                    return None  # Negative self-loop
+
+                parent = predecessors[neighbor]
+                if parent != -1:
+                    children[parent].remove(neighbor)
+                distances[neighbor] = new_cost
+                predecessors[neighbor] = node
+                children[node].append(neighbor)
+
+                if not queued[neighbor]:
+                    queued[neighbor] = True
+                    # Small label first: labels smaller than the queue head are scanned next
+                    if queue and new_cost < distances[queue[0]]:
+                        queue.appendleft(neighbor)
+                    else:
+                        queue.append(neighbor)
+
+        return distances, predecessors
@@ -0,0 +1,4 @@
+# Cruise speed and ground time used to derive flight minutes from distance
+# (shared by the OpenFlights ingest and the synthetic benchmark networks)
+CRUISE_KMH = 800
+TAXI_MINUTES = 30
@@ -0,0 +1,272 @@
+import argparse
+import heapq
+import os
+import threading
+import time
+import numpy as np
+from data_loader import airport_db  # Import the global AirportDatabase object
+from route_graph import RouteGraph, get_route_graph
+from pricing import EdgePrices
+from all_pairs import bookable_csr, graph_signature
+
+# Edge weights a labeling can be built for: route distance in km, or base fare in cents
+WEIGHTS = ("km", "price")
+
+
+def label_file(routes_file, weight="km"):
+    """Returns the labels file stored next to the routes file, e.g. 'airline_routes.km.labels.npz'."""
+    root, _ = os.path.splitext(routes_file)
+    return f"{root}.{weight}.labels.npz"
+
+
+def weighted_csr(route_graph, weight="km"):
+    """
+    Returns the bookable route graph as CSR arrays with integer weights.
+
+    Args:
+        route_graph (RouteGraph): Source graph.
+        weight (str): 'km' for route distance or 'price' for the base fare in cents.
+
+    Returns:
+        tuple: (offsets, targets, weights) NumPy arrays.
+    """
+    if weight == "km":
+        offsets, targets, km = bookable_csr(route_graph)
+        return offsets, targets, np.rint(km).astype(np.int64)
+    if weight == "price":
+        # Routes without a price (airports missing coordinates) are left out rather than made free
+        base_price = EdgePrices(route_graph).base_price
+        priced = np.isfinite(base_price)
+        offsets, targets, _ = bookable_csr(route_graph, priced)
+        cents = np.rint(base_price[(route_graph.carrier_count > 0) & priced] * 100)
+        return offsets, targets, cents.astype(np.int64)
+    raise ValueError(f"Unknown weight '{weight}', expected one of {WEIGHTS}")
+
+
+def pruned_landmark_labeling(offsets, targets, weights):
+    """
+    Computes directed 2-hop distance labels with pruned landmark labeling.
+
+    Airports are processed as hubs in order of decreasing degree. From each hub a forward
+    and a backward Dijkstra run over the graph, but a search stops expanding an airport
+    as soon as the labels collected so far already give a distance that is at least as
+    short. Because hubs are added in rank order, every label is already sorted by hub rank.
+
+    Args:
+        offsets, targets, weights (numpy.ndarray): CSR graph with non-negative integer weights.
+
+    Returns:
+        tuple: (order, out_labels, in_labels) where order[rank] is the airport index of each hub
+        and each label is a list of (hub rank, distance) pairs per airport: out_labels[u] holds
+        distances from u to hubs, in_labels[u] distances from hubs to u.
+    """
+    n = len(offsets) - 1
+    offsets, targets, weights = offsets.tolist(), targets.tolist(), weights.tolist()
+
+    # Reverse CSR for the backward searches
+    sources = [u for u in range(n) for _ in range(offsets[u], offsets[u + 1])]
+    reverse = [[] for _ in range(n)]
+    for edge, u in enumerate(sources):
+        reverse[targets[edge]].append((u, weights[edge]))
+    forward = [list(zip(targets[offsets[u]:offsets[u + 1]], weights[offsets[u]:offsets[u + 1]])) for u in range(n)]
+
+    degree = [len(forward[u]) + len(reverse[u]) for u in range(n)]
+    order = sorted(range(n), key=lambda u: -degree[u])
+
+    out_labels = [[] for _ in range(n)]
+    in_labels = [[] for _ in range(n)]
+    hub_distance = [None] * n  # Scratch: distance to/from the current hub per hub rank
+
+    def pruned_search(root, rank, adjacency, root_labels, target_labels):
+        # Distances between the root and earlier hubs, indexed by hub rank
+        for hub, distance in root_labels[root]:
+            hub_distance[hub] = distance
+        best = {root: 0}
+        heap = [(0, root)]
+        visited = set()
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if node in visited:
+                continue
+            visited.add(node)
+
+            # Prune if an earlier hub already covers this pair at least as well
+            covered = False
+            for hub, hub_to_node in target_labels[node]:
+                root_to_hub = hub_distance[hub]
+                if root_to_hub is not None and root_to_hub + hub_to_node <= distance:
+                    covered = True
+                    break
+            if covered:
+                continue
+
+            target_labels[node].append((rank, distance))
+            for neighbor, weight in adjacency[node]:
+                new_distance = distance + weight
+                if neighbor not in visited and new_distance < best.get(neighbor, float('inf')):
+                    best[neighbor] = new_distance
+                    heapq.heappush(heap, (new_distance, neighbor))
+
+        for hub, _ in root_labels[root]:
+            hub_distance[hub] = None
+
+    for rank, root in enumerate(order):
+        # Forward search fills in-labels (root -> node), backward search fills out-labels (node -> root)
+        pruned_search(root, rank, forward, out_labels, in_labels)
+        pruned_search(root, rank, reverse, in_labels, out_labels)
+
+    return order, out_labels, in_labels
+
+
+def _pack(labels):
+    """Flattens per-airport label lists into (offsets, hubs, distances) arrays."""
+    offsets = np.zeros(len(labels) + 1, dtype=np.int64)
+    np.cumsum([len(label) for label in labels], out=offsets[1:])
+    hubs = np.fromiter((hub for label in labels for hub, _ in label), dtype=np.int32, count=offsets[-1])
+    distances = np.fromiter((distance for label in labels for _, distance in label), dtype=np.int64, count=offsets[-1])
+    return offsets, hubs, distances
+
+
+class HubLabels:
+    """
+    2-hop distance labels of the route network: the shortest distance from s to t is
+    min(out[s][h] + in[t][h]) over the hubs h that both labels share.
+
+    Labels are stored as flat sorted arrays (`*_offsets`, `*_hubs`, `*_distances`) and the
+    query is a merge-join of two short sorted lists, so no graph search happens at query time.
+    """
+
+    def __init__(self, codes, weight, signature, out_offsets, out_hubs, out_distances,
+                 in_offsets, in_hubs, in_distances):
+        self.codes = list(codes)
+        self.index = {code: i for i, code in enumerate(self.codes)}
+        self.weight = weight
+        self.signature = signature
+        self.arrays = {
+            "out_offsets": out_offsets, "out_hubs": out_hubs, "out_distances": out_distances,
+            "in_offsets": in_offsets, "in_hubs": in_hubs, "in_distances": in_distances,
+        }
+
+        # Python lists make the merge-join a few microseconds
+        self._out = self._unpack(out_offsets, out_hubs, out_distances)
+        self._in = self._unpack(in_offsets, in_hubs, in_distances)
+
+    @staticmethod
+    def _unpack(offsets, hubs, distances):
+        offsets, hubs, distances = offsets.tolist(), hubs.tolist(), distances.tolist()
+        return [(hubs[offsets[i]:offsets[i + 1]], distances[offsets[i]:offsets[i + 1]])
+                for i in range(len(offsets) - 1)]
+
+    @classmethod
+    def build(cls, route_graph, weight="km"):
+        """Runs the preprocessing over the bookable routes of a RouteGraph."""
+        offsets, targets, weights = weighted_csr(route_graph, weight)
+        _, out_labels, in_labels = pruned_landmark_labeling(offsets, targets, weights)
+        signature = graph_signature(route_graph.codes, offsets, targets, weights)
+        return cls(route_graph.codes, weight, signature, *_pack(out_labels), *_pack(in_labels))
+
+    def save(self, file_path):
+        np.savez(file_path, codes=np.array(self.codes), weight=np.array(self.weight),
+                 signature=np.array(self.signature), **self.arrays)
+
+    @classmethod
+    def load(cls, file_path):
+        """Loads labels saved with `save`. Returns None if the file is missing or unreadable."""
+        try:
+            with np.load(file_path) as data:
+                return cls(data["codes"].tolist(), str(data["weight"]), str(data["signature"]),
+                           data["out_offsets"], data["out_hubs"], data["out_distances"],
+                           data["in_offsets"], data["in_hubs"], data["in_distances"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @property
+    def label_count(self):
+        return int(self.arrays["out_offsets"][-1] + self.arrays["in_offsets"][-1])
+
+    def distance(self, origin_iata, destination_iata):
+        """
+        Returns the shortest distance between two airports in the labeling's unit.
+
+        Args:
+            origin_iata (str): IATA code of the departure airport.
+            destination_iata (str): IATA code of the arrival airport.
+
+        Returns:
+            int: Kilometres ('km' labels) or cents ('price' labels), or None if there is no route.
+        """
+        s, t = self.index.get(origin_iata), self.index.get(destination_iata)
+        if s is None or t is None:
+            return None
+        out_hubs, out_distances = self._out[s]
+        in_hubs, in_distances = self._in[t]
+
+        best = None
+        i = j = 0
+        while i < len(out_hubs) and j < len(in_hubs):
+            if out_hubs[i] == in_hubs[j]:
+                total = out_distances[i] + in_distances[j]
+                if best is None or total < best:
+                    best = total
+                i += 1
+                j += 1
+            elif out_hubs[i] < in_hubs[j]:
+                i += 1
+            else:
+                j += 1
+        return best
+
+    def price(self, origin_iata, destination_iata):
+        """Returns the cheapest base fare between two airports (requires 'price' labels), or None."""
+        if self.weight != "price":
+            raise ValueError("price() needs labels built with weight='price'")
+        cents = self.distance(origin_iata, destination_iata)
+        return None if cents is None else cents / 100
+
+
+_hub_labels = {}
+_hub_labels_lock = threading.Lock()
+
+
+def get_hub_labels(weight="km"):
+    """
+    Returns the shared HubLabels for a weight, loaded from next to the routes file.
+
+    Returns None if the labels were not built (see `python hub_labels.py`) or were built from different data.
+    """
+    if weight not in _hub_labels:
+        with _hub_labels_lock:
+            if weight not in _hub_labels:
+                labels = HubLabels.load(label_file(airport_db.file_path, weight))
+                if labels is not None:
+                    signature = graph_signature(get_route_graph().codes, *weighted_csr(get_route_graph(), weight))
+                    if labels.signature != signature:
+                        print(f"Ignoring {label_file(airport_db.file_path, weight)}: built from different route data")
+                        labels = None
+                _hub_labels[weight] = labels
+    return _hub_labels[weight]
+
+
+@airport_db.on_reload
+def _invalidate_hub_labels(diff):
+    """Re-checks the labels against the reloaded routes on next use."""
+    if diff.topology_changed or diff.changed_routes:
+        with _hub_labels_lock:
+            _hub_labels.clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build hub labels for constant-time distance and fare lookups.")
+    parser.add_argument("--weight", choices=WEIGHTS, default="km", help="edge weight to label (default: km)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    labels = HubLabels.build(RouteGraph(airport_db.snapshot), args.weight)
+    output = label_file(airport_db.file_path, args.weight)
+    labels.save(output)
+    print(f"Wrote {labels.label_count} labels for {len(labels.codes)} airports to {output} "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
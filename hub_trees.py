@@ -0,0 +1,182 @@
+import heapq
+import threading
+from collections import Counter, OrderedDict
+import numpy as np
+from data_loader import airport_db  # Import the global AirportDatabase object
+from route_graph import get_route_graph
+
+# Number of most-queried origins that are eligible for a cached tree
+HUB_COUNT = 16
+
+# Queries an origin needs before its tree is worth building
+MIN_QUERIES = 3
+
+# Upper bound for the arrays of all cached trees together
+MEMORY_BUDGET = 16 * 1024 * 1024
+
+
+class HubTree:
+    """
+    One-to-all shortest-distance tree (by route km) from one origin over the RouteGraph.
+
+    Only routes with at least one carrier are used. For every airport index i,
+    `dist[i]` is the distance from the origin (inf if unreachable), `hops[i]` the number
+    of flights on that path (-1 if unreachable) and `pred[i]` the previous airport
+    index (-1 for the origin and unreachable airports).
+    """
+
+    def __init__(self, route_graph, origin):
+        self.graph = route_graph
+        self.origin = origin
+
+        n = route_graph.airport_count
+        dist = [float('inf')] * n
+        hops = [-1] * n
+        pred = [-1] * n
+
+        offsets = route_graph.offsets.tolist()
+        targets = route_graph.targets.tolist()
+        km = route_graph.km.tolist()
+        bookable = (route_graph.carrier_count > 0).tolist()
+
+        source = route_graph.index[origin]
+        dist[source], hops[source] = 0.0, 0
+        heap = [(0.0, source)]
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if distance > dist[node]:
+                continue  # Stale heap entry
+            for edge in range(offsets[node], offsets[node + 1]):
+                if not bookable[edge]:
+                    continue
+                neighbor = targets[edge]
+                new_distance = distance + km[edge]
+                if new_distance < dist[neighbor]:
+                    dist[neighbor] = new_distance
+                    hops[neighbor] = hops[node] + 1
+                    pred[neighbor] = node
+                    heapq.heappush(heap, (new_distance, neighbor))
+
+        self.dist = np.array(dist, dtype=np.float32)
+        self.hops = np.array(hops, dtype=np.int32)
+        self.pred = np.array(pred, dtype=np.int32)
+
+    @property
+    def nbytes(self):
+        return self.dist.nbytes + self.hops.nbytes + self.pred.nbytes
+
+    def path_to(self, destination):
+        """Returns the shortest path from the origin as a list of IATA codes, or None if unreachable."""
+        node = self.graph.index.get(destination)
+        if node is None or self.hops[node] < 0:
+            return None
+        path = [None] * (self.hops[node] + 1)
+        for position in range(len(path) - 1, -1, -1):
+            path[position] = self.graph.codes[node]
+            node = self.pred[node]
+        return path
+
+
+class HubTreeCache:
+    """
+    Shortest-path trees for the origins users search from most, kept under a memory budget.
+
+    Every query from an airport of the route graph is counted per origin (so the log is
+    bounded by the number of airports). Once an origin is among the `hub_count` most-queried
+    origins (with at least `min_queries` queries) its tree is built and cached; cached trees
+    are evicted least recently used first when their arrays exceed `memory_budget` bytes.
+    The hot set is updated as counts grow instead of re-ranking the log on every query.
+    """
+
+    def __init__(self, hub_count=HUB_COUNT, min_queries=MIN_QUERIES, memory_budget=MEMORY_BUDGET):
+        self.hub_count = hub_count
+        self.min_queries = min_queries
+        self.memory_budget = memory_budget
+        self.query_log = Counter()
+        self._hot = set()
+        self._trees = OrderedDict()
+        self._generation = 0  # Bumped by invalidate(), so trees built from an older graph are not cached
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        return sum(tree.nbytes for tree in self._trees.values())
+
+    def hot_origins(self):
+        """Returns the origins that currently qualify for a cached tree, most-queried first."""
+        return sorted(self._hot, key=lambda origin: -self.query_log[origin])
+
+    def is_hot(self, origin):
+        return origin in self._hot
+
+    def _record(self, origin):
+        """Counts one query and promotes the origin into the hot set if it overtakes the coldest hub."""
+        self.query_log[origin] += 1
+        count = self.query_log[origin]
+        if origin in self._hot or count < self.min_queries:
+            return
+        if len(self._hot) < self.hub_count:
+            self._hot.add(origin)
+            return
+        coldest = min(self._hot, key=self.query_log.__getitem__)
+        if count > self.query_log[coldest]:
+            self._hot.remove(coldest)
+            self._hot.add(origin)
+
+    def tree(self, origin, record=True):
+        """
+        Returns the cached tree of an origin, building it if the origin is hot enough.
+
+        Args:
+            origin (str): IATA code of the departure airport.
+            record (bool): Count this call as a query from the origin.
+
+        Returns:
+            HubTree: The tree, or None if the origin is not (yet) a hub or not in the dataset.
+        """
+        generation = self._generation
+        route_graph = get_route_graph()
+        if origin not in route_graph.index:
+            return None  # Unknown origins are not counted, so the query log stays bounded
+
+        with self._lock:
+            if record:
+                self._record(origin)
+            tree = self._trees.get(origin)
+            if tree is not None:
+                self._trees.move_to_end(origin)
+                return tree
+            if not self.is_hot(origin):
+                return None
+
+        tree = HubTree(route_graph, origin)
+
+        current_graph = get_route_graph()
+        with self._lock:
+            if generation != self._generation or route_graph is not current_graph:
+                return tree  # Invalidated during the build: answer this query but do not cache it
+            self._trees[origin] = tree
+            self._trees.move_to_end(origin)
+            while len(self._trees) > 1 and self.nbytes > self.memory_budget:
+                self._trees.popitem(last=False)
+        return tree
+
+    def shortest_path(self, origin, destination):
+        """Returns the shortest path from a hub origin, or None if the origin has no tree or no path exists."""
+        tree = self.tree(origin)
+        return tree.path_to(destination) if tree is not None else None
+
+    def invalidate(self):
+        """Drops every cached tree (the query log is kept, so hubs are rebuilt on their next query)."""
+        with self._lock:
+            self._generation += 1
+            self._trees.clear()
+
+
+hub_trees = HubTreeCache()
+
+
+@airport_db.on_reload
+def _invalidate_hub_trees(diff):
+    """Drops every cached tree after a reload; the route graph they index into is rebuilt."""
+    hub_trees.invalidate()
@@ -0,0 +1,146 @@
+import json
+import os
+import time
+from collections import deque
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# Parsers in order of preference; SKYWINGS_JSON_PARSER=json|orjson|msgspec forces one
+AVAILABLE_PARSERS = [name for name, module in (("orjson", orjson), ("msgspec", msgspec)) if module] + ["json"]
+PARSER = os.environ.get("SKYWINGS_JSON_PARSER") or AVAILABLE_PARSERS[0]
+if PARSER not in AVAILABLE_PARSERS:
+    print(f"Warning: JSON parser {PARSER} is not installed, using {AVAILABLE_PARSERS[0]}")
+    PARSER = AVAILABLE_PARSERS[0]
+
+# Set SKYWINGS_REPORT_LOAD_TIME=1 to print the timing of every file load
+REPORT_TIMING = os.environ.get("SKYWINGS_REPORT_LOAD_TIME") == "1"
+
+# (file, parser, bytes, read seconds, parse seconds) of the most recent loads
+load_timings = deque(maxlen=32)
+
+DECODE_ERRORS = (ValueError,) + ((msgspec.DecodeError,) if msgspec else ())
+
+
+if msgspec:
+    class _Record(msgspec.Struct):
+        """Typed record that answers `get` like the dicts the model classes are built from."""
+
+        def get(self, name, default=None):
+            value = getattr(self, name, default)
+            return default if value is None else value
+
+    class CarrierRecord(_Record):
+        iata: Any = None
+        name: Any = None
+        departure_date: Any = None
+        departure_time: Any = None
+        arrival_date: Any = None
+        arrival_time: Any = None
+        departure_timezone: Any = None
+        arrival_timezone: Any = None
+        seats_remaining: Any = None
+
+    class RouteRecord(_Record):
+        iata: Any = None
+        km: Any = None
+        min: Any = None
+        carriers: list[CarrierRecord] = []
+
+    class AirportRecord(_Record):
+        city_name: Any = None
+        continent: Any = None
+        country: Any = None
+        country_code: Any = None
+        display_name: Any = None
+        elevation: Any = None
+        iata: Any = None
+        icao: Any = None
+        latitude: Any = None
+        longitude: Any = None
+        name: Any = None
+        routes: list[RouteRecord] = []
+        timezone: Any = None
+
+    _generic_decoder = msgspec.json.Decoder()
+    _airport_decoder = msgspec.json.Decoder(dict[str, AirportRecord])
+
+
+def loads(data):
+    """Parses JSON text or bytes with the selected parser."""
+    if PARSER == "orjson":
+        return orjson.loads(data)
+    if PARSER == "msgspec":
+        return _generic_decoder.decode(data)
+    return json.loads(data)
+
+
+def _load(file_path, decode):
+    """Reads a whole file as bytes, decodes it and records the timing. Returns None on errors (which are printed)."""
+    try:
+        start = time.perf_counter()
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        read_done = time.perf_counter()
+        parser, value = decode(data)
+        parse_done = time.perf_counter()
+    except FileNotFoundError:
+        print(f"Error: File not found at {file_path}")
+        return None
+    except DECODE_ERRORS:
+        print(f"Error: Invalid JSON format in {file_path}")
+        return None
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        return None
+
+    timing = (file_path, parser, len(data), read_done - start, parse_done - read_done)
+    load_timings.append(timing)
+    if REPORT_TIMING:
+        print(f"Loaded {file_path} ({len(data) / 1e6:.1f} MB) with {parser}: "
+              f"read {timing[3] * 1000:.0f} ms, parse {timing[4] * 1000:.0f} ms")
+    return value
+
+
+def read_json_file(file_path):
+    """
+    Reads a JSON file and returns the data as a Python dictionary or list.
+
+    Args:
+        file_path (str): The path to the JSON file.
+
+    Returns:
+        dict or list: The JSON data as a Python dictionary or list,
+                      or None if an error occurred.
+    """
+    return _load(file_path, lambda data: (PARSER, loads(data)))
+
+
+def read_airport_records(file_path):
+    """
+    Reads a routes file for building an AirportDatabase.
+
+    With msgspec installed the file is decoded straight into typed airport, route and
+    carrier records (no intermediate dicts); otherwise this is `read_json_file`.
+
+    Returns:
+        dict: IATA code -> airport record or dict, or None if an error occurred.
+    """
+    if not msgspec or PARSER == "json":
+        return read_json_file(file_path)
+
+    def decode(data):
+        try:
+            return "msgspec typed", _airport_decoder.decode(data)
+        except msgspec.ValidationError:
+            return PARSER, loads(data)  # Unexpected shape somewhere: fall back to plain values
+
+    return _load(file_path, decode)
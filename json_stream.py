@@ -0,0 +1,241 @@
+import json
+import os
+from stat import S_IMODE
+import tempfile
+from json_loader import loads
+
+# Characters read from disk per refill of the parse buffer
+CHUNK_SIZE = 1 << 20
+
+_WHITESPACE = " \t\n\r"
+
+# Mode of files created by `write_json_object` (an existing target keeps its own mode)
+NEW_FILE_MODE = 0o644
+
+
+def iter_json_object(file_path, chunk_size=CHUNK_SIZE, offsets=False):
+    """
+    Incrementally parses a file holding one top-level JSON object.
+
+    Only the current member and one read chunk are kept in memory, so a large
+    `airline_routes.json` can be walked airport by airport.
+
+    Args:
+        file_path (str): Path to a JSON file whose root is an object.
+        chunk_size (int): Number of characters to read at a time.
+        offsets (bool): Also yield the byte range of each value in the file.
+
+    Yields:
+        tuple: (key, value) for each member of the top-level object, in file order,
+               or (key, value, start, length) with byte offsets if `offsets` is set.
+
+    Raises:
+        json.JSONDecodeError: If the file is not a well-formed JSON object.
+    """
+    decoder = json.JSONDecoder()
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        buffer = ""
+        pos = 0
+        eof = False
+        # Byte offset of buffer[mark], advanced lazily so each character is only encoded once
+        mark = 0
+        mark_bytes = 0
+
+        def byte_offset(char_pos):
+            """Returns the byte offset in the file of buffer[char_pos] (char_pos >= mark)."""
+            nonlocal mark, mark_bytes
+            mark_bytes += len(buffer[mark:char_pos].encode('utf-8'))
+            mark = char_pos
+            return mark_bytes
+
+        def fill():
+            """Appends the next chunk to the buffer, dropping what was already consumed."""
+            nonlocal buffer, pos, eof, mark
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+            if offsets:
+                byte_offset(pos)
+                mark = 0
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+        def next_char():
+            """Skips whitespace and returns the next significant character ('' at end of file)."""
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                    pos += 1
+                if pos < len(buffer) or eof:
+                    return buffer[pos] if pos < len(buffer) else ""
+                fill()
+
+        def decode():
+            """Decodes one JSON value at the current position, reading more data until it is complete."""
+            nonlocal pos
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    fill()
+                    continue
+                # A number at the very end of the buffer may continue in the next chunk
+                if end == len(buffer) and not eof:
+                    fill()
+                    continue
+                pos = end
+                return value
+
+        if next_char() != "{":
+            raise json.JSONDecodeError("Expecting '{'", buffer, pos)
+        pos += 1
+
+        if next_char() == "}":
+            return
+
+        while True:
+            next_char()
+            key = decode()
+            if not isinstance(key, str) or next_char() != ":":
+                raise json.JSONDecodeError("Expecting property name and ':'", buffer, pos)
+            pos += 1
+            next_char()
+            if offsets:
+                # decode() never drops characters at or after pos, so `start` stays valid
+                start = byte_offset(pos)
+                value = decode()
+                yield key, value, start, byte_offset(pos) - start
+            else:
+                yield key, decode()
+
+            separator = next_char()
+            pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise json.JSONDecodeError("Expecting ',' or '}'", buffer, pos - 1)
+
+
+def index_file(file_path):
+    """Returns the path of the sidecar file caching the member index of `file_path`."""
+    return f"{file_path}.index.json"
+
+
+def index_json_object(file_path, cache=True, fields=()):
+    """
+    Returns the byte range of every member value of a top-level JSON object file.
+
+    Scanning parses the whole file once, so the result is cached in a sidecar file
+    (see `index_file`) keyed by the file's size and modification time and reused
+    until the file changes. `fields` picks top-level fields of each member (e.g. an
+    airport's name) that are kept in the index too, so they can be listed without
+    decoding the members again.
+
+    Args:
+        file_path (str): Path to a JSON file whose root is an object.
+        cache (bool): Read and write the sidecar index file.
+        fields (tuple): Names of member fields to keep alongside the byte ranges.
+
+    Returns:
+        dict: key -> (start, length) in bytes, in file order. With `fields`, a tuple
+              (index, values) where values maps key -> tuple of the field values (None if absent).
+    """
+    fields = list(fields)
+    stat = os.stat(file_path)
+    sidecar = index_file(file_path)
+    if cache:
+        try:
+            with open(sidecar, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if (cached.get("size") == stat.st_size and cached.get("mtime_ns") == stat.st_mtime_ns
+                    and set(fields) <= set(cached.get("fields", []))):
+                index = {key: (start, length) for key, start, length in cached["members"]}
+                if not fields:
+                    return index
+                positions = [cached["fields"].index(field) for field in fields]
+                values = {key: tuple(row[i] for i in positions) for key, row in zip(index, cached["values"])}
+                return index, values
+        except (OSError, ValueError, KeyError, TypeError):
+            pass  # Missing or unreadable: scan again
+
+    index, values = {}, {}
+    for key, value, start, length in iter_json_object(file_path, offsets=True):
+        index[key] = (start, length)
+        if fields:
+            values[key] = tuple(value.get(field) if isinstance(value, dict) else None for field in fields)
+
+    if cache:
+        cached = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                  "members": [[key, start, length] for key, (start, length) in index.items()]}
+        if fields:
+            cached["fields"] = fields
+            cached["values"] = [list(row) for row in values.values()]
+        try:
+            temp_path = f"{sidecar}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(cached, f)
+            os.replace(temp_path, sidecar)
+        except OSError as e:
+            print(f"Could not write the index cache {sidecar}: {e}")
+    return (index, values) if fields else index
+
+
+def read_json_member(f, start, length):
+    """
+    Decodes one member value located by `index_json_object`.
+
+    Args:
+        f (file): The JSON file opened in binary mode.
+        start (int): Byte offset of the value.
+        length (int): Size of the value in bytes.
+    """
+    f.seek(start)
+    return loads(f.read(length))
+
+
+def write_json_object(items, file_path, indent=4):
+    """
+    Streams (key, value) pairs to a JSON object file and atomically replaces the target.
+
+    The output is written to a temporary file in the same directory and renamed over
+    `file_path` only once it is complete, so an interrupted run never leaves a
+    truncated file behind. The replaced file keeps the permissions of the old one (a new
+    file gets NEW_FILE_MODE) rather than the private mode of temp files.
+    The layout matches `json.dump(data, f, indent=indent)`.
+
+    Args:
+        items (iterable): (key, value) pairs, consumed lazily.
+        file_path (str): Destination path.
+        indent (int): Indentation used for the output.
+
+    Returns:
+        int: Number of members written.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    count = 0
+    pad = " " * indent
+
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as out:
+            for key, value in items:
+                out.write("{\n" if count == 0 else ",\n")
+                encoded = json.dumps(value, indent=indent).replace("\n", "\n" + pad)
+                out.write(f"{pad}{json.dumps(key)}: {encoded}")
+                count += 1
+            out.write("\n}" if count else "{}")
+            out.flush()
+            os.fsync(out.fileno())
+        try:
+            os.chmod(temp_path, S_IMODE(os.stat(file_path).st_mode))
+        except FileNotFoundError:
+            os.chmod(temp_path, NEW_FILE_MODE)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    return count
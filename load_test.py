@@ -0,0 +1,220 @@
+import argparse
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+import numpy as np
+from data_loader import airport_db  # Import the global AirportDatabase object
+
+PERCENTILES = (50, 95, 99)
+
+# Share of requests per callback, roughly what a route-view session sends
+DEFAULT_MIX = {
+    "update_route_map": 0.5,
+    "update_airline_options": 0.3,
+    "update_airport_table": 0.2,
+}
+
+# Share of route searches per filter option
+FILTER_MIX = {
+    "shortest_path": 0.6,
+    "least_layovers": 0.25,
+    "search_airline": 0.15,
+}
+
+# Most searches start or end at a busy airport
+BUSY_AIRPORT_SHARE = 0.7
+BUSY_AIRPORT_COUNT = 50
+
+
+def callback_outputs(output_key):
+    """Splits a Dash callback-map key ('..a.b...c.d..' or 'a.b') into [{'id', 'property'}, ...]."""
+    if output_key.startswith(".."):
+        parts = output_key.strip(".").split("...")
+    else:
+        parts = [output_key]
+    return [dict(zip(("id", "property"), part.rsplit(".", 1))) for part in parts]
+
+
+class CallbackClient:
+    """
+    Builds `/_dash-update-component` requests from the app's callback map and sends them
+    through Flask's test client, so callbacks run exactly as for a browser but in-process.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+        # Dash registers page callbacks with the app on the first request
+        self.app.server.test_client().get("/")
+        self.callbacks = {}
+        for output_key, spec in self.app.callback_map.items():
+            function = spec.get("callback")
+            name = getattr(function, "__name__", None)
+            if name:
+                self.callbacks[name] = (output_key, spec)
+
+    def _client(self):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.server.test_client()
+        return client
+
+    def payload(self, name, values):
+        """
+        Returns the request body that triggers callback `name`.
+
+        Args:
+            name (str): Callback function name, e.g. 'update_route_map'.
+            values (dict): {'component-id.property': value} for its inputs and states (missing ones are None).
+        """
+        output_key, spec = self.callbacks[name]
+        outputs = callback_outputs(output_key)
+        inputs = [{**item, "value": values.get(f"{item['id']}.{item['property']}")} for item in spec["inputs"]]
+        state = [{**item, "value": values.get(f"{item['id']}.{item['property']}")} for item in spec.get("state", [])]
+        return {
+            "output": output_key,
+            "outputs": outputs if len(outputs) > 1 else outputs[0],
+            "inputs": inputs,
+            "state": state,
+            "changedPropIds": [f"{item['id']}.{item['property']}" for item in spec["inputs"][:1]],
+        }
+
+    def call(self, name, values):
+        """Sends one callback request. Returns (HTTP status, seconds)."""
+        body = json.dumps(self.payload(name, values))
+        start = time.perf_counter()
+        response = self._client().post("/_dash-update-component", data=body, content_type="application/json")
+        elapsed = time.perf_counter() - start
+        return response.status_code, elapsed
+
+
+class RequestMix:
+    """Seeded generator of realistic callback inputs for the route and table views."""
+
+    def __init__(self, airport_db, seed=0, mix=DEFAULT_MIX):
+        self.rng = random.Random(seed)
+        self.mix = mix
+        airports = list(airport_db.airports.values())
+        self.codes = [airport.iata for airport in airports]
+        self.busy = [airport.iata for airport in sorted(airports, key=lambda a: -len(a.routes))[:BUSY_AIRPORT_COUNT]]
+        self.airlines = {airport.iata: sorted({carrier.iata for route in airport.routes for carrier in route.carriers})
+                         for airport in airports}
+
+    def _pick(self, weights):
+        return self.rng.choices(list(weights), weights=list(weights.values()))[0]
+
+    def _airport(self):
+        return self.rng.choice(self.busy if self.rng.random() < BUSY_AIRPORT_SHARE else self.codes)
+
+    def next_request(self):
+        """Returns (callback name, input values) for the next request."""
+        name = self._pick(self.mix)
+        origin, destination = self._airport(), self._airport()
+        filter_option = self._pick(FILTER_MIX)
+
+        if name == "update_airport_table":
+            return name, {"airport-dropdown.value": origin}
+
+        values = {
+            "departure-airport-dropdown.value": origin,
+            "arrival-airport-dropdown.value": destination,
+            "filter-dropdown.value": filter_option,
+        }
+        if name == "update_route_map":
+            departure = date.today() + timedelta(days=self.rng.randint(0, 30))
+            airlines = self.airlines.get(origin) or []
+            values.update({
+                "departure-date-picker.date": departure.isoformat(),
+                "return-date-picker.date": (departure + timedelta(days=self.rng.randint(1, 14))).isoformat(),
+                "map-projection-dropdown.value": "natural earth",
+                "airline-dropdown.value": self.rng.sample(airlines, min(len(airlines), 2)) or None,
+            })
+        return name, values
+
+
+def run_load_test(app, total_requests=500, concurrency=8, seed=0, mix=DEFAULT_MIX):
+    """
+    Drives the Dash callback endpoint with `concurrency` threads until `total_requests` are done.
+
+    Returns:
+        dict: Overall throughput and, per callback, request count, errors and latency percentiles (ms).
+    """
+    client = CallbackClient(app)
+    generator = RequestMix(airport_db.snapshot, seed, mix)
+    requests = [generator.next_request() for _ in range(total_requests)]
+
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    lock = threading.Lock()
+
+    def send(request):
+        name, values = request
+        status, elapsed = client.call(name, values)
+        with lock:
+            latencies[name].append(elapsed * 1000)
+            if status != 200:
+                errors[name] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(send, requests))
+    wall = time.perf_counter() - start
+
+    every = [latency for values in latencies.values() for latency in values]
+    report = {
+        "requests": total_requests,
+        "concurrency": concurrency,
+        "seconds": round(wall, 2),
+        "throughput_rps": round(total_requests / wall, 1),
+        "errors": sum(errors.values()),
+        **{f"p{p}_ms": round(float(np.percentile(every, p)), 1) for p in PERCENTILES},
+        "callbacks": {},
+    }
+    for name, values in sorted(latencies.items()):
+        report["callbacks"][name] = {
+            "requests": len(values),
+            "errors": errors[name],
+            **{f"p{p}_ms": round(float(np.percentile(values, p)), 1) for p in PERCENTILES},
+        }
+    return report
+
+
+def print_report(report):
+    print(f"{report['requests']} requests with {report['concurrency']} threads in {report['seconds']}s: "
+          f"{report['throughput_rps']} req/s, {report['errors']} errors")
+    print(f"{'callback':<26}{'requests':>9}{'errors':>8}" + "".join(f"{f'p{p} ms':>10}" for p in PERCENTILES))
+    rows = list(report["callbacks"].items()) + [("all", report)]
+    for name, metrics in rows:
+        print(f"{name:<26}{metrics['requests']:>9}{metrics['errors']:>8}"
+              + "".join(f"{metrics[f'p{p}_ms']:>10.1f}" for p in PERCENTILES))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process load test of the Dash route and table view callbacks.")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, action="append",
+                        help="worker threads (repeat to sweep several levels, default: 8)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the reports to this file")
+    args = parser.parse_args()
+
+    from app import app  # Imported here so the module can be used without starting Dash
+
+    reports = []
+    for concurrency in args.concurrency or [8]:
+        report = run_load_test(app, args.requests, concurrency, args.seed)
+        print_report(report)
+        reports.append(report)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import time
+from itertools import islice
+import numpy as np
+from json_stream import iter_json_object, write_json_object
+from data_adjustment import randomize_dates, randomize_seats
+from flight_times import CRUISE_KMH, TAXI_MINUTES
+from pricing import great_circle_km
+
+OPENFLIGHTS_DIR = "Open Flights Dataset (Not in Use)"
+SAMPLE_DIR = "Sample Data"
+
+# Rows parsed per chunk; distances of the new routes in a chunk are computed in one NumPy pass
+CHUNK_SIZE = 20000
+
+# OpenFlights column layouts (the .dat files have no header row)
+AIRPORT_COLUMNS = ["id", "name", "city", "country", "iata", "icao", "latitude", "longitude", "altitude",
+                   "utc_offset", "dst", "timezone", "type", "source"]
+AIRLINE_COLUMNS = ["id", "name", "alias", "iata", "icao", "callsign", "country", "active"]
+ROUTE_COLUMNS = ["airline", "airline_id", "source", "source_id", "destination", "destination_id",
+                 "codeshare", "stops", "equipment"]
+
+# Header names used by the CSVs in Sample Data, mapped to the OpenFlights column names
+SAMPLE_HEADERS = {
+    "Airport Name": "name", "City": "city", "Country": "country", "IATA": "iata", "ICAO": "icao",
+    "Latitude": "latitude", "Longitude": "longitude", "Altitude": "altitude", "Timezone": "timezone",
+    "Airline ID": "id", "Airline Name": "name", "Alias": "alias", "Callsign": "callsign", "IsActive": "active",
+    "Airline IATA": "airline", "Departure Airport IATA": "source", "Arrival Airport IATA": "destination",
+    "Flight Number": "flight_number",
+}
+
+
+def clean(value):
+    """OpenFlights writes missing values as \\N (and sometimes '-' or 'N/A'); returns None for those."""
+    value = (value or "").strip()
+    return None if value in ("\\N", "", "-", "N/A") else value
+
+
+def read_records(file_path, columns, chunk_size=CHUNK_SIZE):
+    """
+    Streams a .dat or sample .csv file as chunks of dicts keyed by OpenFlights column names.
+
+    Sample CSVs are recognised by their header row; the route sample's 'Airline ID' column
+    is the airline id, not the route's own id.
+
+    Yields:
+        list: Up to `chunk_size` records.
+    """
+    with open(file_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        first = next(reader, None)
+        if first is None:
+            return
+        if first[0] in SAMPLE_HEADERS:
+            names = [SAMPLE_HEADERS.get(name, name) for name in first]
+            if "source" in names:
+                names = ["airline_id" if name == "id" else name for name in names]
+            rows = reader
+        else:
+            names = columns
+            rows = _prepend(first, reader)
+
+        while True:
+            chunk = [dict(zip(names, row)) for row in islice(rows, chunk_size)]
+            if not chunk:
+                return
+            yield chunk
+
+
+def _prepend(first, rows):
+    yield first
+    yield from rows
+
+
+def route_lengths(coordinates, pairs):
+    """
+    Returns integer km and block minutes for (origin, destination) pairs in one vectorized pass.
+
+    Args:
+        coordinates (dict): IATA -> (latitude, longitude) as floats.
+        pairs (list): (origin_iata, destination_iata) tuples.
+
+    Returns:
+        tuple: (km, minutes) int arrays aligned with `pairs`.
+    """
+    origins = np.array([coordinates[origin] for origin, _ in pairs], dtype=np.float64).reshape(-1, 2)
+    destinations = np.array([coordinates[destination] for _, destination in pairs], dtype=np.float64).reshape(-1, 2)
+    km = great_circle_km(origins[:, 0], origins[:, 1], destinations[:, 0], destinations[:, 1]).astype(np.int64)
+    minutes = km * 60 // CRUISE_KMH + TAXI_MINUTES
+    return km, minutes
+
+
+def load_airports(paths):
+    """Reads airport files in order (later files override earlier ones). Returns {iata: airport dict}."""
+    airports = {}
+    for path in paths:
+        for chunk in read_records(path, AIRPORT_COLUMNS):
+            for record in chunk:
+                iata = clean(record.get("iata"))
+                if not iata or len(iata) != 3:
+                    continue
+                try:
+                    latitude, longitude = float(record["latitude"]), float(record["longitude"])
+                except (KeyError, TypeError, ValueError):
+                    continue  # Without coordinates no route length can be computed
+                altitude = clean(record.get("altitude"))
+                city = clean(record.get("city")) or ""
+                airports[iata] = {
+                    "city_name": city,
+                    "continent": "",
+                    "country": clean(record.get("country")) or "",
+                    "country_code": "",
+                    "display_name": f"{city or clean(record.get('name'))} ({iata})",
+                    "elevation": int(float(altitude)) if altitude else 0,
+                    "iata": iata,
+                    "icao": clean(record.get("icao")) or "",
+                    "latitude": str(latitude),
+                    "longitude": str(longitude),
+                    "name": clean(record.get("name")) or "",
+                    "routes": [],
+                    "timezone": clean(record.get("timezone")) or "",
+                }
+    return airports
+
+
+def load_airlines(paths, include_inactive=False):
+    """Reads airline files. Returns ({airline id: (iata, name)}, {iata: name}) for airlines with an IATA code."""
+    by_id, by_code = {}, {}
+    for path in paths:
+        for chunk in read_records(path, AIRLINE_COLUMNS):
+            for record in chunk:
+                iata = clean(record.get("iata"))
+                if not iata or len(iata) != 2:
+                    continue
+                if not include_inactive and (record.get("active") or "").strip().upper() != "Y":
+                    continue
+                name = clean(record.get("name")) or iata
+                by_id[(record.get("id") or "").strip()] = (iata, name)
+                by_code.setdefault(iata, name)
+    return by_id, by_code
+
+
+def load_routes(paths, airports, airlines):
+    """
+    Streams route files in chunks and joins them with airports and airlines.
+
+    Args:
+        paths (list): Route files.
+        airports (dict): Output of `load_airports` (only routes between these airports are kept).
+        airlines (tuple): Output of `load_airlines` (only routes by these airlines are kept).
+
+    Returns:
+        dict: {(origin, destination): {'km': int, 'min': int, 'carriers': {iata: name}}} in first-seen order.
+    """
+    by_id, by_code = airlines
+    coordinates = {iata: (float(a["latitude"]), float(a["longitude"])) for iata, a in airports.items()}
+    routes = {}
+
+    for path in paths:
+        for chunk in read_records(path, ROUTE_COLUMNS):
+            new_pairs = []
+            for record in chunk:
+                origin, destination = clean(record.get("source")), clean(record.get("destination"))
+                if origin not in airports or destination not in airports or origin == destination:
+                    continue
+                if (record.get("stops") or "0").strip() not in ("0", ""):
+                    continue  # Only direct flights are routes
+                airline = by_id.get((record.get("airline_id") or "").strip())
+                if airline is None:
+                    code = clean(record.get("airline"))
+                    airline = (code, by_code[code]) if code in by_code else None
+                if airline is None:
+                    continue
+
+                route = routes.get((origin, destination))
+                if route is None:
+                    route = routes[(origin, destination)] = {"carriers": {}}
+                    new_pairs.append((origin, destination))
+                route["carriers"].setdefault(*airline)
+
+            if new_pairs:
+                km, minutes = route_lengths(coordinates, new_pairs)
+                for pair, distance, duration in zip(new_pairs, km.tolist(), minutes.tolist()):
+                    routes[pair]["km"], routes[pair]["min"] = distance, duration
+    return routes
+
+
+def previous_carriers(output_file):
+    """
+    Reads the carriers of an earlier output, so a re-run keeps their schedules and seats.
+
+    Returns:
+        dict: {(origin, destination, airline iata): carrier dict}
+    """
+    carriers = {}
+    if not os.path.exists(output_file):
+        return carriers
+    for origin, airport in iter_json_object(output_file):
+        for route in airport.get("routes", []):
+            for carrier in route.get("carriers", []):
+                carriers[(origin, route.get("iata"), carrier.get("iata"))] = carrier
+    return carriers
+
+
+def build_airports(airports, routes, previous=None, schedule=True):
+    """
+    Yields (iata, airport dict) in the routes file format, one airport at a time.
+
+    Carriers that existed in `previous` are reused unchanged; new ones get a random
+    schedule and seat count (the `data_adjustment` transforms) unless `schedule` is False.
+    """
+    previous = previous or {}
+    routes_by_origin = {}
+    for (origin, destination), route in routes.items():
+        routes_by_origin.setdefault(origin, []).append((destination, route))
+
+    for iata, airport in airports.items():
+        airport_routes = []
+        for destination, route in routes_by_origin.get(iata, []):
+            carriers, new_carriers = [], []
+            for code, name in sorted(route["carriers"].items()):
+                carrier = previous.get((iata, destination, code))
+                if carrier is None:
+                    carrier = {"iata": code, "name": name}
+                    new_carriers.append(carrier)
+                carriers.append(carrier)
+
+            if new_carriers and schedule:
+                randomize_dates(iata, {"routes": [{"min": route["min"], "carriers": new_carriers}]})
+            for carrier in new_carriers:
+                carrier["departure_timezone"] = airport["timezone"]
+                carrier["arrival_timezone"] = airports[destination]["timezone"]
+                carrier["seats_remaining"] = 0
+            if new_carriers and schedule:
+                randomize_seats(iata, {"routes": [{"carriers": new_carriers}]})
+
+            airport_routes.append({"carriers": carriers, "iata": destination, "km": route["km"], "min": route["min"]})
+        yield iata, {**airport, "routes": airport_routes}
+
+
+def file_fingerprint(path):
+    """Cheap identity of an input file (size, mtime and a hash of its first and last 64 KiB)."""
+    stat = os.stat(path)
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        digest.update(f.read(65536))
+        if stat.st_size > 65536:
+            f.seek(max(stat.st_size - 65536, 65536))
+            digest.update(f.read())
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha1": digest.hexdigest()}
+
+
+def manifest_file(output_file):
+    return f"{output_file}.manifest.json"
+
+
+def ingest(airport_files, airline_files, route_files, output_file, schedule=True, include_inactive=False, force=False):
+    """
+    Builds the routes file used by `data_loader` from OpenFlights-style airport, airline and route files.
+
+    A manifest next to the output records the inputs and options. A re-run with the same
+    inputs does nothing; otherwise carriers already in the output keep their schedule and
+    seats and only new carriers are scheduled.
+
+    Returns:
+        dict: Summary with airport and route counts, or {'skipped': True} if the output is up to date.
+    """
+    inputs = {"airports": airport_files, "airlines": airline_files, "routes": route_files}
+    manifest = {
+        "inputs": {path: file_fingerprint(path) for paths in inputs.values() for path in paths},
+        "files": inputs,
+        "options": {"schedule": schedule, "include_inactive": include_inactive},
+    }
+    try:
+        with open(manifest_file(output_file), 'r', encoding='utf-8') as f:
+            previous_manifest = json.load(f)
+    except (OSError, ValueError):
+        previous_manifest = None
+    if not force and previous_manifest == manifest and os.path.exists(output_file):
+        return {"skipped": True}
+
+    airports = load_airports(airport_files)
+    airlines = load_airlines(airline_files, include_inactive)
+    routes = load_routes(route_files, airports, airlines)
+    previous = {} if force else previous_carriers(output_file)
+
+    count = write_json_object(build_airports(airports, routes, previous, schedule), output_file)
+    with open(manifest_file(output_file), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=4)
+    return {"skipped": False, "airports": count, "routes": len(routes), "airlines": len(airlines[1]),
+            "reused_carriers": sum(1 for origin, destination, code in previous
+                                   if code in routes.get((origin, destination), {}).get("carriers", {}))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build airline_routes.json from OpenFlights airports/airlines/routes files.")
+    parser.add_argument("--airports", action="append", help="airports .dat/.csv (repeatable, later files override)")
+    parser.add_argument("--airlines", action="append", help="airlines .dat/.csv (repeatable)")
+    parser.add_argument("--routes", action="append", help="routes .dat/.csv (repeatable)")
+    parser.add_argument("--sample", action="store_true", help="also join the CSVs under 'Sample Data'")
+    parser.add_argument("--output", default="airline_routes.json")
+    parser.add_argument("--no-schedule", action="store_true", help="do not generate dates and seats for new carriers")
+    parser.add_argument("--include-inactive", action="store_true", help="keep routes of inactive airlines")
+    parser.add_argument("--force", action="store_true", help="rebuild from scratch even if nothing changed")
+    args = parser.parse_args()
+
+    airport_files = args.airports or [os.path.join(OPENFLIGHTS_DIR, "airports.dat")]
+    airline_files = args.airlines or [os.path.join(OPENFLIGHTS_DIR, "airlines.dat")]
+    route_files = args.routes or [os.path.join(OPENFLIGHTS_DIR, "routes.dat")]
+    if args.sample:
+        airport_files.append(os.path.join(SAMPLE_DIR, "Airport Sample.csv"))
+        airline_files.append(os.path.join(SAMPLE_DIR, "Airline Sample.csv"))
+        route_files.append(os.path.join(SAMPLE_DIR, "Route Sample.csv"))
+
+    start = time.perf_counter()
+    summary = ingest(airport_files, airline_files, route_files, args.output,
+                     not args.no_schedule, args.include_inactive, args.force)
+    if summary["skipped"]:
+        print(f"{args.output} is up to date.")
+    else:
+        print(f"Wrote {summary['airports']} airports and {summary['routes']} routes to {args.output} "
+              f"({summary['reused_carriers']} carriers kept from the previous run) "
+              f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
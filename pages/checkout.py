@@ -1,6 +1,7 @@
 import dash
 import dash_bootstrap_components as dbc
 from dash import html, dcc, Input, Output, State, callback, register_page
+from seat_inventory import get_seat_inventory
 
 # Register checkout page
 register_page(__name__, path="/checkout")
@@ -154,20 +155,27 @@ def populate_checkout(route_data):
     [State('first-name', 'value'),
      State('last-name', 'value'),
      State('email', 'value'),
-     State('phone', 'value')],
+     State('phone', 'value'),
+     State('selected-route-data', 'data')],
     prevent_initial_call=True
 )
-def proceed_to_payment(n_clicks, first_name, last_name, email, phone):
+def proceed_to_payment(n_clicks, first_name, last_name, email, phone, route_data):
     if n_clicks:
         if not first_name or not last_name or not email or not phone:
             return (dash.no_update, "❌ Please fill in all fields before proceeding.", {}, dash.no_update)
 
+        # Hold one seat on every segment of the itinerary (all or nothing)
+        hold_id = get_seat_inventory().hold((route_data or {}).get('flight_keys', []))
+        if hold_id is None:
+            return (dash.no_update, "❌ Sorry, seats on this route are no longer available.", {}, dash.no_update)
+
         # Store passenger details in session storage
         passenger_data = {
             "first_name": first_name,
             "last_name": last_name,
             "email": email,
-            "phone": phone
+            "phone": phone,
+            "hold_id": hold_id
         }
 
         return ('/thank-you', "", {"display": "none"}, passenger_data)
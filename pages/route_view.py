@@ -1,24 +1,20 @@
 from datetime import datetime, date 
-import plotly.express as px
 from dash import dcc, html, Output, Input, callback, register_page, State
 from data_loader import airport_db  # Import the global AirportDatabase object
+from airport_options import get_airport_options
 from algorithms import bfs_min_connections, yen_k_shortest_paths, astar_preferred_airline
-from cal_price import get_price_for_route
+from pricing import PRICE_PER_KM, get_edge_prices
+from seat_inventory import flight_key, get_seat_inventory
 import dash_bootstrap_components as dbc
 import dash
 import json
+import math
 
 todayDate = date.today() # For date selection
 
 # Register Dash Page
 register_page(__name__, path='/route-view')
 
-# Generate dropdown options from airport database
-airport_options = [
-    {'label': f"{airport.name} ({airport.iata})", 'value': airport.iata}
-    for airport in sorted(airport_db.airports.values(), key=lambda a: a.iata)
-]
-
 # Define filter options
 filter_options = [
     {'label': "Price (Cheapest)", 'value': "shortest_path"},
@@ -37,108 +33,113 @@ map_projections = [
 ]
 
 # Layout
-layout = html.Div(className="min-h-screen gap-3 p-2 flex flex-col", children=[
-    # Add URL component for navigation
-    dcc.Location(id='url', refresh=False),
+def layout(**kwargs):
+    """Builds the page on each visit, so the airport dropdowns follow reloads of the routes file."""
+    airport_options = get_airport_options("iata")
+
+    return html.Div(className="min-h-screen gap-3 p-2 flex flex-col", children=[
+        # Add URL component for navigation
+        dcc.Location(id='url', refresh=False),
     
-    # Add storage components for storing flight data
-    dcc.Store(id='selected-route-data', storage_type='local'),
+        # Add storage components for storing flight data
+        dcc.Store(id='selected-route-data', storage_type='local'),
 
-    # Title
-    html.H2("Hi, where would you like to go?", className="text-2xl font-bold text-white my-3"),
+        # Title
+        html.H2("Hi, where would you like to go?", className="text-2xl font-bold text-white my-3"),
 
-    # dcc.Store(id="selected_flight", storage_type="local"),
+        # dcc.Store(id="selected_flight", storage_type="local"),
 
-    # Form Section
-    html.Div(className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-8 pb-9 pt-8 px-8 bg-white rounded-lg ", children=[
+        # Form Section
+        html.Div(className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-8 pb-9 pt-8 px-8 bg-white rounded-lg ", children=[
         
-        # Departure Airport Selection
-        html.Div(children=[
-            html.Label("Select Departure Airport:", className="font-bold text-gray-700 mt-0"),
-            dcc.Dropdown(id='departure-airport-dropdown', options=airport_options, placeholder="Select a departure airport",
-                className="bg-white border rounded-md shadow-sm focus:ring focus:ring-blue-200")
-        ]),
+            # Departure Airport Selection
+            html.Div(children=[
+                html.Label("Select Departure Airport:", className="font-bold text-gray-700 mt-0"),
+                dcc.Dropdown(id='departure-airport-dropdown', options=airport_options, placeholder="Select a departure airport",
+                    className="bg-white border rounded-md shadow-sm focus:ring focus:ring-blue-200")
+            ]),
 
-        # Arrival Airport Selection
-        html.Div(children=[
-            html.Label("Select Arrival Airport:", className="font-bold text-gray-700 mt-0"),
-            dcc.Dropdown(id='arrival-airport-dropdown', options=airport_options, placeholder="Select an arrival airport",
-                className="bg-white border rounded-md shadow-sm focus:ring focus:ring-blue-200")
-        ]),
+            # Arrival Airport Selection
+            html.Div(children=[
+                html.Label("Select Arrival Airport:", className="font-bold text-gray-700 mt-0"),
+                dcc.Dropdown(id='arrival-airport-dropdown', options=airport_options, placeholder="Select an arrival airport",
+                    className="bg-white border rounded-md shadow-sm focus:ring focus:ring-blue-200")
+            ]),
 
-        html.Div(className="flex flex-1 w-max space-x-4", children=[
+            html.Div(className="flex flex-1 w-max space-x-4", children=[
         
-        # Departure Date Picker
-        html.Div(children=[
-            html.Label("Departure Date:", className="font-bold text-gray-700 mt-0"),
-            dcc.DatePickerSingle(
-                display_format="DD/MM/YYYY",
-                id='departure-date-picker',
-                placeholder="Select date",
-                clearable=True,
-                #min_date_allowed=todayDate,
-                className="border rounded-md shadow-sm bg-white focus:ring focus:ring-blue-200"
-            )
-        ]),
+            # Departure Date Picker
+            html.Div(children=[
+                html.Label("Departure Date:", className="font-bold text-gray-700 mt-0"),
+                dcc.DatePickerSingle(
+                    display_format="DD/MM/YYYY",
+                    id='departure-date-picker',
+                    placeholder="Select date",
+                    clearable=True,
+                    #min_date_allowed=todayDate,
+                    className="border rounded-md shadow-sm bg-white focus:ring focus:ring-blue-200"
+                )
+            ]),
 
-        # Return Date Picker
-        html.Div(children=[
-            html.Label("Return Date:", className="font-bold text-gray-700 mt-0"),
-            dcc.DatePickerSingle(
-                display_format="DD/MM/YYYY",
-                id='return-date-picker',
-                placeholder="Select date",
-                clearable=True,
-                #min_date_allowed=todayDate,
-                className="border rounded-md shadow-sm bg-white focus:ring focus:ring-blue-200"
-            )
-        ]),
+            # Return Date Picker
+            html.Div(children=[
+                html.Label("Return Date:", className="font-bold text-gray-700 mt-0"),
+                dcc.DatePickerSingle(
+                    display_format="DD/MM/YYYY",
+                    id='return-date-picker',
+                    placeholder="Select date",
+                    clearable=True,
+                    #min_date_allowed=todayDate,
+                    className="border rounded-md shadow-sm bg-white focus:ring focus:ring-blue-200"
+                )
+            ]),
 
-    ]), 
+        ]), 
 
-        # Filter options
-        html.Div(children=[
-            html.Label("Filter by:", className="font-bold text-gray-700"),
-            dcc.Dropdown(id='filter-dropdown', options=filter_options, placeholder="Filter by", value="shortest_path",
-                className="bg-white border rounded-md shadow-sm focus:ring focus:ring-blue-200")
-        ]),
+            # Filter options
+            html.Div(children=[
+                html.Label("Filter by:", className="font-bold text-gray-700"),
+                dcc.Dropdown(id='filter-dropdown', options=filter_options, placeholder="Filter by", value="shortest_path",
+                    className="bg-white border rounded-md shadow-sm focus:ring focus:ring-blue-200")
+            ]),
 
-        # Airline Multi-Select Dropdown (Dynamic Options)
-        html.Div(
-            id="airline-dropdown-container",
-            style={"display": "none"},
-                children=[
-                    html.Label("Select Preferred Airlines:"),
-                    dcc.Dropdown(
-                        id='airline-dropdown',
-                        multi=True,  # Allows multiple selections
-                        placeholder="Select available airlines",
-                        className="bg-white border rounded-md shadow-sm focus:ring focus:ring-blue-200"
-                    ),
-                ]
-        ),
+            # Airline Multi-Select Dropdown (Dynamic Options)
+            html.Div(
+                id="airline-dropdown-container",
+                style={"display": "none"},
+                    children=[
+                        html.Label("Select Preferred Airlines:"),
+                        dcc.Dropdown(
+                            id='airline-dropdown',
+                            multi=True,  # Allows multiple selections
+                            placeholder="Select available airlines",
+                            className="bg-white border rounded-md shadow-sm focus:ring focus:ring-blue-200"
+                        ),
+                    ]
+            ),
         
 
-        # Map Projection Selection
-        html.Div(children=[
-            html.Label("Select Map View:", className="font-bold text-gray-700"),
-            dcc.Dropdown(id='map-projection-dropdown', options=map_projections, 
-                value="natural earth", clearable=False, placeholder="Select Map Projection",
-                className="bg-white border rounded-md shadow-sm focus:ring focus:ring-blue-200")
+            # Map Projection Selection
+            html.Div(children=[
+                html.Label("Select Map View:", className="font-bold text-gray-700"),
+                dcc.Dropdown(id='map-projection-dropdown', options=map_projections, 
+                    value="natural earth", clearable=False, placeholder="Select Map Projection",
+                    className="bg-white border rounded-md shadow-sm focus:ring focus:ring-blue-200")
+            ]),
         ]),
-    ]),
 
-    # Combined Route Information
-    html.Div(id='route-info', className="bg-white p-4 rounded-lg ", children=[
-        html.Div(id='route-info-content', className="mt-4"),
-    ]),
+        # Combined Route Information
+        html.Div(id='route-info', className="bg-white p-4 rounded-lg ", children=[
+            html.Div(id='route-info-content', className="mt-4"),
+        ]),
+
+        # Full-Width Map Visualization
+        html.Div(className="w-full md:h-screen h-full bg-white rounded-lg  overflow-hidden", children=[
+            dcc.Graph(id='route-map', className="w-full h-full whiteline-pre", 
+                config={'scrollZoom': True, 'displayModeBar': False})
+        ]),
+    ])
 
-    # Full-Width Map Visualization
-    html.Div(className="w-full md:h-screen h-full bg-white rounded-lg  overflow-hidden", children=[
-        dcc.Graph(id='route-map', className="w-full h-full whiteline-pre", 
-            config={'scrollZoom': True, 'displayModeBar': False})
-    ]),
-])
 
 # Callback to compute the route
 @callback(
@@ -156,6 +157,8 @@ layout = html.Div(className="min-h-screen gap-3 p-2 flex flex-col", children=[
 )
 
 def update_route_map(departure_iata, arrival_iata, depart_date, return_date, filter_option, projection_type, airline_type):
+    import plotly.express as px  # Imported on first use: plotly.express adds ~0.1 s to startup
+
     if not departure_iata or not arrival_iata:
         return "⚠️ Please select both departure and destination airports.", px.scatter_geo(projection=projection_type)
 
@@ -229,6 +232,10 @@ def update_route_map(departure_iata, arrival_iata, depart_date, return_date, fil
         total_est_price = 0
         route_details = []
         filtered_route = []
+        flight_keys = []  # Inventory key of the flight booked on each kept segment
+
+        # Base fare of every leg, gathered from the precomputed edge price table
+        segment_prices = get_edge_prices().segment_prices(route)
 
         for i in range(len(route) - 1):
             segment_start_iata, segment_end_iata = route[i], route[i + 1]
@@ -249,13 +256,21 @@ def update_route_map(departure_iata, arrival_iata, depart_date, return_date, fil
                 if not available_carriers:
                     continue  # Skip routes with no available flights on selected date
 
-                # Get airline names & Seats Left
-                carrier_names = " | ".join( f"{carrier.name}: {carrier.seats_remaining} seats left" for carrier in available_carriers ) if available_carriers else "Unknown Airline"
+                # Get airline names & live Seats Left from the seat inventory
+                carrier_keys = [flight_key(segment_start_iata, segment_end_iata, carrier) for carrier in available_carriers]
+                live_seats = get_seat_inventory().seats_for(carrier_keys)
+                seats_left = [live_seats.get(key, carrier.seats_remaining) for key, carrier in zip(carrier_keys, available_carriers)]
+                carrier_names = " | ".join( f"{carrier.name}: {seats} seats left" for carrier, seats in zip(available_carriers, seats_left) ) if available_carriers else "Unknown Airline"
+
+                # Book the flight with the most seats left on this segment
+                flight_keys.append(max(zip(seats_left, carrier_keys))[1])
                 
                 distance = route_info.km
                 total_distance += distance
 
-                price = get_price_for_route(segment_start_airport, segment_end_airport)
+                price = float(segment_prices[i])
+                if math.isnan(price):
+                    price = round(distance * PRICE_PER_KM, 2)  # No coordinates: use the listed route distance
                 total_est_price += price
 
                 # Button to select flight
@@ -290,9 +305,9 @@ def update_route_map(departure_iata, arrival_iata, depart_date, return_date, fil
         
         filtered_route.append(route[-1])
 
-        return total_distance, route_details, total_est_price, filtered_route
+        return total_distance, route_details, total_est_price, filtered_route, flight_keys
     
-    total_distance, route_details, estimated_price, filtered_route = calculate_route_details(route,airport_db)
+    total_distance, route_details, estimated_price, filtered_route, flight_keys = calculate_route_details(route,airport_db)
     
     if not route_details:
         return f"❌ No route available from {dep_airport.name} to {arr_airport.name} on {formatted_depart_date} to {formatted_return_date}.", px.scatter_geo(projection=projection_type)
@@ -320,7 +335,8 @@ def update_route_map(departure_iata, arrival_iata, depart_date, return_date, fil
         'departure_date': formatted_depart_date,
         'return_date': formatted_return_date,
         'num_stops': len(filtered_route) - 1,
-        'is_partial_route': is_partial_route
+        'is_partial_route': is_partial_route,
+        'flight_keys': flight_keys
     }
     
     # Create a select full route button using dcc.Link instead of html.Button
@@ -434,7 +450,7 @@ def update_airline_options(departure_iata, arrival_iata, filter_options):
         return [], {"display": "none"}
 
 
-    unique_carrier = get_unique_carrier()
+    unique_carrier = airport_db.snapshot.airline_names()
     # Convert to dropdown options
     airline_options = [{'label': f"{unique_carrier[iata]} ({iata})", 'value': iata} for iata in unique_carrier.keys()]
 
@@ -443,15 +459,6 @@ def update_airline_options(departure_iata, arrival_iata, filter_options):
     
     return airline_options, style
 
-def get_unique_carrier():
-    unique_carrier = {}  # Dictionary to store unique IATA -> Name mapping
-
-    for airport in airport_db.airports.values():
-        for route in airport.routes:
-            for carrier in route.carriers:
-                unique_carrier[carrier.iata] = carrier.name  # Store IATA -> Name mapping
-    return unique_carrier 
-
 # Callback to store selected route data when button is clicked
 @callback(
     Output('selected-route-data', 'data'),
@@ -1,42 +1,67 @@
 from dash import html, dash_table, dcc, Output, Input, callback, register_page
 from data_loader import airport_db  # Same shared data source
+from airport_options import get_airport_options
+from schedule_index import SCHEDULE_COLUMNS, get_schedule_index
 
 register_page(__name__, path='/table-view')
 
-# Dropdown options for airports
-airport_options = [
-    {'label': f"{airport.name} ({airport.iata})", 'value': airport.iata}
-    for airport in airport_db.airports.values()
-]
+# Rows sent to the browser per schedule page
+PAGE_SIZE = 25
 
-layout = html.Div([
-    html.H2("Table View - Flight Map Routing", className="text-4xl text-white font-bold my-3"),
+
+def layout(**kwargs):
+    """Builds the page on each visit, so the airport dropdown follows reloads of the routes file."""
+    airport_options = get_airport_options("database")
+
+    return html.Div([
+        html.H2("Table View - Flight Map Routing", className="text-4xl text-white font-bold my-3"),
     
-    # Airport Selection Dropdown
-    html.Label("Select an Airport:", className="block text-lg font-medium text-gray-100 mb-2"),
-    dcc.Dropdown(
-        id='airport-dropdown',
-        options=airport_options,
-        placeholder="Select an airport",
-        className="mb-4 p-2 border border-gray-300 rounded-md"
-    ),
+        # Airport Selection Dropdown
+        html.Label("Select an Airport:", className="block text-lg font-medium text-gray-100 mb-2"),
+        dcc.Dropdown(
+            id='airport-dropdown',
+            options=airport_options,
+            placeholder="Select an airport",
+            className="mb-4 p-2 border border-gray-300 rounded-md"
+        ),
+
+        # Containers for tables
+        html.Div(id='airport-info-table', className="mt-4"),
+        html.Div(id='flight-schedule-message', className="mt-4"),
 
-    # Containers for tables
-    html.Div(id='airport-info-table', className="mt-4"),
-    html.Div(id='flight-schedule-table', className="mt-4")  # New flight schedule table
-])
+        # Flight schedule table, paged, sorted and filtered on the server
+        html.Div(id='flight-schedule-container', className="mt-4", style={"display": "none"}, children=[
+            dash_table.DataTable(
+                id='flight-schedule-table',
+                columns=[{"name": column, "id": column} for column in SCHEDULE_COLUMNS],
+                page_current=0,
+                page_size=PAGE_SIZE,
+                page_action='custom',
+                sort_action='custom',
+                sort_mode='multi',
+                sort_by=[],
+                filter_action='custom',
+                filter_query='',
+                style_table={'overflowX': 'auto'},
+                style_cell={'textAlign': 'left', 'padding': '10px'},
+                style_header={'backgroundColor': 'rgb(230, 230, 230)', 'fontWeight': 'bold'}
+            )
+        ])
+    ])
 
 
 @callback(
     [Output('airport-info-table', 'children'),
-     Output('flight-schedule-table', 'children')],  # Added flight schedule table
+     Output('flight-schedule-message', 'children'),
+     Output('flight-schedule-container', 'style'),
+     Output('flight-schedule-table', 'page_current')],
     [Input('airport-dropdown', 'value')]
 )
 def update_airport_table(selected_iata):
     airport = airport_db.get_airport(selected_iata)
 
     if not airport:
-        return "", ""
+        return "", "", {"display": "none"}, 0
 
     # ✅ Airport Information Table
     airport_table = dash_table.DataTable(
@@ -55,35 +80,29 @@ def update_airport_table(selected_iata):
         style_header={'backgroundColor': 'rgb(230, 230, 230)', 'fontWeight': 'bold'}
     )
 
-    # ✅ Flight Schedule Table (Grouped by Airline & Destination)
-    flight_schedule = []
-    for route in airport.routes:
-        for carrier in route.carriers:
-            flight_schedule.append({
-                "Airline": f"{carrier.name} ({carrier.iata})",
-                "Destination": route.iata,
-                "Departure Date": carrier.departure_date,
-                "Departure Time": carrier.departure_time,
-                "Arrival Date": carrier.arrival_date,
-                "Arrival Time": carrier.arrival_time
-            })
-
-    if not flight_schedule:
-        schedule_table = html.P("No flight schedules available for this airport.", className="text-red-500")
-    else:
-        schedule_table = dash_table.DataTable(
-            columns=[
-                {"name": "Airline", "id": "Airline"},
-                {"name": "Destination", "id": "Destination"},
-                {"name": "Departure Date", "id": "Departure Date"},
-                {"name": "Departure Time", "id": "Departure Time"},
-                {"name": "Arrival Date", "id": "Arrival Date"},
-                {"name": "Arrival Time", "id": "Arrival Time"}
-            ],
-            data=flight_schedule,
-            style_table={'overflowX': 'auto'},
-            style_cell={'textAlign': 'left', 'padding': '10px'},
-            style_header={'backgroundColor': 'rgb(230, 230, 230)', 'fontWeight': 'bold'}
-        )
-
-    return airport_table, schedule_table
+    # ✅ Flight Schedule Table (rows are served page by page by update_schedule_page)
+    if not get_schedule_index().row_count(airport.iata):
+        message = html.P("No flight schedules available for this airport.", className="text-red-500")
+        return airport_table, message, {"display": "none"}, 0
+
+    return airport_table, "", {"display": "block"}, 0
+
+
+@callback(
+    [Output('flight-schedule-table', 'data'),
+     Output('flight-schedule-table', 'page_count')],
+    [Input('airport-dropdown', 'value'),
+     Input('flight-schedule-table', 'page_current'),
+     Input('flight-schedule-table', 'page_size'),
+     Input('flight-schedule-table', 'sort_by'),
+     Input('flight-schedule-table', 'filter_query')]
+)
+def update_schedule_page(selected_iata, page_current, page_size, sort_by, filter_query):
+    """Returns only the requested page of the selected airport's schedule."""
+    if not selected_iata:
+        return [], 1
+
+    rows, page_count, _ = get_schedule_index().query(
+        selected_iata, page_current or 0, page_size or PAGE_SIZE, sort_by, filter_query
+    )
+    return rows, page_count
@@ -1,7 +1,9 @@
-from dash import dcc, html, register_page, Input, Output, State, callback
+from concurrent.futures import TimeoutError as RenderTimeout
+from dash import dcc, html, no_update, register_page, Input, Output, State, callback
 import dash_bootstrap_components as dbc
 import random
-from weasyprint import HTML
+from receipt_renderer import receipt_renderer
+from seat_inventory import get_seat_inventory
 
 # Register the thank you page
 register_page(__name__, path='/thank-you')
@@ -14,6 +16,7 @@ def generate_booking_reference():
 layout = html.Div(className="min-h-screen flex flex-col justify-center items-center bg-gray-100", children=[
     dcc.Store(id='selected-route-data', storage_type='local'),
     dcc.Store(id='passenger-info', storage_type='session'),
+    dcc.Store(id='booking-reference-store', storage_type='session'),  # Booking reference shown on this page
 
     # Title
    html.H2(id="thank-you-title", className="text-3xl font-bold text-center mb-4"), 
@@ -30,7 +33,8 @@ layout = html.Div(className="min-h-screen flex flex-col justify-center items-cen
                 href="/route-view"
             ),
             html.Button("Download Booking Details", id="download-pdf", className="bg-blue-600 hover:bg-blue-800 text-white font-bold py-2 px-4 rounded"),
-        ])
+        ]),
+        html.P(id="download-error", className="text-red-500 mt-4"),
     ]),
 
     # Hidden link for PDF download
@@ -39,13 +43,19 @@ layout = html.Div(className="min-h-screen flex flex-col justify-center items-cen
 # Callback to populate the page dynamically
 @callback(
     [Output("thank-you-title", "children"),
-     Output("booking-reference", "children")],
+     Output("booking-reference", "children"),
+     Output("booking-reference-store", "data")],
     [Input("selected-route-data", "data"),
      Input("passenger-info", "data")]
 )
 def update_page(flight_data, passenger_data):
     if not passenger_data:
-        return "Thank you! Your booking is confirmed!", "Booking Reference: N/A"
+        return "Thank you! Your booking is confirmed!", "Booking Reference: N/A", None
+
+    # Confirm the seats held at checkout; an expired hold has already gone back on sale
+    if not passenger_data.get('hold_id') or not get_seat_inventory().commit(passenger_data['hold_id']):
+        return ("Sorry, your seat reservation has expired.",
+                "Your booking was not confirmed. Please select your flight again.", None)
 
     booking_reference = generate_booking_reference()
     first_name = passenger_data.get('first_name', 'Guest')
@@ -53,109 +63,35 @@ def update_page(flight_data, passenger_data):
 
     return (
         f"Thank you {first_name}. {" "}Your booking is confirmed!",
-        f"Booking Reference: {booking_reference}"
+        f"Booking Reference: {booking_reference}",
+        booking_reference
     )
 
 # Callback to generate and download booking details as PDF
 @callback(
-    Output("download-booking", "data"),
+    [Output("download-booking", "data"),
+     Output("download-error", "children")],
     Input("download-pdf", "n_clicks"),
     [State("selected-route-data", "data"),
-     State("passenger-info", "data")],
+     State("passenger-info", "data"),
+     State("booking-reference-store", "data")],
     prevent_initial_call=True
 )
 
-def download_booking(n_clicks, flight_data, passenger_data):
+def download_booking(n_clicks, flight_data, passenger_data, booking_reference):
     if not flight_data or not passenger_data:
-        return None
-
-    booking_reference = generate_booking_reference()
-
-    booking_details_html = f"""
-     <html>
-    <head>
-        <style>
-            body {{
-                font-family: Arial, sans-serif;
-                margin: 40px;
-                width: 100vw;
-                height: 100vh;
-            }}
-            .container {{
-                border: 1px solid #000;
-                padding: 20px;
-            }}
-            .title {{
-                font-size: 24px;
-                font-weight: bold;
-                text-align: center;
-                margin-bottom: 20px;
-            }}
-            .section-title {{
-                font-weight: bold;
-                background-color: #f0f0f0;
-                padding: 5px;
-                margin-top: 20px;
-            }}
-            .info-table {{
-                width: 100%;
-                border-collapse: collapse;
-            }}
-            .info-table td {{
-                padding: 8px;
-                border-bottom: 1px solid #ddd;
-            }}
-            .price-table {{
-                width: 100%;
-                border-collapse: collapse;
-                margin-top: 20px;
-            }}
-            .price-table td {{
-                padding: 8px;
-                border-bottom: 1px solid #ddd;
-            }}
-            .total {{
-                font-weight: bold;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="title">e-Ticket Receipt & Itinerary</div>
-
-            <div class="section-title">PASSENGER AND TICKET INFORMATION</div>
-            <table class="info-table">
-                <tr><td>Passenger Name:</td><td>{passenger_data.get('first_name', '')} {passenger_data.get('last_name', '')}</td></tr>
-                <tr><td>Email:</td><td>{passenger_data.get('email', '')}</td></tr>
-                <tr><td>Phone:</td><td>{passenger_data.get('phone', '')}</td></tr>
-                <tr><td>Booking Reference:</td><td>{booking_reference}</td></tr>
-                <tr><td>Issued By/Date:</td><td>{flight_data.get('departure_date', 'Not selected')}</td></tr>
-            </table>
-
-            <div class="section-title">TRAVEL INFORMATION</div>
-            <table class="info-table">
-                <tr><td>Flight:</td><td>SKY 123</td></tr>
-                <tr><td>Departure:</td><td>{flight_data.get('departure_airport', {}).get('name', '')} ({flight_data.get('departure_airport', {}).get('iata', '')})</td></tr>
-                <tr><td>Arrival:</td><td>{flight_data.get('arrival_airport', {}).get('name', '')} ({flight_data.get('arrival_airport', {}).get('iata', '')})</td></tr>
-                <tr><td>Departure Date:</td><td>{flight_data.get('departure_date', 'Not selected')}</td></tr>
-                <tr><td>Return Date:</td><td>{flight_data.get('return_date', 'Not selected')}</td></tr>
-                <tr><td>Number of Stops:</td><td>{flight_data.get('num_stops', 0)}</td></tr>
-            </table>
-
-            <div class="section-title">FARE AND ADDITIONAL INFORMATION</div>
-            <table class="price-table">
-                <tr><td>Base Fare:</td><td>${flight_data.get('estimated_price', 0):.2f}</td></tr>
-                <tr><td>Flight tax ($105):</td><td>${105}</td></tr>
-                <tr class="total"><td>Total Price:</td><td>${flight_data.get('estimated_price', 0) + 105:.2f}</td></tr>
-            </table>
-        </div>
-    </body>
-    </html>
-    """
+        return None, ""
 
-    pdf_path = "/tmp/booking_details.pdf"
+    if not booking_reference:
+        booking_reference = generate_booking_reference()
 
-    # Convert formatted HTML to PDF using WeasyPrint
-    HTML(string=booking_details_html).write_pdf(pdf_path)
+    # Rendered on the receipt worker pool; repeat clicks with unchanged booking details reuse the same PDF
+    try:
+        pdf_bytes = receipt_renderer.render(booking_reference, flight_data, passenger_data)
+    except RenderTimeout:
+        return no_update, "Your receipt is still being prepared. Please try again in a moment."
+    except Exception as e:
+        print(f"Error rendering receipt {booking_reference}: {e}")
+        return no_update, "Sorry, your receipt could not be generated."
 
-    return dcc.send_file(pdf_path)
\ No newline at end of file
+    return dcc.send_bytes(pdf_bytes, "booking_details.pdf"), ""
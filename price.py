@@ -1,5 +1,5 @@
-import json
 import math
+from json_loader import read_json_file
 
 def calculate_distance(lat1, lon1, lat2, lon2):
     """Calculates the great-circle distance (Haversine formula)."""
@@ -17,12 +17,7 @@ def calculate_price(distance, price_per_km):
 
 def load_airport_data(filepath):
     """Loads airport data from a JSON file."""
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError, Exception) as e:
-        print(f"Error loading data: {e}")
-        return None
+    return read_json_file(filepath)
 
 def get_price_for_route(origin_iata, destination_iata, airport_data, price_per_km):
     """Calculates the price for a route."""
@@ -0,0 +1,111 @@
+import threading
+import numpy as np
+from data_loader import airport_db  # Import the global AirportDatabase object
+from route_graph import get_route_graph
+
+# Default fare per kilometre (same as cal_price.get_price_for_route)
+PRICE_PER_KM = 0.25
+EARTH_RADIUS_KM = 6371
+
+
+def great_circle_km(lat1, lon1, lat2, lon2):
+    """
+    Vectorized Haversine distance.
+
+    Args:
+        lat1, lon1, lat2, lon2 (numpy.ndarray): Coordinates in degrees, broadcastable to a common shape.
+
+    Returns:
+        numpy.ndarray: Great-circle distances in kilometers.
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(x) for x in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+class EdgePrices:
+    """
+    Great-circle distance and base fare for every route, computed in one NumPy pass.
+
+    `distance_km[e]` and `base_price[e]` are indexed by the edge ids of the RouteGraph,
+    so pricing an itinerary is a lookup of its edge ids followed by an array gather.
+    Routes touching an airport without coordinates are NaN in the arrays; the scalar
+    methods below return None for them instead.
+    """
+
+    def __init__(self, route_graph, price_per_km=PRICE_PER_KM):
+        self.graph = route_graph
+        self.price_per_km = price_per_km
+
+        self.distance_km = great_circle_km(
+            route_graph.latitude[route_graph.sources], route_graph.longitude[route_graph.sources],
+            route_graph.latitude[route_graph.targets], route_graph.longitude[route_graph.targets]
+        )
+        self.base_price = np.round(self.distance_km * price_per_km, 2)
+
+    def segment_prices(self, path):
+        """
+        Returns the base fare of each leg of an itinerary.
+
+        Args:
+            path (list): Sequence of airport IATA codes.
+
+        Returns:
+            numpy.ndarray: One price per consecutive pair of airports. Legs that are not a
+            known route are priced from the airport coordinates directly; legs that cannot
+            be priced (unknown airport or missing coordinates) are NaN.
+        """
+        edge_ids = self.graph.path_edge_ids(path)
+        prices = np.zeros(len(edge_ids))
+        known_edges = edge_ids >= 0
+        prices[known_edges] = self.base_price[edge_ids[known_edges]]
+
+        missing = np.nonzero(~known_edges)[0]
+        if len(missing):
+            index = self.graph.index
+            origins = np.array([index.get(path[i], -1) for i in missing])
+            destinations = np.array([index.get(path[i + 1], -1) for i in missing])
+            known = (origins >= 0) & (destinations >= 0)
+
+            distance = np.full(len(missing), np.nan)
+            distance[known] = great_circle_km(
+                self.graph.latitude[origins[known]], self.graph.longitude[origins[known]],
+                self.graph.latitude[destinations[known]], self.graph.longitude[destinations[known]]
+            )
+            prices[missing] = np.round(distance * self.price_per_km, 2)
+
+        return prices
+
+    def price_itinerary(self, path):
+        """Returns the total base fare of an itinerary (sum of its leg prices), or None if a leg cannot be priced."""
+        total = float(self.segment_prices(path).sum())
+        return None if np.isnan(total) else total
+
+    def edge_price(self, origin_iata, destination_iata):
+        """Returns the base fare of a single route, or None if the route does not exist or cannot be priced."""
+        edge = self.graph.edge_id(origin_iata, destination_iata)
+        if edge is None or np.isnan(self.base_price[edge]):
+            return None
+        return float(self.base_price[edge])
+
+
+_edge_prices = None
+_edge_prices_lock = threading.Lock()
+
+
+def get_edge_prices():
+    """Returns the shared EdgePrices table, building it on first use."""
+    global _edge_prices
+    if _edge_prices is None:
+        with _edge_prices_lock:
+            if _edge_prices is None:
+                _edge_prices = EdgePrices(get_route_graph())
+    return _edge_prices
+
+
+@airport_db.on_reload
+def _invalidate_edge_prices(diff):
+    """Drops the price table only when airports, coordinates or the set of routes changed."""
+    global _edge_prices
+    if diff.topology_changed:
+        _edge_prices = None
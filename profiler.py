@@ -0,0 +1,186 @@
+import hmac
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from flask import Response, abort, g, jsonify, request
+
+# Environment variable holding the token for the admin routes (the routes are disabled when it is unset)
+ADMIN_TOKEN_ENV = "SKYWINGS_ADMIN_TOKEN"
+
+# Sampling defaults and limits for /admin/profile
+DEFAULT_SECONDS = 10
+MAX_SECONDS = 60
+DEFAULT_INTERVAL_MS = 5
+MIN_INTERVAL_MS = 1
+
+# Timing key for requests whose output is not a registered callback
+UNKNOWN_CALLBACK = "unknown"
+
+
+def frame_label(frame):
+    """Returns 'function (file.py:line)' for one stack frame."""
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Stack-sampling profiler that only runs while a profile is being taken.
+
+    A background thread wakes up every `interval` seconds, reads the current frame of
+    every other thread with `sys._current_frames()` and counts each stack. Nothing is
+    installed in the interpreter (no trace or profile hooks), so the cost is limited to
+    the sampling thread itself and is zero between profiles.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def busy(self):
+        return self._lock.locked()
+
+    def profile(self, seconds=DEFAULT_SECONDS, interval=DEFAULT_INTERVAL_MS / 1000):
+        """
+        Samples all threads for a while.
+
+        Args:
+            seconds (float): How long to sample.
+            interval (float): Seconds between samples.
+
+        Returns:
+            tuple: (Counter of collapsed stacks, number of samples), or None if another profile is running.
+        """
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            stacks = Counter()
+            samples = 0
+            own_thread = threading.get_ident()
+            names = {}
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                if len(names) != threading.active_count():
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own_thread:
+                        continue
+                    labels = []
+                    while frame is not None:
+                        labels.append(frame_label(frame))
+                        frame = frame.f_back
+                    labels.append(names.get(thread_id, f"thread-{thread_id}"))
+                    stacks[";".join(reversed(labels))] += 1
+                samples += 1
+                time.sleep(interval)
+            return stacks, samples
+        finally:
+            self._lock.release()
+
+
+def collapsed_stacks(stacks):
+    """Formats stack counts in the collapsed format read by flamegraph.pl and speedscope."""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+class CallbackTimings:
+    """Cumulative wall time per Dash callback, measured around `/_dash-update-component` requests."""
+
+    def __init__(self):
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds, failed=False):
+        with self._lock:
+            totals = self._totals.setdefault(name, {"calls": 0, "errors": 0, "total_s": 0.0, "max_s": 0.0})
+            totals["calls"] += 1
+            totals["errors"] += failed
+            totals["total_s"] += seconds
+            totals["max_s"] = max(totals["max_s"], seconds)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                name: {**totals, "mean_s": totals["total_s"] / totals["calls"]}
+                for name, totals in sorted(self._totals.items(), key=lambda item: -item[1]["total_s"])
+            }
+
+    def reset(self):
+        with self._lock:
+            self._totals.clear()
+
+
+profiler = SamplingProfiler()
+callback_timings = CallbackTimings()
+
+
+def _check_token():
+    """Aborts with 404 when admin routes are disabled and 403 when the token is wrong."""
+    expected = os.environ.get(ADMIN_TOKEN_ENV)
+    if not expected:
+        abort(404)
+    # Header only: query strings end up in access logs
+    supplied = request.headers.get("X-Admin-Token") or ""
+    if not hmac.compare_digest(supplied.encode("utf-8"), expected.encode("utf-8")):
+        abort(403)
+
+
+def install(app):
+    """
+    Adds per-callback timing and the admin profiling routes to a Dash app.
+
+    Routes (token in the X-Admin-Token header, see ADMIN_TOKEN_ENV):
+        /admin/profile?seconds=10&interval_ms=5   collapsed stacks of all threads, for flamegraphs
+        /admin/callback-timings[?reset=1]         cumulative time per callback as JSON
+    """
+    server = app.server
+    callback_names = {}
+
+    def callback_name(output):
+        # The output comes from the request body: only registered callbacks get their own entry
+        if not isinstance(output, str) or output not in app.callback_map:
+            return UNKNOWN_CALLBACK
+        if output not in callback_names:
+            function = app.callback_map[output].get("callback")
+            callback_names[output] = getattr(function, "__name__", output)
+        return callback_names[output]
+
+    @server.before_request
+    def start_callback_timer():
+        if request.path.endswith("/_dash-update-component"):
+            g.callback_started = time.perf_counter()
+
+    @server.after_request
+    def stop_callback_timer(response):
+        started = g.pop("callback_started", None)
+        if started is not None:
+            body = request.get_json(silent=True) or {}
+            output = body.get("output") if isinstance(body, dict) else None
+            callback_timings.record(callback_name(output),
+                                    time.perf_counter() - started, failed=response.status_code >= 500)
+        return response
+
+    @server.route("/admin/profile")
+    def admin_profile():
+        _check_token()
+        seconds = min(max(request.args.get("seconds", DEFAULT_SECONDS, type=float), 0.1), MAX_SECONDS)
+        interval_ms = max(request.args.get("interval_ms", DEFAULT_INTERVAL_MS, type=float), MIN_INTERVAL_MS)
+
+        result = profiler.profile(seconds, interval_ms / 1000)
+        if result is None:
+            return jsonify({"error": "A profile is already running"}), 409
+        stacks, samples = result
+        return Response(collapsed_stacks(stacks), mimetype="text/plain", headers={
+            "Content-Disposition": f"attachment; filename=profile-{int(time.time())}.collapsed",
+            "X-Profile-Samples": str(samples),
+        })
+
+    @server.route("/admin/callback-timings")
+    def admin_callback_timings():
+        _check_token()
+        timings = callback_timings.snapshot()
+        if request.args.get("reset"):
+            callback_timings.reset()
+        return jsonify(timings)
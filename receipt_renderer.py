@@ -0,0 +1,227 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from html import escape
+from string import Template
+
+# Stylesheet for the e-ticket receipt, parsed once by WeasyPrint and reused for every render
+RECEIPT_CSS = """
+body {
+    font-family: Arial, sans-serif;
+    margin: 40px;
+    width: 100vw;
+    height: 100vh;
+}
+.container {
+    border: 1px solid #000;
+    padding: 20px;
+}
+.title {
+    font-size: 24px;
+    font-weight: bold;
+    text-align: center;
+    margin-bottom: 20px;
+}
+.section-title {
+    font-weight: bold;
+    background-color: #f0f0f0;
+    padding: 5px;
+    margin-top: 20px;
+}
+.info-table {
+    width: 100%;
+    border-collapse: collapse;
+}
+.info-table td {
+    padding: 8px;
+    border-bottom: 1px solid #ddd;
+}
+.price-table {
+    width: 100%;
+    border-collapse: collapse;
+    margin-top: 20px;
+}
+.price-table td {
+    padding: 8px;
+    border-bottom: 1px solid #ddd;
+}
+.total {
+    font-weight: bold;
+}
+"""
+
+# Receipt body, filled in with escaped booking values
+RECEIPT_TEMPLATE = Template("""
+<html>
+<body>
+    <div class="container">
+        <div class="title">e-Ticket Receipt &amp; Itinerary</div>
+
+        <div class="section-title">PASSENGER AND TICKET INFORMATION</div>
+        <table class="info-table">
+            <tr><td>Passenger Name:</td><td>$passenger_name</td></tr>
+            <tr><td>Email:</td><td>$email</td></tr>
+            <tr><td>Phone:</td><td>$phone</td></tr>
+            <tr><td>Booking Reference:</td><td>$booking_reference</td></tr>
+            <tr><td>Issued By/Date:</td><td>$departure_date</td></tr>
+        </table>
+
+        <div class="section-title">TRAVEL INFORMATION</div>
+        <table class="info-table">
+            <tr><td>Flight:</td><td>SKY 123</td></tr>
+            <tr><td>Departure:</td><td>$departure_airport</td></tr>
+            <tr><td>Arrival:</td><td>$arrival_airport</td></tr>
+            <tr><td>Departure Date:</td><td>$departure_date</td></tr>
+            <tr><td>Return Date:</td><td>$return_date</td></tr>
+            <tr><td>Number of Stops:</td><td>$num_stops</td></tr>
+        </table>
+
+        <div class="section-title">FARE AND ADDITIONAL INFORMATION</div>
+        <table class="price-table">
+            <tr><td>Base Fare:</td><td>$$$base_fare</td></tr>
+            <tr><td>Flight tax ($$$flight_tax):</td><td>$$$flight_tax</td></tr>
+            <tr class="total"><td>Total Price:</td><td>$$$total_price</td></tr>
+        </table>
+    </div>
+</body>
+</html>
+""")
+
+# Flat tax added to every booking (matches the checkout page)
+FLIGHT_TAX = 105
+
+_weasyprint_lock = threading.Lock()
+_weasyprint = None
+
+
+def _load_weasyprint():
+    """
+    Imports WeasyPrint and parses the receipt stylesheet on first use.
+
+    WeasyPrint pulls in Pango/Cairo bindings and takes a noticeable time to import,
+    so it is only loaded when the first receipt is actually requested.
+
+    Returns:
+        tuple: (HTML class, parsed receipt CSS stylesheet).
+    """
+    global _weasyprint
+    if _weasyprint is None:
+        with _weasyprint_lock:
+            if _weasyprint is None:
+                from weasyprint import CSS, HTML
+                _weasyprint = (HTML, CSS(string=RECEIPT_CSS))
+    return _weasyprint
+
+
+def build_receipt_html(booking_reference, flight_data, passenger_data):
+    """
+    Fills the receipt template with booking details.
+
+    Args:
+        booking_reference (str): The booking reference shown on the receipt.
+        flight_data (dict): Selected route data stored by the route view.
+        passenger_data (dict): Passenger details stored by the checkout page.
+
+    Returns:
+        str: The receipt as an HTML document (without the stylesheet).
+    """
+    departure_airport = flight_data.get('departure_airport', {})
+    arrival_airport = flight_data.get('arrival_airport', {})
+    base_fare = flight_data.get('estimated_price', 0)
+
+    return RECEIPT_TEMPLATE.substitute(
+        passenger_name=escape(f"{passenger_data.get('first_name', '')} {passenger_data.get('last_name', '')}"),
+        email=escape(str(passenger_data.get('email', ''))),
+        phone=escape(str(passenger_data.get('phone', ''))),
+        booking_reference=escape(booking_reference),
+        departure_airport=escape(f"{departure_airport.get('name', '')} ({departure_airport.get('iata', '')})"),
+        arrival_airport=escape(f"{arrival_airport.get('name', '')} ({arrival_airport.get('iata', '')})"),
+        departure_date=escape(str(flight_data.get('departure_date', 'Not selected'))),
+        return_date=escape(str(flight_data.get('return_date', 'Not selected'))),
+        num_stops=escape(str(flight_data.get('num_stops', 0))),
+        base_fare=f"{base_fare:.2f}",
+        flight_tax=FLIGHT_TAX,
+        total_price=f"{base_fare + FLIGHT_TAX:.2f}",
+    )
+
+
+def html_to_pdf(receipt_html):
+    """Renders a receipt HTML document to PDF bytes using the cached stylesheet."""
+    HTML, stylesheet = _load_weasyprint()
+    return HTML(string=receipt_html).write_pdf(stylesheets=[stylesheet])
+
+
+class ReceiptRenderer:
+    """
+    Renders booking receipts on a small worker pool.
+
+    Renders are keyed by a hash of the filled-in receipt, not by the booking reference
+    alone: the reference comes from client state, so a cached PDF is only ever returned
+    to a request that already holds every value printed on it, and edited passenger or
+    flight details produce a new PDF. Concurrent requests for the same receipt share a
+    single render, and finished PDFs are kept in a bounded LRU cache so repeat downloads
+    are served without touching WeasyPrint again.
+    """
+
+    def __init__(self, max_workers=2, cache_size=256):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="receipt")
+        self._cache_size = cache_size
+        self._cache = OrderedDict()  # receipt hash -> PDF bytes
+        self._pending = {}  # receipt hash -> Future of an in-flight render
+        self._lock = threading.Lock()
+
+    def render(self, booking_reference, flight_data, passenger_data, timeout=30):
+        """
+        Returns the PDF receipt for a booking, rendering each distinct receipt at most once.
+
+        Args:
+            booking_reference (str): The booking reference shown on the receipt.
+            flight_data (dict): Selected route data.
+            passenger_data (dict): Passenger details.
+            timeout (float): Seconds to wait for the worker pool before giving up.
+
+        Returns:
+            bytes: The rendered PDF.
+
+        Raises:
+            concurrent.futures.TimeoutError: The render did not finish within `timeout`
+                (it keeps running and is cached for the next request).
+            Exception: Whatever WeasyPrint raised while rendering.
+        """
+        receipt_html = build_receipt_html(booking_reference, flight_data, passenger_data)
+        key = hashlib.sha256(receipt_html.encode("utf-8")).hexdigest()
+
+        with self._lock:
+            pdf = self._cache.get(key)
+            if pdf is not None:
+                self._cache.move_to_end(key)
+                return pdf
+
+            future = self._pending.get(key)
+            if future is None:
+                future = self._executor.submit(html_to_pdf, receipt_html)
+                self._pending[key] = future
+                submitted = True
+            else:
+                submitted = False
+
+        if submitted:
+            future.add_done_callback(lambda done: self._store(key, done))
+
+        return future.result(timeout=timeout)
+
+    def _store(self, key, future):
+        """Moves a finished render from the pending table into the LRU cache."""
+        with self._lock:
+            self._pending.pop(key, None)
+            if future.cancelled() or future.exception() is not None:
+                return
+            self._cache[key] = future.result()
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+
+# Shared renderer used by the thank you page
+receipt_renderer = ReceiptRenderer()
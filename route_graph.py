@@ -0,0 +1,109 @@
+import threading
+import numpy as np
+from data_loader import airport_db  # Import the global AirportDatabase object
+
+
+def to_float(value):
+    """Converts a latitude/longitude value from the dataset to float (NaN if missing or invalid)."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+class RouteGraph:
+    """
+    Array form of the route network built once from the AirportDatabase.
+
+    Airports are numbered 0..N-1 in database order (`codes[i]` <-> `index[iata]`) and every
+    route to a known airport becomes one edge. Edges are grouped by departure airport, so
+    the outgoing edges of airport i are `offsets[i]:offsets[i + 1]` (CSR layout) and every
+    per-edge attribute is a NumPy array indexed by edge id.
+    """
+
+    def __init__(self, airport_db):
+        airport_rows, route_rows = airport_db.graph_rows()
+        self.codes = [row[0] for row in airport_rows]
+        self.index = {code: i for i, code in enumerate(self.codes)}
+
+        self.latitude = np.array([to_float(row[1]) for row in airport_rows], dtype=np.float64)
+        self.longitude = np.array([to_float(row[2]) for row in airport_rows], dtype=np.float64)
+        self.countries = np.array([row[3] or "" for row in airport_rows], dtype=str)
+
+        sources, targets, km, minutes, carrier_count = [], [], [], [], []
+        self.edge_airlines = []  # Airline IATA codes operating each edge
+        for origin, destination, route_km, route_min, airlines in route_rows:
+            j = self.index.get(destination)
+            if j is None:
+                continue  # Route to an airport that is not in the dataset
+            sources.append(self.index[origin])
+            targets.append(j)
+            km.append(route_km or 0)
+            minutes.append(route_min or 0)
+            carrier_count.append(len(airlines))
+            self.edge_airlines.append(airlines)
+
+        self.sources = np.array(sources, dtype=np.int32)
+        self.targets = np.array(targets, dtype=np.int32)
+        self.km = np.array(km, dtype=np.float64)
+        self.minutes = np.array(minutes, dtype=np.float64)
+        self.carrier_count = np.array(carrier_count, dtype=np.int32)
+
+        self.offsets = np.zeros(len(self.codes) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.sources, minlength=len(self.codes)), out=self.offsets[1:])
+
+        # (origin, destination) -> edge id, first route wins if a pair is listed twice
+        self.edge_ids = {}
+        for edge, (i, j) in enumerate(zip(sources, targets)):
+            self.edge_ids.setdefault((self.codes[i], self.codes[j]), edge)
+
+    @property
+    def airport_count(self):
+        return len(self.codes)
+
+    @property
+    def edge_count(self):
+        return len(self.targets)
+
+    def edge_id(self, origin_iata, destination_iata):
+        """Returns the edge id of the route origin -> destination, or None if there is no such route."""
+        return self.edge_ids.get((origin_iata, destination_iata))
+
+    def path_edge_ids(self, path):
+        """
+        Returns the edge ids for each consecutive pair of a path of IATA codes.
+
+        Args:
+            path (list): Sequence of airport IATA codes.
+
+        Returns:
+            numpy.ndarray: int64 array of length len(path) - 1, with -1 where no direct route exists.
+        """
+        return np.array(
+            [self.edge_ids.get((path[i], path[i + 1]), -1) for i in range(len(path) - 1)],
+            dtype=np.int64
+        )
+
+    def __repr__(self):
+        return f"RouteGraph({self.airport_count} airports, {self.edge_count} routes)"
+
+
+_route_graph = None
+_route_graph_lock = threading.Lock()
+
+
+def get_route_graph():
+    """Returns the shared RouteGraph, building it on first use."""
+    global _route_graph
+    if _route_graph is None:
+        with _route_graph_lock:
+            if _route_graph is None:
+                _route_graph = RouteGraph(airport_db.snapshot)
+    return _route_graph
+
+
+@airport_db.on_reload
+def _invalidate_route_graph(diff):
+    """Drops the route graph after any route or airport change; it is rebuilt on next use."""
+    global _route_graph
+    _route_graph = None
@@ -0,0 +1,228 @@
+import threading
+import numpy as np
+from data_loader import airport_db  # Import the global AirportDatabase object
+from schedule_store import ScheduleStore
+from sqlite_airport_db import SQLiteAirportDatabase
+
+# Columns shown in the table view flight schedule (DataTable column ids)
+SCHEDULE_COLUMNS = ["Airline", "Destination", "Departure Date", "Departure Time", "Arrival Date", "Arrival Time"]
+
+# Operators understood in a DataTable `filter_query`, longest spelling first
+FILTER_OPERATORS = [
+    ["ge ", ">="],
+    ["le ", "<="],
+    ["lt ", "<"],
+    ["gt ", ">"],
+    ["ne ", "!="],
+    ["eq ", "="],
+    ["contains "],
+    ["datestartswith "],
+]
+
+
+class ScheduleIndex:
+    """
+    Columnar flight schedule for every airport, built once from the AirportDatabase.
+
+    All carriers of all routes are flattened into one NumPy array per column and grouped
+    by departure airport, so a single airport's schedule is a contiguous slice
+    (`offsets[iata] -> (start, stop)`) and paging, sorting and filtering only ever
+    touch that slice.
+    """
+
+    def __init__(self, airport_db):
+        values = {column: [] for column in SCHEDULE_COLUMNS}
+        self.offsets = {}
+
+        for iata, airport in airport_db.airports.items():
+            start = len(values["Airline"])
+            for route in airport.routes:
+                for carrier in route.carriers:
+                    values["Airline"].append(f"{carrier.name} ({carrier.iata})")
+                    values["Destination"].append(route.iata or "")
+                    values["Departure Date"].append(carrier.departure_date or "")
+                    values["Departure Time"].append(carrier.departure_time or "")
+                    values["Arrival Date"].append(carrier.arrival_date or "")
+                    values["Arrival Time"].append(carrier.arrival_time or "")
+            self.offsets[iata] = (start, len(values["Airline"]))
+
+        self.columns = {column: np.array(data, dtype=str) for column, data in values.items()}
+
+    def row_count(self, iata):
+        """Returns the number of scheduled carrier flights departing from an airport."""
+        start, stop = self.offsets.get(iata, (0, 0))
+        return stop - start
+
+    def airport_columns(self, iata):
+        """Returns {column: NumPy string array} holding only one airport's schedule."""
+        start, stop = self.offsets.get(iata, (0, 0))
+        return {column: data[start:stop] for column, data in self.columns.items()}
+
+    def query(self, iata, page_current=0, page_size=25, sort_by=None, filter_query=None):
+        """
+        Returns one page of an airport's flight schedule.
+
+        Args:
+            iata (str): IATA code of the departure airport.
+            page_current (int): Zero-based page number requested by the DataTable.
+            page_size (int): Number of rows per page.
+            sort_by (list): DataTable `sort_by` property, e.g. [{'column_id': 'Airline', 'direction': 'asc'}].
+            filter_query (str): DataTable `filter_query` property, e.g. '{Destination} contains LHR'.
+
+        Returns:
+            tuple: (rows, page_count, total_rows) where rows is a list of dicts for the requested page only.
+        """
+        view = self.airport_columns(iata)
+        indices = np.arange(len(view["Airline"]))
+
+        # Filtering: every `&&` clause narrows the set of matching row indices
+        for clause in (filter_query or "").split(" && "):
+            column, operator, value = split_filter_part(clause)
+            if column not in view:
+                continue
+            indices = indices[filter_mask(view[column][indices], operator, value)]
+
+        # Sorting: np.lexsort treats the last key as primary, so keys are pushed in reverse order
+        if sort_by and len(indices):
+            keys = []
+            for sort in reversed(sort_by):
+                column = sort.get("column_id")
+                if column not in view:
+                    continue
+                _, ranks = np.unique(view[column][indices], return_inverse=True)
+                keys.append(-ranks if sort.get("direction") == "desc" else ranks)
+            if keys:
+                indices = indices[np.lexsort(keys)]
+
+        total_rows = len(indices)
+        page_count = max(1, -(-total_rows // page_size))
+        page_indices = indices[page_current * page_size:(page_current + 1) * page_size]
+
+        rows = [
+            {column: str(view[column][i]) for column in SCHEDULE_COLUMNS}
+            for i in page_indices
+        ]
+        return rows, page_count, total_rows
+
+
+class StoredScheduleIndex(ScheduleIndex):
+    """
+    ScheduleIndex served from the columnar ScheduleStore on disk.
+
+    Nothing is built up front: each query decodes only the selected airport's row group,
+    so startup no longer walks every carrier of every route.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    def row_count(self, iata):
+        return self.store.row_count(iata)
+
+    def airport_columns(self, iata):
+        return self.store.table_columns(iata)
+
+
+class SQLScheduleIndex(ScheduleIndex):
+    """ScheduleIndex whose filtering, sorting and paging run as SQL on a SQLiteAirportDatabase."""
+
+    def __init__(self, database):
+        self.database = database
+
+    def row_count(self, iata):
+        return self.database.row_count(iata)
+
+    def query(self, iata, page_current=0, page_size=25, sort_by=None, filter_query=None):
+        clauses = [split_filter_part(clause) for clause in (filter_query or "").split(" && ")]
+        rows, total_rows = self.database.schedule_page(
+            iata, page_current, page_size, [clause for clause in clauses if clause[0]], sort_by
+        )
+        page_count = max(1, -(-total_rows // page_size))
+        return rows, page_count, total_rows
+
+
+def split_filter_part(filter_part):
+    """
+    Splits one clause of a DataTable filter query into (column, operator, value).
+
+    Args:
+        filter_part (str): A single clause such as '{Airline} scontains Singapore'.
+
+    Returns:
+        tuple: (column_id, operator, value), or (None, None, None) if the clause is not understood.
+    """
+    for operator_type in FILTER_OPERATORS:
+        for operator in operator_type:
+            if operator in filter_part:
+                name_part, value_part = filter_part.split(operator, 1)
+                name = name_part[name_part.find('{') + 1: name_part.rfind('}')]
+                value_part = value_part.strip()
+                if not value_part:
+                    return None, None, None
+
+                quote = value_part[0]
+                if quote == value_part[-1] and quote in ("'", '"', '`') and len(value_part) > 1:
+                    value = value_part[1:-1].replace('\\' + quote, quote)
+                else:
+                    value = value_part
+
+                return name, operator_type[0].strip(), value
+
+    return None, None, None
+
+
+def filter_mask(column, operator, value):
+    """Returns a boolean mask selecting the rows of a string column that satisfy one filter clause."""
+    if operator == "contains":
+        return np.char.find(np.char.lower(column), value.lower()) >= 0
+    if operator == "datestartswith":
+        return np.char.startswith(column, value)
+    if operator == "eq":
+        return column == value
+    if operator == "ne":
+        return column != value
+    if operator == "lt":
+        return column < value
+    if operator == "le":
+        return column <= value
+    if operator == "gt":
+        return column > value
+    if operator == "ge":
+        return column >= value
+    return np.ones(len(column), dtype=bool)
+
+
+_schedule_index = None
+_schedule_index_lock = threading.Lock()
+_use_store = True
+
+
+def get_schedule_index():
+    """
+    Returns the shared ScheduleIndex, creating it on first use.
+
+    A SQLite database answers schedule queries itself. Otherwise the columnar store
+    written by `schedule_store.py` is used when it matches the routes file, and the
+    index is built in memory from the loaded database as a last resort.
+    """
+    global _schedule_index
+    if _schedule_index is None:
+        with _schedule_index_lock:
+            if _schedule_index is None:
+                snapshot = airport_db.snapshot
+                if isinstance(snapshot, SQLiteAirportDatabase):
+                    _schedule_index = SQLScheduleIndex(snapshot)
+                else:
+                    store = ScheduleStore.open(airport_db.file_path) if _use_store else None
+                    _schedule_index = StoredScheduleIndex(store) if store else ScheduleIndex(snapshot)
+    return _schedule_index
+
+
+@airport_db.on_reload
+def _invalidate_schedule_index(diff):
+    """Drops the schedule index when routes or carriers changed; it is rebuilt in memory on next use."""
+    global _schedule_index, _use_store
+    if diff.added_routes or diff.removed_routes or diff.changed_routes:
+        with _schedule_index_lock:
+            _schedule_index = None
+            _use_store = False  # The store describes the schedule before the change
@@ -0,0 +1,267 @@
+import argparse
+import json
+import os
+from array import array
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import numpy as np
+from json_stream import iter_json_object
+
+# Directory holding the column files and the manifest
+STORE_DIR = "schedule_store"
+MANIFEST_FILE = "manifest.json"
+
+# Bumped whenever the column layout changes, so stores written by older code are rebuilt
+STORE_VERSION = 1
+
+# Epoch value stored for a missing or unparseable date/time
+MISSING = np.iinfo(np.int64).min
+
+# Column name -> dtype; every column has one row per carrier flight, grouped by origin airport
+COLUMNS = {
+    "destination": np.int32,       # index into the `airports` dictionary of destination codes
+    "carrier": np.int32,           # index into the `carriers` dictionary
+    "departure_utc": np.int64,     # seconds since the epoch, UTC
+    "departure_offset": np.int32,  # seconds to add for the departure airport's local time
+    "arrival_utc": np.int64,
+    "arrival_offset": np.int32,
+    "seats": np.int32,             # seats_remaining from the routes file
+}
+
+
+def source_state(routes_file):
+    """Returns the size and modification time that identify a version of the routes file."""
+    stat = os.stat(routes_file)
+    return {"path": os.path.abspath(routes_file), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+class _EpochEncoder:
+    """Converts local 'YYYY-MM-DD' + 'HH:MM' pairs to (UTC epoch, UTC offset), caching offsets per zone, date and hour."""
+
+    def __init__(self):
+        self._zones = {}
+        self._offsets = {}
+
+    def _zone(self, name):
+        if name not in self._zones:
+            try:
+                self._zones[name] = ZoneInfo(name) if name else timezone.utc
+            except (ZoneInfoNotFoundError, ValueError):
+                self._zones[name] = timezone.utc
+        return self._zones[name]
+
+    def encode(self, date, time, zone_name):
+        try:
+            local = datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M")
+        except (TypeError, ValueError):
+            return MISSING, 0
+        key = (zone_name, date, local.hour)
+        offset = self._offsets.get(key)
+        if offset is None:
+            offset = self._offsets[key] = int(local.replace(tzinfo=self._zone(zone_name)).utcoffset().total_seconds())
+        # Wall-clock seconds minus the offset, so utc + offset gives back exactly the stored local time
+        wall = int((local - datetime(1970, 1, 1)).total_seconds())
+        return wall - offset, offset
+
+
+def build_schedule_store(routes_file, output_dir=STORE_DIR):
+    """
+    Writes the carrier schedule of a routes file as columnar `.npy` files.
+
+    The routes file is streamed airport by airport, so the nested tree is never
+    materialised. Strings (airport codes, carriers) are dictionary-encoded into the
+    manifest and times are stored as UTC epochs plus local offsets. Rows are grouped
+    by origin airport and `row_groups.npy` holds the start of each group.
+
+    Args:
+        routes_file (str): Path to an `airline_routes.json` style file.
+        output_dir (str): Directory for the column files and the manifest.
+
+    Returns:
+        dict: The manifest that was written.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)  # Readers must not pair the old manifest with half-written columns
+
+    state = source_state(routes_file)
+    encoder = _EpochEncoder()
+    values = {name: array('q' if np.dtype(dtype).itemsize == 8 else 'i') for name, dtype in COLUMNS.items()}
+    row_groups = array('q', [0])
+    airports, airport_ids = [], {}
+    carriers, carrier_ids = [], {}
+
+    def airport_id(code):
+        if code not in airport_ids:
+            airport_ids[code] = len(airports)
+            airports.append(code)
+        return airport_ids[code]
+
+    origins = []  # Row group i holds the flights departing from origins[i]
+    for iata, airport in iter_json_object(routes_file):
+        origins.append(iata)
+        for route in airport.get("routes", []):
+            for carrier in route.get("carriers", []):
+                destination = airport_id(route.get("iata") or "")
+                key = (carrier.get("iata") or "", carrier.get("name") or "")
+                if key not in carrier_ids:
+                    carrier_ids[key] = len(carriers)
+                    carriers.append(list(key))
+                departure, departure_offset = encoder.encode(
+                    carrier.get("departure_date"), carrier.get("departure_time"), carrier.get("departure_timezone"))
+                arrival, arrival_offset = encoder.encode(
+                    carrier.get("arrival_date"), carrier.get("arrival_time"), carrier.get("arrival_timezone"))
+
+                values["destination"].append(destination)
+                values["carrier"].append(carrier_ids[key])
+                values["departure_utc"].append(departure)
+                values["departure_offset"].append(departure_offset)
+                values["arrival_utc"].append(arrival)
+                values["arrival_offset"].append(arrival_offset)
+                values["seats"].append(int(carrier.get("seats_remaining", 0) or 0))
+        row_groups.append(len(values["carrier"]))
+
+    for name, dtype in COLUMNS.items():
+        _save(os.path.join(output_dir, f"{name}.npy"), np.frombuffer(values[name], dtype=dtype))
+    _save(os.path.join(output_dir, "row_groups.npy"), np.frombuffer(row_groups, dtype=np.int64))
+
+    manifest = {
+        "version": STORE_VERSION,
+        "source": state,
+        "rows": len(values["carrier"]),
+        "origins": origins,
+        "airports": airports,
+        "carriers": carriers,
+        "columns": list(COLUMNS),
+    }
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, manifest_path)
+    return manifest
+
+
+def _save(path, column):
+    """Writes one column next to its final name and renames it into place."""
+    tmp_path = path + ".tmp.npy"
+    np.save(tmp_path, column)
+    os.replace(tmp_path, path)
+
+
+class ScheduleStore:
+    """
+    Read-only view of a columnar schedule store.
+
+    Columns are memory-mapped the first time they are read, and a query for one airport
+    only touches that airport's row group, so opening the store costs one small manifest
+    read and each query scales with the rows of the airport it asks about.
+    """
+
+    def __init__(self, output_dir, manifest):
+        self.output_dir = output_dir
+        self.manifest = manifest
+        self.airports = np.array(manifest["airports"])
+        self.origin_index = {code: i for i, code in enumerate(manifest["origins"])}
+        self.carrier_labels = np.array([f"{name} ({iata})" for iata, name in manifest["carriers"]])
+        self.row_groups = np.load(os.path.join(output_dir, "row_groups.npy"))
+        self._columns = {}
+
+    @classmethod
+    def open(cls, routes_file, output_dir=STORE_DIR):
+        """
+        Opens the store built from `routes_file`.
+
+        Returns:
+            ScheduleStore: The store, or None if it was not built or is older than the routes file.
+        """
+        try:
+            with open(os.path.join(output_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            state = source_state(routes_file)
+        except (OSError, ValueError):
+            return None
+
+        built_from = manifest.get("source", {})
+        if (manifest.get("version") != STORE_VERSION or built_from.get("size") != state["size"]
+                or built_from.get("mtime_ns") != state["mtime_ns"]):
+            print(f"Ignoring {output_dir}: it was built from a different version of {routes_file}")
+            return None
+        try:
+            return cls(output_dir, manifest)
+        except (OSError, ValueError):
+            return None
+
+    def column(self, name):
+        """Returns a whole column, memory-mapped on first use."""
+        column = self._columns.get(name)
+        if column is None:
+            column = self._columns[name] = np.load(os.path.join(self.output_dir, f"{name}.npy"), mmap_mode='r')
+        return column
+
+    def row_group(self, iata):
+        """Returns the (start, stop) rows of the flights departing from an airport."""
+        i = self.origin_index.get(iata)
+        if i is None:
+            return 0, 0
+        return int(self.row_groups[i]), int(self.row_groups[i + 1])
+
+    def row_count(self, iata):
+        start, stop = self.row_group(iata)
+        return stop - start
+
+    def read(self, iata, columns):
+        """
+        Reads some columns of one airport's row group.
+
+        Args:
+            iata (str): IATA code of the departure airport.
+            columns (list): Names from COLUMNS.
+
+        Returns:
+            dict: Column name -> NumPy array with one entry per departing carrier flight.
+        """
+        start, stop = self.row_group(iata)
+        return {name: np.array(self.column(name)[start:stop]) for name in columns}
+
+    def table_columns(self, iata):
+        """Returns an airport's schedule as the string columns shown in the table view."""
+        data = self.read(iata, ["carrier", "destination", "departure_utc", "departure_offset",
+                                "arrival_utc", "arrival_offset"])
+        departure_date, departure_time = local_date_time(data["departure_utc"], data["departure_offset"])
+        arrival_date, arrival_time = local_date_time(data["arrival_utc"], data["arrival_offset"])
+        return {
+            "Airline": self.carrier_labels[data["carrier"]],
+            "Destination": self.airports[data["destination"]],
+            "Departure Date": departure_date,
+            "Departure Time": departure_time,
+            "Arrival Date": arrival_date,
+            "Arrival Time": arrival_time,
+        }
+
+
+def local_date_time(utc, offset):
+    """Formats UTC epochs plus offsets as local ('YYYY-MM-DD', 'HH:MM') string arrays ('' where missing)."""
+    missing = utc == MISSING
+    local = np.where(missing, 0, utc + offset).astype("datetime64[s]")
+    # 'YYYY-MM-DDTHH:MM' strings viewed as a (rows, 16) character grid and cut into the two parts
+    chars = np.datetime_as_string(local, unit="m").astype("U16").view("U1").reshape(len(local), 16)
+    dates = chars[:, :10].copy().view("U10").ravel()
+    times = chars[:, 11:].copy().view("U5").ravel()
+    dates[missing] = ""
+    times[missing] = ""
+    return dates, times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write the carrier schedule of a routes file as columnar .npy files.")
+    parser.add_argument("--routes", default="airline_routes.json", help="routes file to convert")
+    parser.add_argument("--output-dir", default=STORE_DIR, help="directory for the column files")
+    args = parser.parse_args()
+
+    manifest = build_schedule_store(args.routes, args.output_dir)
+    print(f"Wrote {manifest['rows']} flights from {len(manifest['origins'])} airports to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
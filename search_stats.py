@@ -0,0 +1,207 @@
+import functools
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Counters every search reports
+COUNTERS = ("nodes_settled", "edges_relaxed", "heap_pushes", "heap_pops", "stale_pops")
+
+# Upper bounds (seconds) of the latency histogram exported to Prometheus
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5)
+
+# Record allocation peaks per query (costly: tracemalloc slows every allocation while it runs)
+TRACK_ALLOCATIONS = False
+
+_current = ContextVar("search_stats", default=None)
+_collected = ContextVar("collected_search_stats", default=None)
+
+
+class SearchStats:
+    """
+    Work done by one search query.
+
+    Attributes:
+        algorithm (str): Name the query is aggregated under.
+        nodes_settled (int): Airports taken off the queue and expanded.
+        edges_relaxed (int): Routes looked at from expanded airports.
+        heap_pushes, heap_pops (int): Queue operations.
+        stale_pops (int): Pops of entries that were already settled or superseded.
+        wall_time (float): Seconds spent in the query.
+        allocated_peak (int): Peak traced memory in bytes, or None if allocations were not tracked.
+    """
+
+    def __init__(self, algorithm):
+        self.algorithm = algorithm
+        self.nodes_settled = 0
+        self.edges_relaxed = 0
+        self.heap_pushes = 0
+        self.heap_pops = 0
+        self.stale_pops = 0
+        self.wall_time = 0.0
+        self.allocated_peak = None
+
+    def add(self, nodes_settled=0, edges_relaxed=0, heap_pushes=0, heap_pops=0, stale_pops=0):
+        """Adds counts gathered in local variables (cheaper than updating attributes inside hot loops)."""
+        self.nodes_settled += nodes_settled
+        self.edges_relaxed += edges_relaxed
+        self.heap_pushes += heap_pushes
+        self.heap_pops += heap_pops
+        self.stale_pops += stale_pops
+
+    def as_dict(self):
+        return {"algorithm": self.algorithm, **{name: getattr(self, name) for name in COUNTERS},
+                "wall_time": self.wall_time, "allocated_peak": self.allocated_peak}
+
+    def __repr__(self):
+        return (f"SearchStats({self.algorithm}, settled={self.nodes_settled}, relaxed={self.edges_relaxed}, "
+                f"pushes={self.heap_pushes}, pops={self.heap_pops}, stale={self.stale_pops}, "
+                f"{self.wall_time * 1000:.2f} ms)")
+
+
+def current_stats():
+    """Returns the SearchStats of the query running in this context, or None outside a recorded search."""
+    return _current.get()
+
+
+class StatsRegistry:
+    """Totals per algorithm of every recorded query, exportable as JSON or Prometheus text."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def record(self, stats):
+        with self._lock:
+            totals = self._totals.get(stats.algorithm)
+            if totals is None:
+                totals = self._totals[stats.algorithm] = {
+                    "queries": 0, "wall_time": 0.0, "max_wall_time": 0.0, "allocated_peak_max": 0,
+                    "buckets": [0] * len(self.buckets), **{name: 0 for name in COUNTERS},
+                }
+            totals["queries"] += 1
+            totals["wall_time"] += stats.wall_time
+            totals["max_wall_time"] = max(totals["max_wall_time"], stats.wall_time)
+            if stats.allocated_peak is not None:
+                totals["allocated_peak_max"] = max(totals["allocated_peak_max"], stats.allocated_peak)
+            for name in COUNTERS:
+                totals[name] += getattr(stats, name)
+            for i, bound in enumerate(self.buckets):
+                if stats.wall_time <= bound:
+                    totals["buckets"][i] += 1
+
+    def snapshot(self):
+        """Returns a copy of the totals per algorithm."""
+        with self._lock:
+            return {algorithm: {**totals, "buckets": list(totals["buckets"])} for algorithm, totals in self._totals.items()}
+
+    def reset(self):
+        with self._lock:
+            self._totals.clear()
+
+    def to_json(self):
+        snapshot = self.snapshot()
+        for totals in snapshot.values():
+            totals["buckets"] = dict(zip(map(str, self.buckets), totals.pop("buckets")))
+            totals["mean_wall_time"] = totals["wall_time"] / totals["queries"]
+        return json.dumps(snapshot, indent=4)
+
+    def to_prometheus(self):
+        """Returns the totals in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP route_search_{name} {help_text}")
+            lines.append(f"# TYPE route_search_{name} {kind}")
+            lines.extend(f"route_search_{name}{labels} {value}" for labels, value in samples)
+
+        def per_algorithm(key):
+            return [(f'{{algorithm="{algorithm}"}}', totals[key]) for algorithm, totals in snapshot.items()]
+
+        metric("queries_total", "counter", "Recorded search queries.", per_algorithm("queries"))
+        for name in COUNTERS:
+            metric(f"{name}_total", "counter", f"Sum of {name.replace('_', ' ')} over all queries.",
+                   per_algorithm(name))
+        metric("allocated_peak_bytes_max", "gauge", "Largest per-query allocation peak (if tracked).",
+               per_algorithm("allocated_peak_max"))
+
+        samples = []
+        for algorithm, totals in snapshot.items():
+            for bound, count in zip(self.buckets, totals["buckets"]):
+                samples.append((f'_bucket{{algorithm="{algorithm}",le="{bound}"}}', count))
+            samples.append((f'_bucket{{algorithm="{algorithm}",le="+Inf"}}', totals["queries"]))
+            samples.append((f'_sum{{algorithm="{algorithm}"}}', totals["wall_time"]))
+            samples.append((f'_count{{algorithm="{algorithm}"}}', totals["queries"]))
+        metric("duration_seconds", "histogram", "Wall time per search query.", samples)
+        return "\n".join(lines) + "\n"
+
+
+registry = StatsRegistry()
+
+
+@contextmanager
+def record_search(algorithm, track_allocations=None):
+    """
+    Records the work of one search query and adds it to the registry.
+
+    Args:
+        algorithm (str): Name the query is aggregated under.
+        track_allocations (bool): Record the allocation peak (default: TRACK_ALLOCATIONS).
+
+    Yields:
+        SearchStats: The stats of this query, which instrumented code finds via `current_stats()`.
+    """
+    stats = SearchStats(algorithm)
+    token = _current.set(stats)
+    track = TRACK_ALLOCATIONS if track_allocations is None else track_allocations
+    started_tracing = track and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if track:
+        tracemalloc.reset_peak()
+
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats.wall_time = time.perf_counter() - start
+        if track:
+            stats.allocated_peak = tracemalloc.get_traced_memory()[1]
+        if started_tracing:
+            tracemalloc.stop()
+        _current.reset(token)
+        registry.record(stats)
+        collected = _collected.get()
+        if collected is not None:
+            collected.append(stats)
+
+
+@contextmanager
+def collect_stats():
+    """
+    Collects the SearchStats of every query finished inside the block (e.g. for benchmarks).
+
+    Yields:
+        list: Filled with SearchStats objects as queries complete.
+    """
+    collected = []
+    token = _collected.set(collected)
+    try:
+        yield collected
+    finally:
+        _collected.reset(token)
+
+
+def instrumented(algorithm):
+    """Decorator recording every call of a search function under `algorithm`."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with record_search(algorithm):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
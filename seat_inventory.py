@@ -0,0 +1,298 @@
+import sqlite3
+import threading
+import time
+import uuid
+from data_loader import airport_db  # Import the global AirportDatabase object
+
+# Default location of the seat inventory database
+INVENTORY_FILE = "seat_inventory.db"
+
+# Seconds a hold keeps its seats before it is released automatically
+HOLD_TTL = 15 * 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seats (
+    flight_key TEXT PRIMARY KEY,
+    remaining INTEGER NOT NULL CHECK (remaining >= 0)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS holds (
+    hold_id TEXT NOT NULL,
+    flight_key TEXT NOT NULL,
+    quantity INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (hold_id, flight_key)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS holds_by_expiry ON holds (status, expires_at);
+"""
+
+# Callbacks `listener(sold_out_keys, restocked_keys)` run after seats of a flight run out or come back
+_availability_listeners = []
+
+
+def on_availability_change(listener):
+    """Registers a listener for flights that sold out or got seats back (usable as a decorator)."""
+    _availability_listeners.append(listener)
+    return listener
+
+
+def _notify_availability(sold_out_keys, restocked_keys):
+    if not sold_out_keys and not restocked_keys:
+        return
+    for listener in _availability_listeners:
+        try:
+            listener(sold_out_keys, restocked_keys)
+        except Exception as e:
+            print(f"Error in seat availability listener {listener}: {e}")
+
+
+def flight_key(origin_iata, destination_iata, carrier):
+    """
+    Returns the inventory key of one carrier flight instance.
+
+    Args:
+        origin_iata (str): Departure airport of the route.
+        destination_iata (str): Arrival airport of the route.
+        carrier (Carrier): The carrier operating the flight.
+
+    Returns:
+        str: e.g. 'SIN-LHR-SQ-2025-03-20T09:00'.
+    """
+    return f"{origin_iata}-{destination_iata}-{carrier.iata}-{carrier.departure_date}T{carrier.departure_time}"
+
+
+def route_of(key):
+    """Returns the (origin, destination) pair of a flight key."""
+    origin, destination, _ = key.split("-", 2)
+    return origin, destination
+
+
+class SeatInventory:
+    """
+    Durable seat counts per carrier flight instance, stored in SQLite in WAL mode.
+
+    Each thread gets its own connection. Searches read committed counts without waiting
+    on writers (WAL readers never block), while holds decrement every segment of an
+    itinerary inside one write transaction, so either all segments are held or none.
+    """
+
+    def __init__(self, file_path=INVENTORY_FILE):
+        self.file_path = file_path
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connection(self):
+        """Returns this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.file_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def seed(self, airport_db, airport_iatas=None):
+        """
+        Adds every carrier flight of the AirportDatabase that is not yet in the inventory,
+        using its `seats_remaining` as the starting count. Existing counts are left as they are.
+
+        Args:
+            airport_db (AirportDatabase): Source of the flights.
+            airport_iatas (iterable): Only seed flights departing from these airports (default: all).
+
+        Returns:
+            int: Number of flights added.
+        """
+        if airport_iatas is None:
+            airports = airport_db.airports.values()
+        else:
+            airports = [airport for airport in map(airport_db.get_airport, airport_iatas) if airport]
+
+        rows = (
+            (flight_key(airport.iata, route.iata, carrier), max(carrier.seats_remaining, 0))
+            for airport in airports
+            for route in airport.routes
+            for carrier in route.carriers
+        )
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO seats (flight_key, remaining) VALUES (?, ?)", rows)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return conn.total_changes - before
+
+    def seats_remaining(self, key):
+        """Returns the live seat count of one flight, or None if the flight is unknown."""
+        row = self._connection().execute("SELECT remaining FROM seats WHERE flight_key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def seats_for(self, keys):
+        """Returns {flight_key: remaining} for the known flights among `keys` in one query."""
+        keys = list(keys)
+        if not keys:
+            return {}
+        placeholders = ",".join("?" * len(keys))
+        rows = self._connection().execute(
+            f"SELECT flight_key, remaining FROM seats WHERE flight_key IN ({placeholders})", keys
+        )
+        return dict(rows.fetchall())
+
+    def sold_out_keys(self):
+        """Returns the set of flight keys with no seats left, in one table scan."""
+        rows = self._connection().execute("SELECT flight_key FROM seats WHERE remaining <= 0")
+        return {key for key, in rows.fetchall()}
+
+    def route_has_seats(self, airport_db, origin_iata, destination_iata):
+        """Returns True if at least one carrier flight on the route still has seats (unknown flights count as available)."""
+        airport = airport_db.get_airport(origin_iata)
+        carriers = [carrier for route in (airport.routes if airport else []) if route.iata == destination_iata
+                    for carrier in route.carriers]
+        keys = [flight_key(origin_iata, destination_iata, carrier) for carrier in carriers]
+        live_seats = self.seats_for(keys)
+        return any(live_seats.get(key, 1) > 0 for key in keys)
+
+    def hold(self, keys, quantity=1, ttl=HOLD_TTL):
+        """
+        Atomically takes `quantity` seats on every flight of an itinerary.
+
+        Args:
+            keys (list): Flight keys of all segments.
+            quantity (int): Seats per segment.
+            ttl (float): Seconds before an uncommitted hold is released.
+
+        Returns:
+            str: The hold id, or None if the itinerary is empty or any segment does not have enough seats.
+        """
+        if not keys:
+            return None
+
+        hold_id = uuid.uuid4().hex
+        now = time.time()
+        sold_out = []
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Expired holds go back on sale first, within the same write transaction
+            restocked = self._release_where(conn, "expires_at < ?", (now,))
+
+            for key in keys:
+                remaining = conn.execute(
+                    "UPDATE seats SET remaining = remaining - ? WHERE flight_key = ? AND remaining >= ? RETURNING remaining",
+                    (quantity, key, quantity)
+                ).fetchone()
+                if remaining is None:
+                    conn.execute("ROLLBACK")
+                    return None
+                if remaining[0] == 0:
+                    sold_out.append(key)
+                conn.execute(
+                    "INSERT INTO holds (hold_id, flight_key, quantity, status, expires_at) VALUES (?, ?, ?, 'held', ?)",
+                    (hold_id, key, quantity, now + ttl)
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        _notify_availability(sold_out, restocked)
+        return hold_id
+
+    def commit(self, hold_id, now=None):
+        """
+        Turns a hold into a confirmed booking.
+
+        A hold past its time-to-live cannot be committed even if `expire_holds` has not
+        released it yet. Committing an already committed hold again succeeds, so a
+        confirmation page can be reloaded.
+
+        Returns:
+            bool: True if the booking is confirmed, False if the hold expired, was released or is unknown.
+        """
+        conn = self._connection()
+        updated = conn.execute(
+            "UPDATE holds SET status = 'committed' WHERE hold_id = ? AND status = 'held' AND expires_at >= ?",
+            (hold_id, now or time.time())
+        ).rowcount
+        if updated:
+            return True
+        committed = conn.execute(
+            "SELECT 1 FROM holds WHERE hold_id = ? AND status = 'committed' LIMIT 1", (hold_id,)
+        ).fetchone()
+        return committed is not None
+
+    def release(self, hold_id):
+        """Returns the seats of an uncommitted hold to the inventory. Returns False if nothing was held."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            released = self._release_where(conn, "hold_id = ?", (hold_id,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        _notify_availability([], released)
+        return len(released) > 0
+
+    def expire_holds(self, now=None):
+        """Releases every hold whose time-to-live has passed. Returns the number of segments released."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            released = self._release_where(conn, "expires_at < ?", (now or time.time(),))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        _notify_availability([], released)
+        return len(released)
+
+    @staticmethod
+    def _release_where(conn, condition, params):
+        """
+        Adds held seats back and marks the matching holds released (caller owns the transaction).
+
+        Returns:
+            list: Flight keys whose seats were returned.
+        """
+        rows = conn.execute(
+            f"SELECT hold_id, flight_key, quantity FROM holds WHERE status = 'held' AND {condition}", params
+        ).fetchall()
+        conn.executemany(
+            "UPDATE seats SET remaining = remaining + ? WHERE flight_key = ?",
+            [(quantity, key) for _, key, quantity in rows]
+        )
+        conn.executemany(
+            "UPDATE holds SET status = 'released' WHERE hold_id = ? AND flight_key = ?",
+            [(hold_id, key) for hold_id, key, _ in rows]
+        )
+        return [key for _, key, _ in rows]
+
+
+_seat_inventory = None
+_seat_inventory_lock = threading.Lock()
+
+
+def get_seat_inventory():
+    """Returns the shared SeatInventory, creating and seeding it from the AirportDatabase on first use."""
+    global _seat_inventory
+    if _seat_inventory is None:
+        with _seat_inventory_lock:
+            if _seat_inventory is None:
+                inventory = SeatInventory()
+                inventory.seed(airport_db.snapshot)
+                _seat_inventory = inventory
+    return _seat_inventory
+
+
+@airport_db.on_reload
+def _seed_new_flights(diff):
+    """Adds flights of airports touched by a reload; seat counts of known flights are kept."""
+    if _seat_inventory is not None:
+        _seat_inventory.seed(airport_db.snapshot, diff.affected_airports)
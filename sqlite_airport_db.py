@@ -0,0 +1,394 @@
+import argparse
+import os
+import sqlite3
+import threading
+import weakref
+from collections.abc import Mapping
+from airline_class import Airport, AirportDatabase
+from json_stream import iter_json_object
+
+# File suffixes that data_loader opens as a SQLite airport database
+SQLITE_SUFFIXES = (".sqlite", ".sqlite3", ".db")
+
+# Rows sent to SQLite per executemany call during a bulk load
+BATCH_SIZE = 10000
+
+# Prepared statements kept per connection (sqlite3 reuses them for identical SQL strings)
+STATEMENT_CACHE = 256
+
+AIRPORT_FIELDS = ("iata", "icao", "name", "city_name", "country", "country_code", "continent",
+                  "display_name", "elevation", "latitude", "longitude", "timezone")
+CARRIER_FIELDS = ("iata", "name", "departure_date", "departure_time", "arrival_date", "arrival_time",
+                  "departure_timezone", "arrival_timezone", "seats_remaining")
+
+SCHEMA = """
+CREATE TABLE airports (
+    iata TEXT PRIMARY KEY,
+    icao TEXT, name TEXT, city_name TEXT, country TEXT, country_code TEXT, continent TEXT,
+    display_name TEXT, elevation, latitude, longitude, timezone TEXT
+);
+
+CREATE TABLE routes (
+    id INTEGER PRIMARY KEY,
+    origin TEXT NOT NULL,
+    destination TEXT,
+    km, min
+);
+
+CREATE TABLE carriers (
+    id INTEGER PRIMARY KEY,
+    route_id INTEGER NOT NULL,
+    origin TEXT NOT NULL,
+    destination TEXT,
+    iata TEXT, name TEXT,
+    departure_date TEXT, departure_time TEXT, arrival_date TEXT, arrival_time TEXT,
+    departure_timezone TEXT, arrival_timezone TEXT,
+    seats_remaining INTEGER
+);
+
+CREATE TABLE meta (key TEXT PRIMARY KEY, value);
+"""
+
+# Created after the bulk load, which is much faster than maintaining them row by row
+INDEXES = """
+CREATE INDEX airports_by_icao ON airports (icao);
+CREATE INDEX airports_by_city ON airports (city_name);
+CREATE INDEX airports_by_country ON airports (country);
+CREATE INDEX routes_by_origin ON routes (origin, destination);
+CREATE INDEX routes_by_destination ON routes (destination, origin);
+CREATE INDEX carriers_by_route ON carriers (route_id);
+CREATE INDEX carriers_by_origin ON carriers (origin, departure_date);
+CREATE INDEX carriers_by_airline ON carriers (iata, departure_date);
+CREATE INDEX carriers_by_date ON carriers (departure_date);
+"""
+
+# Table view column -> SQL expression over the carriers table (NULLs shown as '', like ScheduleIndex)
+SCHEDULE_EXPRESSIONS = {
+    "Airline": "COALESCE(name, 'None') || ' (' || COALESCE(iata, 'None') || ')'",
+    "Destination": "COALESCE(destination, '')",
+    "Departure Date": "COALESCE(departure_date, '')",
+    "Departure Time": "COALESCE(departure_time, '')",
+    "Arrival Date": "COALESCE(arrival_date, '')",
+    "Arrival Time": "COALESCE(arrival_time, '')",
+}
+
+# DataTable filter operator -> SQL condition on one expression
+FILTER_CONDITIONS = {
+    "contains": "instr(lower({column}), lower(?)) > 0",
+    "datestartswith": "substr({column}, 1, length(?)) = ?",
+    "eq": "{column} = ?",
+    "ne": "{column} != ?",
+    "lt": "{column} < ?",
+    "le": "{column} <= ?",
+    "gt": "{column} > ?",
+    "ge": "{column} >= ?",
+}
+
+
+def build_sqlite_db(routes_file, db_file, batch_size=BATCH_SIZE):
+    """
+    Loads a routes file into a new indexed SQLite database.
+
+    The routes file is streamed airport by airport and rows are inserted with
+    `executemany` in batches inside one transaction; indexes are created once at the end.
+
+    Args:
+        routes_file (str): Path to an `airline_routes.json` style file.
+        db_file (str): SQLite file to create (replaced if it exists).
+        batch_size (int): Rows per executemany call.
+
+    Returns:
+        dict: Number of airports, routes and carriers loaded.
+    """
+    temp_file = f"{db_file}.tmp"
+    if os.path.exists(temp_file):
+        os.remove(temp_file)
+    conn = sqlite3.connect(temp_file, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=OFF")  # A failed build is thrown away, so no rollback journal is needed
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.executescript(SCHEMA)
+
+    airports, routes, carriers = [], [], []
+    counts = {"airports": 0, "routes": 0, "carriers": 0}
+
+    def flush():
+        conn.executemany(f"INSERT INTO airports VALUES ({','.join('?' * len(AIRPORT_FIELDS))})", airports)
+        conn.executemany("INSERT INTO routes VALUES (?, ?, ?, ?, ?)", routes)
+        conn.executemany(f"INSERT INTO carriers VALUES (NULL, ?, ?, ?, {','.join('?' * len(CARRIER_FIELDS))})",
+                         carriers)
+        airports.clear()
+        routes.clear()
+        carriers.clear()
+
+    try:
+        conn.execute("BEGIN")
+        for iata, airport in iter_json_object(routes_file):
+            airports.append((iata,) + tuple(airport.get(field) for field in AIRPORT_FIELDS[1:]))
+            counts["airports"] += 1
+            for route in airport.get("routes", []):
+                counts["routes"] += 1
+                route_id = counts["routes"]
+                routes.append((route_id, iata, route.get("iata"), route.get("km"), route.get("min")))
+                for carrier in route.get("carriers", []):
+                    carriers.append((route_id, iata, route.get("iata"))
+                                    + tuple(carrier.get(field) for field in CARRIER_FIELDS))
+                    counts["carriers"] += 1
+            if len(carriers) + len(routes) >= batch_size:
+                flush()
+        flush()
+
+        stat = os.stat(routes_file)
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("source", os.path.abspath(routes_file)), ("source_size", stat.st_size),
+            ("source_mtime_ns", stat.st_mtime_ns),
+        ])
+        conn.execute("COMMIT")
+        conn.executescript(INDEXES)
+        conn.execute("ANALYZE")
+    except BaseException:
+        conn.close()
+        os.remove(temp_file)  # A partial build is useless
+        raise
+    conn.close()
+
+    os.replace(temp_file, db_file)
+    return counts
+
+
+def _close_all(connections, lock):
+    """Closes a list of connections (finalizer of SQLiteAirportDatabase, so it must not reference the database)."""
+    with lock:
+        for conn in connections:
+            conn.close()
+        connections.clear()
+
+
+class SQLiteAirports(Mapping):
+    """
+    Read-only `iata -> Airport` mapping over the airports table.
+
+    The IATA codes are read once; an Airport with its routes and carriers is built from
+    two indexed queries the first time it is looked up and then kept.
+    """
+
+    def __init__(self, database):
+        self._database = database
+        self._codes = {row[0]: None for row in database.execute("SELECT iata FROM airports ORDER BY rowid")}
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, iata_code):
+        airport = self._cache.get(iata_code)
+        if airport is None:
+            if iata_code not in self._codes:
+                raise KeyError(iata_code)
+            airport = self._database.build_airport(iata_code)
+            with self._lock:
+                airport = self._cache.setdefault(iata_code, airport)
+        return airport
+
+    def __contains__(self, iata_code):
+        return iata_code in self._codes
+
+    def __iter__(self):
+        return iter(self._codes)
+
+    def __len__(self):
+        return len(self._codes)
+
+    @property
+    def materialized(self):
+        """Number of airports built so far."""
+        return len(self._cache)
+
+
+class SQLiteAirportDatabase(AirportDatabase):
+    """
+    AirportDatabase backed by an indexed SQLite file written by `build_sqlite_db`.
+
+    `airports` and `get_airport` behave as usual (airports are built on first access),
+    while airline lists, schedule pages and lookups by ICAO, city, country, airline or
+    date are answered by SQL. Each thread gets its own read-only connection; all of
+    them are closed when the snapshot is garbage-collected (or by `close()`).
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._local = threading.local()
+        self._connections = []  # Every thread's connection, so they can be closed together
+        self._connections_lock = threading.Lock()
+        self._close_connections = weakref.finalize(self, _close_all, self._connections, self._connections_lock)
+        self.airports = SQLiteAirports(self)
+
+    def _connection(self):
+        """Returns this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            uri = f"file:{os.path.abspath(self.file_path)}?mode=ro"
+            # Closed from whichever thread drops the snapshot; each connection is still only used by its own thread
+            conn = sqlite3.connect(uri, uri=True, cached_statements=STATEMENT_CACHE, check_same_thread=False)
+            with self._connections_lock:
+                self._connections.append(conn)
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Closes the connections of all threads."""
+        self._close_connections()
+
+    def execute(self, sql, parameters=()):
+        return self._connection().execute(sql, parameters)
+
+    def build_airport(self, iata_code):
+        """Builds one Airport with its routes and carriers from the database."""
+        row = self.execute(f"SELECT {', '.join(AIRPORT_FIELDS)} FROM airports WHERE iata = ?", (iata_code,)).fetchone()
+        data = {field: value for field, value in zip(AIRPORT_FIELDS, row) if value is not None}
+
+        carriers = {}
+        for route_id, *values in self.execute(
+                f"SELECT route_id, {', '.join(CARRIER_FIELDS)} FROM carriers WHERE origin = ? ORDER BY id", (iata_code,)):
+            carriers.setdefault(route_id, []).append(
+                {field: value for field, value in zip(CARRIER_FIELDS, values) if value is not None})
+        data["routes"] = [
+            {"iata": destination, "km": km, "min": minutes, "carriers": carriers.get(route_id, [])}
+            for route_id, destination, km, minutes in self.execute(
+                "SELECT id, destination, km, min FROM routes WHERE origin = ? ORDER BY id", (iata_code,))
+        ]
+        return Airport(data)
+
+    def graph_rows(self):
+        """Reads the route graph with two table scans instead of building every Airport."""
+        airport_rows = self.execute("SELECT iata, latitude, longitude, country FROM airports ORDER BY rowid").fetchall()
+        airlines = {}
+        for route_id, airline in self.execute("SELECT route_id, iata FROM carriers ORDER BY id"):
+            airlines.setdefault(route_id, []).append(airline)
+        route_rows = [
+            (origin, destination, km, minutes, tuple(airlines.get(route_id, ())))
+            for route_id, origin, destination, km, minutes in self.execute(
+                "SELECT id, origin, destination, km, min FROM routes ORDER BY id")
+        ]
+        return airport_rows, route_rows
+
+    def airport_names(self):
+        """Returns {IATA code: airport name} in database order with one table scan."""
+        return dict(self.execute("SELECT iata, name FROM airports ORDER BY rowid").fetchall())
+
+    def airline_names(self):
+        """Returns {airline IATA code: name} in order of first appearance, with the last name seen."""
+        rows = self.execute("""
+            SELECT c.iata, c.name
+            FROM (SELECT iata, MIN(id) AS first, MAX(id) AS last FROM carriers GROUP BY iata) AS airline
+            JOIN carriers AS c ON c.id = airline.last
+            ORDER BY airline.first
+        """)
+        return dict(rows.fetchall())
+
+    def find_airports(self, icao=None, city=None, country=None):
+        """
+        Returns the IATA codes of airports matching every given attribute.
+
+        Args:
+            icao (str): ICAO code.
+            city (str): City name (exact match).
+            country (str): Country name (exact match).
+        """
+        conditions, parameters = [], []
+        for column, value in (("icao", icao), ("city_name", city), ("country", country)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return [row[0] for row in self.execute(f"SELECT iata FROM airports {where} ORDER BY rowid", parameters)]
+
+    def routes_from(self, origin_iata):
+        """Returns [(destination, km, min), ...] of the routes departing from an airport."""
+        return self.execute("SELECT destination, km, min FROM routes WHERE origin = ? ORDER BY id",
+                            (origin_iata,)).fetchall()
+
+    def routes_to(self, destination_iata):
+        """Returns [(origin, km, min), ...] of the routes arriving at an airport."""
+        return self.execute("SELECT origin, km, min FROM routes WHERE destination = ? ORDER BY id",
+                            (destination_iata,)).fetchall()
+
+    def flights(self, airline=None, departure_date=None, origin=None, destination=None):
+        """
+        Returns carrier flights as dicts, filtered by any combination of the arguments.
+
+        Args:
+            airline (str): Airline IATA code.
+            departure_date (str): 'YYYY-MM-DD', or a (first, last) tuple for a date range.
+            origin (str): Departure airport IATA code.
+            destination (str): Arrival airport IATA code.
+        """
+        conditions, parameters = [], []
+        for column, value in (("iata", airline), ("origin", origin), ("destination", destination)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+        if isinstance(departure_date, tuple):
+            conditions.append("departure_date BETWEEN ? AND ?")
+            parameters.extend(departure_date)
+        elif departure_date is not None:
+            conditions.append("departure_date = ?")
+            parameters.append(departure_date)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        fields = ("origin", "destination") + CARRIER_FIELDS
+        rows = self.execute(f"SELECT {', '.join(fields)} FROM carriers {where} ORDER BY id", parameters)
+        return [dict(zip(fields, row)) for row in rows]
+
+    def row_count(self, iata):
+        """Returns the number of scheduled carrier flights departing from an airport."""
+        return self.execute("SELECT COUNT(*) FROM carriers WHERE origin = ?", (iata,)).fetchone()[0]
+
+    def schedule_page(self, iata, page_current, page_size, clauses, sort_by):
+        """
+        Returns one page of an airport's flight schedule, filtered, sorted and paged in SQL.
+
+        Args:
+            iata (str): IATA code of the departure airport.
+            page_current (int): Zero-based page number.
+            page_size (int): Number of rows per page.
+            clauses (list): (table column, operator, value) filters, see schedule_index.split_filter_part.
+            sort_by (list): DataTable `sort_by` property.
+
+        Returns:
+            tuple: (rows, total_rows) with rows as dicts keyed by table column.
+        """
+        conditions, parameters = ["origin = ?"], [iata]
+        for column, operator, value in clauses:
+            if column in SCHEDULE_EXPRESSIONS and operator in FILTER_CONDITIONS:
+                condition = FILTER_CONDITIONS[operator].format(column=SCHEDULE_EXPRESSIONS[column])
+                conditions.append(condition)
+                parameters.extend([value] * condition.count("?"))
+        where = " AND ".join(conditions)
+
+        order = [f"{SCHEDULE_EXPRESSIONS[sort['column_id']]} {'DESC' if sort.get('direction') == 'desc' else 'ASC'}"
+                 for sort in sort_by or [] if sort.get("column_id") in SCHEDULE_EXPRESSIONS]
+        order.append("id")  # Ties keep schedule order, like the stable sort of ScheduleIndex
+
+        total_rows = self.execute(f"SELECT COUNT(*) FROM carriers WHERE {where}", parameters).fetchone()[0]
+        columns = list(SCHEDULE_EXPRESSIONS)
+        select = ", ".join(SCHEDULE_EXPRESSIONS[column] for column in columns)
+        rows = self.execute(
+            f"SELECT {select} FROM carriers WHERE {where} ORDER BY {', '.join(order)} LIMIT ? OFFSET ?",
+            parameters + [page_size, page_current * page_size]
+        )
+        return [dict(zip(columns, row)) for row in rows], total_rows
+
+    def __repr__(self):
+        return f"SQLiteAirportDatabase({self.file_path}, {len(self.airports)} airports)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load a routes file into an indexed SQLite airport database.")
+    parser.add_argument("--routes", default="airline_routes.json", help="routes file to load")
+    parser.add_argument("--output", default="airline_routes.sqlite", help="SQLite file to write")
+    args = parser.parse_args()
+
+    counts = build_sqlite_db(args.routes, args.output)
+    print(f"Loaded {counts['airports']} airports, {counts['routes']} routes and {counts['carriers']} flights "
+          f"into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
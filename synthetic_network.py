@@ -0,0 +1,215 @@
+import argparse
+import datetime
+import math
+import random
+import numpy as np
+from json_stream import write_json_object
+from flight_times import CRUISE_KMH, TAXI_MINUTES
+from pricing import great_circle_km
+
+# Airports processed per block when matching spokes to their nearest hubs (bounds memory at 100k airports)
+NEAREST_HUB_BLOCK = 4096
+
+
+def airport_code(i, width):
+    """Returns a synthetic IATA-style code, e.g. 'AAA', 'AAB', ... ('AAAA' ... when more are needed)."""
+    letters = []
+    for _ in range(width):
+        i, letter = divmod(i, 26)
+        letters.append(chr(ord('A') + letter))
+    return "".join(reversed(letters))
+
+
+def carrier_code(i):
+    """Returns a two-character airline code ('A0', 'A1', ... 'Z9', then 'AA' ...)."""
+    if i < 260:
+        return f"{chr(ord('A') + i // 10)}{i % 10}"
+    i -= 260
+    return f"{chr(ord('A') + i // 26 % 26)}{chr(ord('A') + i % 26)}"
+
+
+class SyntheticNetwork:
+    """
+    Deterministic hub-and-spoke flight network in the airline_routes.json format.
+
+    Hubs are connected to their nearest hubs plus a few random long-haul links, each
+    spoke is connected both ways to its nearest hubs, and a fraction of airports is
+    left without any routes so unreachable queries have something to hit. Every hub
+    has a home carrier; a route is operated by the home carriers of the hubs it touches.
+
+    Attributes:
+        airports (dict): The generated dataset, keyed by airport code.
+        hubs (list): Codes of the hub airports.
+        hub_of (dict): Spoke code -> code of its nearest hub.
+        isolated (list): Codes of airports without routes.
+    """
+
+    def __init__(self, airport_count=1000, hub_count=None, hub_links=4, long_haul_links=1,
+                 spoke_links=2, carrier_count=20, isolated_fraction=0.02, seed=0):
+        rng = random.Random(seed)
+        np_rng = np.random.default_rng(seed)
+        hub_count = hub_count or max(2, int(math.sqrt(airport_count) / 2))
+        width = max(3, math.ceil(math.log(airport_count, 26)))
+
+        self.codes = [airport_code(i, width) for i in range(airport_count)]
+        self.latitude = np.degrees(np.arcsin(np_rng.uniform(-0.9, 0.9, airport_count)))
+        self.longitude = np_rng.uniform(-180, 180, airport_count)
+        self.carriers = [(carrier_code(i), f"Synthetic Air {i}") for i in range(carrier_count)]
+
+        isolated_count = int(airport_count * isolated_fraction)
+        self.hubs = self.codes[:hub_count]
+        self.isolated = self.codes[airport_count - isolated_count:] if isolated_count else []
+        spokes = range(hub_count, airport_count - isolated_count)
+        self.home_carrier = {hub: self.carriers[i % carrier_count] for i, hub in enumerate(self.hubs)}
+
+        self.airports = {
+            code: {
+                "city_name": f"City {code}",
+                "continent": "",
+                "country": f"Country {i % 200}",
+                "country_code": airport_code(i % 200, 2),
+                "display_name": f"City {code} ({code})",
+                "elevation": 0,
+                "iata": code,
+                "icao": f"X{code}"[:4],
+                "latitude": f"{self.latitude[i]:.6f}",
+                "longitude": f"{self.longitude[i]:.6f}",
+                "name": f"{code} Airport",
+                "routes": [],
+                "timezone": "UTC",
+            }
+            for i, code in enumerate(self.codes)
+        }
+
+        self._routes = set()
+        self._start = datetime.datetime(2025, 3, 20)
+        self._rng = rng
+
+        # Hub backbone: nearest hubs plus random long-haul links
+        hub_indices = np.arange(hub_count)
+        for h in hub_indices:
+            for other in self._nearest(np.array([h]), hub_indices, hub_links + 1)[0]:
+                if other != h:
+                    self._link(h, other)
+            for _ in range(long_haul_links):
+                self._link(h, rng.randrange(hub_count))
+
+        # Spokes: both directions to their nearest hubs
+        self.hub_of = {}
+        spoke_indices = np.array(spokes)
+        for start in range(0, len(spoke_indices), NEAREST_HUB_BLOCK):
+            block = spoke_indices[start:start + NEAREST_HUB_BLOCK]
+            for spoke, nearest in zip(block, self._nearest(block, hub_indices, spoke_links)):
+                self.hub_of[self.codes[spoke]] = self.codes[nearest[0]]
+                for hub in nearest:
+                    self._link(spoke, hub)
+
+    def _nearest(self, rows, candidates, k):
+        """Indices of the k nearest candidates (great-circle) for each airport in rows."""
+        distance = great_circle_km(self.latitude[rows][:, None], self.longitude[rows][:, None],
+                                   self.latitude[candidates][None, :], self.longitude[candidates][None, :])
+        k = min(k, len(candidates))
+        nearest = np.argpartition(distance, k - 1, axis=1)[:, :k]
+        order = np.take_along_axis(distance, nearest, axis=1).argsort(axis=1)
+        return candidates[np.take_along_axis(nearest, order, axis=1)]
+
+    def distance_km(self, i, j):
+        return float(great_circle_km(self.latitude[i], self.longitude[i], self.latitude[j], self.longitude[j]))
+
+    def _link(self, i, j):
+        """Adds routes i -> j and j -> i (once each)."""
+        i, j = int(i), int(j)
+        if i == j:
+            return
+        for origin, destination in ((i, j), (j, i)):
+            if (origin, destination) in self._routes:
+                continue
+            self._routes.add((origin, destination))
+            km = int(self.distance_km(origin, destination))
+            minutes = int(km / CRUISE_KMH * 60) + TAXI_MINUTES
+            operators = {self.home_carrier.get(self.codes[origin]), self.home_carrier.get(self.codes[destination])}
+            self.airports[self.codes[origin]]["routes"].append({
+                "carriers": [self._carrier(carrier, minutes) for carrier in sorted(operators - {None})],
+                "iata": self.codes[destination],
+                "km": km,
+                "min": minutes,
+            })
+
+    def _carrier(self, carrier, minutes):
+        iata, name = carrier
+        departure = self._start + datetime.timedelta(days=self._rng.randint(0, 30), hours=self._rng.randint(6, 22))
+        arrival = departure + datetime.timedelta(minutes=minutes)
+        return {
+            "iata": iata,
+            "name": name,
+            "departure_date": departure.strftime("%Y-%m-%d"),
+            "departure_time": departure.strftime("%H:%M"),
+            "arrival_date": arrival.strftime("%Y-%m-%d"),
+            "arrival_time": arrival.strftime("%H:%M"),
+            "departure_timezone": "UTC",
+            "arrival_timezone": "UTC",
+            "seats_remaining": self._rng.randint(0, 15),
+        }
+
+    @property
+    def route_count(self):
+        return len(self._routes)
+
+    def query_sets(self, size=50, seed=0):
+        """
+        Fixed query sets for benchmarking.
+
+        Args:
+            size (int): Queries per set.
+            seed (int): Seed for picking the queries.
+
+        Returns:
+            dict: {'near': [(origin, destination)], 'far': [...], 'unreachable': [...],
+            'airline': [(origin, destination, [airline iata])]}
+        """
+        rng = random.Random(seed)
+        spokes = sorted(self.hub_of)
+        by_hub = {}
+        for spoke in spokes:
+            by_hub.setdefault(self.hub_of[spoke], []).append(spoke)
+        shared = [group for group in by_hub.values() if len(group) > 1]
+        index = {code: i for i, code in enumerate(self.codes)}
+
+        near = [tuple(rng.sample(rng.choice(shared), 2)) for _ in range(size)] if shared else []
+
+        # Far: the most distant of a few random spoke pairs
+        far = []
+        for _ in range(size):
+            candidates = [tuple(rng.sample(spokes, 2)) for _ in range(8)]
+            far.append(max(candidates, key=lambda pair: self.distance_km(index[pair[0]], index[pair[1]])))
+
+        unreachable = []
+        if self.isolated:
+            for _ in range(size):
+                pair = [rng.choice(spokes), rng.choice(self.isolated)]
+                rng.shuffle(pair)
+                unreachable.append(tuple(pair))
+
+        airline = []
+        for origin, destination in far:
+            airline.append((origin, destination, [self.home_carrier[self.hub_of[destination]][0]]))
+
+        return {"near": near, "far": far, "unreachable": unreachable, "airline": airline}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic hub-and-spoke routes file.")
+    parser.add_argument("output", help="JSON file to write (airline_routes.json format)")
+    parser.add_argument("--airports", type=int, default=1000)
+    parser.add_argument("--hubs", type=int, default=None, help="default: sqrt(airports) / 2")
+    parser.add_argument("--carriers", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    network = SyntheticNetwork(args.airports, args.hubs, carrier_count=args.carriers, seed=args.seed)
+    write_json_object(network.airports.items(), args.output)
+    print(f"Wrote {len(network.airports)} airports and {network.route_count} routes to {args.output}")
+
+
+if __name__ == "__main__":
+    main()